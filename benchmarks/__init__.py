@@ -0,0 +1,8 @@
+"""
+Offline Benchmarks For The Map Pipeline
+
+Runs every stage against seeded synthetic exchanges (no network), reporting wall time,
+peak traced memory and scaling curves over lookback, exchange count and entry count.
+
+    python -m benchmarks.run --help
+"""
@@ -0,0 +1,201 @@
+"""
+Synthetic Market Fixtures
+
+Seeded stand-ins for ccxt exchanges: same method names and return shapes the fetch
+layer uses, backed by a random-walk market generated up front. The same seed always
+produces the same candles, open interest and entries.
+
+Exchanges from make_exchanges all quote one base market (with small per-exchange noise and
+their own volume / OI share), like venues listing the same perpetual. Independent walks per
+exchange would average out in the combined frame and the detectors would find fewer
+entries the more exchanges were added.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+from src.models import Entry, Side
+
+HOUR_MS = 60 * 60 * 1000
+
+# Listed Under Every Candidate Format The Fetch Layer Tries
+DEFAULT_MARKETS = ['BTC/USDT:USDT', 'BTCUSDT', 'BTC-USDT-SWAP', 'BTC-PERP', 'BTC/USDC:USDC']
+
+
+def synthetic_market(n_candles: int, seed: int = 0, start_price: float = 60000.0, start_oi_usd: float = 5e9) -> dict:
+    """
+    Hourly random-walk market ending at the still-forming candle.
+
+    Returns:
+        Column name -> array: timestamp (ms), open, high, low, close, volume, oi_value (USD)
+    """
+    rng = np.random.default_rng(seed)
+
+    now_open = int(time.time() * 1000) // HOUR_MS * HOUR_MS
+    timestamp = now_open - np.arange(n_candles, dtype=np.int64)[::-1] * HOUR_MS
+
+    # Log-Normal Price Walk With Intrabar Range
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0, 0.006, n_candles)))
+    open_ = np.concatenate([[start_price], close[:-1]])
+    wick = np.abs(rng.normal(0.0, 0.004, (2, n_candles)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+
+    # Heavy-Tailed Volume, Open Interest Drifting With It
+    volume = rng.lognormal(6.0, 0.8, n_candles)
+    oi_value = start_oi_usd * np.exp(np.cumsum(rng.normal(0.0, 0.004, n_candles)))
+
+    return {
+        'timestamp': timestamp,
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume,
+        'oi_value': oi_value,
+    }
+
+
+def venue_market(base: dict, seed: int, share: float = 1.0, price_noise: float = 0.0005) -> dict:
+    """
+    One exchange's view of a base market: prices off by small independent noise (basis),
+    volume and open interest scaled to the exchange's share with their own noise.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(base['timestamp'])
+
+    basis = np.exp(rng.normal(0.0, price_noise, n))
+    open_ = base['open'] * np.concatenate([[1.0], basis[:-1]])
+    close = base['close'] * basis
+    high = np.maximum(base['high'] * basis, np.maximum(open_, close))
+    low = np.minimum(base['low'] * basis, np.minimum(open_, close))
+
+    return {
+        'timestamp': base['timestamp'],
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': base['volume'] * share * rng.lognormal(0.0, 0.2, n),
+        'oi_value': base['oi_value'] * share * np.exp(rng.normal(0.0, 0.001, n)),
+    }
+
+
+class SyntheticExchange:
+    """
+    Offline ccxt stand-in serving a synthetic market.
+
+    Args:
+        exchange_id: Reported as .id (also keys the client / frame caches)
+        n_candles: History depth available (calls asking for more get what exists)
+        seed: Market seed
+        latency: Seconds slept per call, to model network round trips
+        has_oi_history: Whether fetchOpenInterestHistory is advertised
+        market: Serve this market (synthetic_market / venue_market output) instead of one from seed
+    """
+
+    def __init__(
+        self,
+        exchange_id: str,
+        n_candles: int,
+        seed: int = 0,
+        latency: float = 0.0,
+        has_oi_history: bool = True,
+        markets: Optional[List[str]] = None,
+        market: Optional[dict] = None
+    ):
+        self.id = exchange_id
+        self.latency = latency
+        self.has = {'fetchOpenInterestHistory': has_oi_history}
+        self.markets = {symbol: {'symbol': symbol} for symbol in (markets or DEFAULT_MARKETS)}
+        self.market = synthetic_market(n_candles, seed=seed) if market is None else market
+        self.calls = 0
+
+    def _call(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _window(self, since: Optional[int], limit: Optional[int]) -> slice:
+        n = len(self.market['timestamp'])
+
+        # Without since, ccxt returns the most recent `limit` rows
+        if since is None:
+            return slice(0 if limit is None else max(0, n - limit), n)
+
+        start = int(np.searchsorted(self.market['timestamp'], since, side='left'))
+        return slice(start, n if limit is None else min(n, start + limit))
+
+    def load_markets(self, reload: bool = False) -> dict:
+        self._call()
+        return self.markets
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '1h', since: Optional[int] = None, limit: Optional[int] = None) -> list:
+        self._call()
+        window = self._window(since, limit)
+        m = self.market
+        return [
+            [int(ts), o, h, l, c, v]
+            for ts, o, h, l, c, v in zip(
+                m['timestamp'][window], m['open'][window].tolist(), m['high'][window].tolist(),
+                m['low'][window].tolist(), m['close'][window].tolist(), m['volume'][window].tolist()
+            )
+        ]
+
+    def fetch_open_interest_history(self, symbol: str, timeframe: str = '1h', since: Optional[int] = None, limit: Optional[int] = None) -> list:
+        self._call()
+        window = self._window(since, limit)
+        return [
+            {'timestamp': int(ts), 'openInterestValue': float(value)}
+            for ts, value in zip(self.market['timestamp'][window], self.market['oi_value'][window])
+        ]
+
+    def fetch_funding_rate(self, symbol: str) -> dict:
+        self._call()
+        return {'fundingRate': 0.0001}
+
+    def fetch_open_interest(self, symbol: str) -> dict:
+        self._call()
+        return {'openInterestValue': float(self.market['oi_value'][-1])}
+
+    def fetch_ticker(self, symbol: str) -> dict:
+        self._call()
+        return {'last': float(self.market['close'][-1])}
+
+
+def make_exchanges(count: int, n_candles: int, seed: int = 0, latency: float = 0.0) -> List[SyntheticExchange]:
+    """count synthetic exchanges quoting one seeded base market (venue_market per exchange)"""
+    base = synthetic_market(n_candles, seed=seed)
+    shares = np.random.default_rng(seed).dirichlet(np.full(count, 4.0)) if count else []
+    return [
+        SyntheticExchange(
+            f'synthetic{i}', n_candles, latency=latency,
+            market=venue_market(base, seed=seed + 1 + i, share=float(share))
+        )
+        for i, share in enumerate(shares)
+    ]
+
+
+def synthetic_entries(n: int, agg_df: pd.DataFrame, seed: int = 0) -> List[Entry]:
+    """
+    n entries spread over the market's candles, for sizing the liquidation stages
+    independently of what the detectors happen to find.
+    """
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(agg_df), n)
+    sides = [Side.LONG, Side.SHORT, Side.NEUTRAL]
+    side_codes = rng.choice(len(sides), n, p=[0.45, 0.45, 0.10])
+    weights = rng.random(n)
+    weights /= weights.sum()
+
+    return [
+        Entry(
+            side=sides[code],
+            price=float(agg_df['close'].iat[row]),
+            weight=float(weight),
+            start_time=agg_df['timestamp'].iat[row],
+            end_time=agg_df['timestamp'].iat[row],
+        )
+        for row, code, weight in zip(rows, side_codes, weights)
+    ]
@@ -0,0 +1,344 @@
+"""
+Pipeline Benchmark Runner
+
+    python -m benchmarks.run                                   # Profile + all scaling curves
+    python -m benchmarks.run --curves lookback --lookbacks 24,336,720
+    python -m benchmarks.run --json out.json                   # Save results
+    python -m benchmarks.run --compare out.json                # Exit 1 if a stage got slower
+    python -m benchmarks.run --archive exchange-archive        # Recorded market snapshot (see src/replay.py)
+
+Every MapPipeline stage is timed on its own (median of --repeat runs, on a fresh pipeline
+whose upstream stages are already cached) and then run once more under tracemalloc for its
+peak traced allocation. Fetches start cold each run (client pool, market frames and the
+candle store are bypassed) against synthetic exchanges.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+import tracemalloc
+import numpy as np
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+import src.config as config
+from src import exchange_data
+from src import pipeline as pipeline_module
+from src.exchange_data import fetch_data, reset_exchange_pool
+from src.pipeline import MapPipeline
+from src.payloads import build_map_response, build_map_entry
+from src.replay import ReplayExchange, ARCHIVE_SUFFIX
+from .fixtures import make_exchanges, synthetic_entries
+
+STAGES = [
+    'fetch_data',
+    'aggregate_market_view',  # MapPipeline.agg_df
+    'estimate_entries',       # .entries
+    'summary_stats',          # .summary
+    'leverage_samples',
+    'raw_points',
+    'extreme_index',          # .extremes
+    'bins_sampled',           # .bins with BINNING_ENGINE = 'sampled' (includes bin status)
+    'bins_analytic',          # .bins with BINNING_ENGINE = 'analytic'
+    'pyramid',                # .pyramid (configured BINNING_ENGINE)
+    'raw_status',             # .raw_liqs
+    'magnetism',              # .direction
+    'serialize',              # build_map_response + build_map_entry (JSON, binary, compression)
+]
+
+# Default Shape Of A Single Profile (Matches The Scheduled Update: 4 Exchanges, 14 Days)
+DEFAULT_EXCHANGES = 4
+DEFAULT_LOOKBACK = 24 * 14
+
+# Detected Entries Expected From Synthetic Markets At DEFAULT_LOOKBACK Or Longer (Fewer Means
+# The Fixtures Stopped Exercising The Liquidation Stages)
+MIN_DETECTED_ENTRIES = 10
+
+
+def measure(fn: Callable, repeat: int, seed: int) -> Tuple[object, float, int]:
+    """
+    Run fn repeat times for timing, then once under tracemalloc.
+
+    Returns:
+        (last result, median seconds, peak traced bytes)
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        random.seed(seed)
+        np.random.seed(seed)
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+
+    random.seed(seed)
+    np.random.seed(seed)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, statistics.median(times), peak
+
+
+@contextmanager
+def binning_engine(engine: str):
+    """Run MapPipeline stages under another BINNING_ENGINE"""
+    previous = pipeline_module.BINNING_ENGINE
+    pipeline_module.BINNING_ENGINE = engine
+    try:
+        yield
+    finally:
+        pipeline_module.BINNING_ENGINE = previous
+
+
+def pipeline_stage(base: MapPipeline, name: str) -> Callable:
+    """Callable computing one stage on a fresh MapPipeline seeded with base's other cached stages"""
+    def fn():
+        pipeline = MapPipeline(base.df)
+        pipeline.__dict__.update((k, v) for k, v in base.__dict__.items() if k not in ('df', 'timings', name))
+        return getattr(pipeline, name)
+    return fn
+
+
+def profile_pipeline(
+    exchange_count: int = DEFAULT_EXCHANGES,
+    lookback: int = DEFAULT_LOOKBACK,
+    entry_count: Optional[int] = None,
+    repeat: int = 3,
+    seed: int = 0,
+    latency: float = 0.0,
+    archive: Optional[str] = None
+) -> dict:
+    """
+    Time every stage once for one market shape.
+
+    Args:
+        exchange_count: Synthetic exchanges fetched and combined
+        lookback: Candles (hours) per exchange
+        entry_count: Replace detected entries with this many synthetic ones (None = use detectors)
+        latency: Seconds per simulated exchange call
+        archive: Replay this recorded archive directory instead of synthetic exchanges
+                 (exchange_count then caps how many recorded exchanges are used)
+
+    Returns:
+        {'params', 'stages': {stage: {'seconds', 'peak_bytes'}}, 'counts', 'total_seconds'}
+    """
+    if archive:
+        exchange_ids = sorted(f[:-len(ARCHIVE_SUFFIX)] for f in os.listdir(archive) if f.endswith(ARCHIVE_SUFFIX))
+        exchanges = [ReplayExchange.open(archive, exchange_id) for exchange_id in exchange_ids[:exchange_count]]
+    else:
+        exchanges = make_exchanges(exchange_count, lookback, seed=seed, latency=latency)
+    stages = {}
+
+    def run(stage: str, fn: Callable):
+        result, seconds, peak = measure(fn, repeat, seed)
+        stages[stage] = {'seconds': seconds, 'peak_bytes': peak}
+        return result
+
+    def fetch():
+        reset_exchange_pool()
+        return fetch_data(exchanges=exchanges, lookback=lookback)
+
+    df = run('fetch_data', fetch)
+    base = MapPipeline(df)
+
+    def stage(stage_name: str, attribute: str, engine: Optional[str] = None):
+        # Timed On Fresh Pipelines, Then Cached On base For The Stages Downstream Of It
+        with binning_engine(engine or pipeline_module.BINNING_ENGINE):
+            value = run(stage_name, pipeline_stage(base, attribute))
+        base.__dict__[attribute] = value
+        return value
+
+    agg_df = stage('aggregate_market_view', 'agg_df')
+    entries = stage('estimate_entries', 'entries')
+    if entry_count is not None:
+        entries = base.__dict__['entries'] = synthetic_entries(entry_count, agg_df, seed=seed)
+
+    stage('summary_stats', 'summary')
+    stage('leverage_samples', 'leverage_samples')
+    stage('raw_points', 'raw_points')
+    stage('extreme_index', 'extremes')
+
+    # Both Engines' Bins Timed; The Configured One Is Kept For The Map
+    sampled = stage('bins_sampled', 'bins', engine='sampled')
+    analytic = stage('bins_analytic', 'bins', engine='analytic')
+    base.__dict__['bins'] = sampled if pipeline_module.BINNING_ENGINE == 'sampled' else analytic
+
+    stage('pyramid', 'pyramid')
+    raw_liqs = stage('raw_status', 'raw_liqs')
+    stage('magnetism', 'direction')
+
+    result = base.result()
+    entry = run('serialize', lambda: build_map_entry(
+        build_map_response(result), raw_df=result['raw_liqs'], pyramid=result['pyramid']
+    ))
+
+    return {
+        'params': {'exchange_count': exchange_count, 'lookback': lookback, 'entry_count': entry_count, 'latency': latency},
+        'stages': stages,
+        'counts': {
+            'rows': len(df),
+            'entries': len(entries),
+            'raw_points': len(raw_liqs),
+            'json_bytes': len(entry['payload']['identity']),
+            'binary_bytes': len(entry['binary']['identity']),
+        },
+        'total_seconds': sum(s['seconds'] for s in stages.values()),
+    }
+
+
+def scaling_curve(param: str, values: List[int], **kwargs) -> dict:
+    """
+    Profile the pipeline at each value of one parameter (others held at kwargs / defaults).
+
+    Returns:
+        {'param', 'points': [profile_pipeline output], 'exponent': log-log slope of total time}
+    """
+    points = []
+    for value in values:
+        points.append(profile_pipeline(**dict(kwargs, **{param: value})))
+        print(f"  {param}={value}: {points[-1]['total_seconds'] * 1000:.1f} ms", file=sys.stderr)
+
+    # ~1 = linear, ~2 = quadratic; a jump between runs is a regression in how a stage scales
+    exponent = None
+    if len(values) > 1:
+        totals = [p['total_seconds'] for p in points]
+        exponent = float(np.polyfit(np.log(values), np.log(totals), 1)[0])
+
+    return {'param': param, 'points': points, 'exponent': exponent}
+
+
+# ========== REPORTING ========== #
+def _mb(n: int) -> str:
+    return f"{n / 2**20:8.2f}"
+
+
+def print_profile(profile: dict):
+    params = profile['params']
+    print(f"\n📊 Profile: {params['exchange_count']} exchanges x {params['lookback']} candles"
+          + (f", {params['entry_count']} entries" if params['entry_count'] is not None else ""))
+    print(f"{'stage':<26}{'ms':>10}{'peak MB':>10}")
+    for stage in STAGES:
+        s = profile['stages'][stage]
+        print(f"{stage:<26}{s['seconds'] * 1000:10.2f}{_mb(s['peak_bytes']):>10}")
+    print(f"{'total':<26}{profile['total_seconds'] * 1000:10.2f}")
+    print("   " + ", ".join(f"{k}={v}" for k, v in profile['counts'].items()))
+
+
+def print_curve(curve: dict):
+    param = curve['param']
+    print(f"\n📈 Scaling over {param}" + (f" (exponent {curve['exponent']:.2f})" if curve['exponent'] is not None else ""))
+    header = f"{param:>10}" + "".join(f"{stage[:12]:>14}" for stage in STAGES) + f"{'total':>12}{'peak MB':>10}"
+    print(header)
+    for point in curve['points']:
+        stages = point['stages']
+        peak = max(s['peak_bytes'] for s in stages.values())
+        print(
+            f"{point['params'][param]:>10}"
+            + "".join(f"{stages[stage]['seconds'] * 1000:14.2f}" for stage in STAGES)
+            + f"{point['total_seconds'] * 1000:12.2f}{_mb(peak):>10}"
+        )
+
+
+def thin_workloads(results: dict) -> List[str]:
+    """Synthetic profiles at DEFAULT_LOOKBACK or longer whose detectors found too few entries"""
+    profiles = [results['profile']] + [point for curve in results['curves'] for point in curve['points']]
+    thin = []
+    for profile in profiles:
+        params = profile['params']
+        if params['entry_count'] is None and params['lookback'] >= DEFAULT_LOOKBACK and profile['counts']['entries'] < MIN_DETECTED_ENTRIES:
+            thin.append(f"{params['exchange_count']} exchanges x {params['lookback']} candles: {profile['counts']['entries']} entries")
+    return thin
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Stages of the main profile that are slower than baseline by more than tolerance (fraction)"""
+    regressions = []
+    for stage in STAGES:
+        before = baseline['profile']['stages'].get(stage, {}).get('seconds')
+        after = current['profile']['stages'][stage]['seconds']
+        if before and after > before * (1 + tolerance):
+            regressions.append(f"{stage}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def _ints(text: str) -> List[int]:
+    return [int(v) for v in text.split(',') if v.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark of the liquidation map pipeline")
+    parser.add_argument('--exchanges', type=int, default=DEFAULT_EXCHANGES, help="Exchanges in the main profile")
+    parser.add_argument('--lookback', type=int, default=DEFAULT_LOOKBACK, help="Candles (hours) in the main profile")
+    parser.add_argument('--entries', type=int, default=None, help="Synthetic entry count (default: detected entries)")
+    parser.add_argument('--curves', default='lookback,exchanges,entries', help="Scaling curves to run ('' for none)")
+    parser.add_argument('--lookbacks', type=_ints, default=[24, 168, 336, 720])
+    parser.add_argument('--exchange-counts', type=_ints, default=[1, 2, 4, 8])
+    parser.add_argument('--entry-counts', type=_ints, default=[10, 100, 500])
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per stage (median reported)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds per simulated exchange call")
+    parser.add_argument('--archive', help="Replay a recorded exchange archive directory instead of synthetic markets")
+    parser.add_argument('--json', dest='json_path', help="Write results to this file")
+    parser.add_argument('--compare', dest='baseline_path', help="Baseline results file to check against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown per stage before --compare fails")
+    args = parser.parse_args(argv)
+
+    # Cold, Deterministic Fetches: No Local Candle Store, No Shared Market Frames
+    config.CANDLE_STORE_DIR = ""
+    exchange_data.MARKET_CACHE_ENABLED = False
+
+    shared = {'repeat': args.repeat, 'seed': args.seed, 'latency': args.latency, 'archive': args.archive}
+    main_params = {'exchange_count': args.exchanges, 'lookback': args.lookback, 'entry_count': args.entries}
+
+    results = {'profile': profile_pipeline(**main_params, **shared), 'curves': []}
+    print_profile(results['profile'])
+
+    curve_values = {
+        'lookback': ('lookback', args.lookbacks),
+        'exchanges': ('exchange_count', args.exchange_counts),
+        'entries': ('entry_count', args.entry_counts),
+    }
+    for name in [c.strip() for c in args.curves.split(',') if c.strip()]:
+        param, values = curve_values[name]
+        print(f"⏱️  Scaling curve: {name}", file=sys.stderr)
+        fixed = {k: v for k, v in main_params.items() if k != param}
+        curve = scaling_curve(param, values, **fixed, **shared)
+        results['curves'].append(curve)
+        print_curve(curve)
+
+    if args.json_path:
+        with open(args.json_path, 'w') as fh:
+            json.dump(results, fh, indent=2)
+        print(f"\n💾 Results written to {args.json_path}")
+
+    # Recorded Archives Are Real Markets; Only The Synthetic Fixtures Are Held To A Workload Floor
+    thin = [] if args.archive else thin_workloads(results)
+    if thin:
+        print(f"\n❌ {len(thin)} profile(s) detected fewer than {MIN_DETECTED_ENTRIES} entries:")
+        for line in thin:
+            print(f"   {line}")
+        return 1
+
+    if args.baseline_path:
+        with open(args.baseline_path) as fh:
+            regressions = compare(results, json.load(fh), args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} stage(s) slower than baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print("\n✅ No stage slower than baseline")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
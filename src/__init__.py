@@ -5,6 +5,8 @@ Liquidation Map Indicator - Data Aggregation Package
 from .exchange_data import (
     fetch_data, 
     fetch_single_exchange_data, 
+    fetch_exchanges_data,
+    combine_exchange_data,
     get_exchanges
 )
 from .config import (
@@ -17,6 +19,8 @@ from .config import (
 __all__ = [
     'fetch_data',
     'fetch_single_exchange_data',
+    'fetch_exchanges_data',
+    'combine_exchange_data',
     'get_exchanges',
     'ACTIVE_EXCHANGES',
     'SYMBOLS',
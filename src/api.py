@@ -1,25 +1,63 @@
 import time
+import asyncio
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from apscheduler.schedulers.background import BackgroundScheduler
 from typing import Optional, List
 import pandas as pd
+import numpy as np
 from google.cloud import storage
 import json
 import os
 from supabase import create_client, Client
 
-from .models import CacheStatus, LiquidationMapResponse, RawLiquidation
-from .main import calculate_map_data
-from .config import validate_ticker, validate_exchanges, validate_lookback
+from .models import CacheStatus, LiquidationMapResponse, MagnetismCurveResponse, BinData, Side, Status
+from .payloads import build_map_entry, choose_encoding, filter_raw_columns, render_filtered, SIDE_CODES, STATUS_CODES
+from .pyramid import BinPyramid
+from .resolution import magnetism_curve
+from .broadcast import MapBroadcast, HEARTBEAT_SECONDS
+from .result_cache import SingleFlightCache
+from .metrics import (
+    REGISTRY,
+    STAGE_SECONDS,
+    MAP_CACHE_LOOKUPS,
+    UPDATE_RUNS,
+    stage_timer,
+    record_payload_sizes
+)
+from .compute import (
+    ComputeBusyError,
+    calculate_published_map,
+    calculate_map_matrix,
+    compute_slot,
+    pending_computations,
+    run_blocking,
+    shutdown_compute_pool
+)
+from .config import (
+    validate_ticker,
+    validate_exchanges,
+    validate_lookback,
+    get_lookback_hours,
+    ACTIVE_EXCHANGES,
+    DEFAULT_TICKER,
+    DEFAULT_LOOKBACK_DAYS,
+    PRECOMPUTE_LOOKBACK_DAYS,
+    PYRAMID_MAX_BUCKETS,
+    VALID_TICKERS
+)
 from datetime import datetime, timedelta
 
 # Configuration
 BUCKET_NAME = "liquidation-cache-crypto-dash-482023"
 STORAGE_CLIENT = storage.Client()
 CACHE_BLOB_NAME = "latest_map.json"
+MAP_REVALIDATE_SECONDS = 30  # How long the in-memory map is served before re-checking the GCS blob generation
+CUSTOM_CACHE_TTL_SECONDS = 120  # How long a computed custom map is reused
 
 # Supabase Config
 SUPABASE_URL = os.environ.get("SUPABASE_PROJECT_URL")
@@ -35,37 +73,174 @@ if SUPABASE_URL and SUPABASE_KEY:
 else:
     print("⚠️ Supabase credentials not found (SUPABASE_URL, SUPABASE_KEY)")
 
-# Lightweight status tracking only (no data stored in memory)
+# Lightweight status tracking
 CACHE_STATUS = {"status": CacheStatus.INITIALIZING}
 
-def save_to_gcs(data: LiquidationMapResponse):
-    """Persists the cache to Google Cloud Storage (no local copy)"""
+# Custom Maps Keyed By (ticker, lookback hours, sorted exchanges)
+CUSTOM_MAP_CACHE = SingleFlightCache(ttl_seconds=CUSTOM_CACHE_TTL_SECONDS)
+
+# In-Process Copies Of Published Maps, Versioned By Their GCS Blob Generation
+# blob name -> {"entry": payloads.build_map_entry(...) + {"generation": int} (None if no blob), "checked_at": float}
+MAP_CACHE = {}
+MAP_CACHE_LOCK = threading.Lock()  # Guards MAP_CACHE / MAP_REVALIDATE_LOCKS only (never held across GCS or encoding)
+
+# One Revalidation At A Time Per Blob (A Slow Blob Never Holds Up The Others)
+MAP_REVALIDATE_LOCKS = {}
+
+# Precomputed Maps (Default Exchanges), One Blob Per (ticker, lookback hours)
+PRECOMPUTED_HOURS = {get_lookback_hours(days) for days in PRECOMPUTE_LOOKBACK_DAYS}
+DEFAULT_EXCHANGE_KEY = tuple(sorted(ACTIVE_EXCHANGES))
+PUBLISH_MAX_WORKERS = 8  # Parallel GCS uploads per update
+
+# Map Update Stream: Published Versions Pushed To SSE Subscribers (Keyed By Blob Name)
+MAP_BROADCAST = MapBroadcast()
+
+# Magnetism Curve Endpoint
+MAGNETISM_CURVE_MAX_POINTS = 1000
+MAGNETISM_CURVE_DEFAULT_RANGE = 0.10  # Default grid: current price +/- 10%
+
+def map_blob_name(ticker: str, lookback_hours: int) -> str:
+    """GCS blob holding the precomputed map for a ticker / lookback"""
+    return f"maps/{ticker.upper()}_{lookback_hours}h.json"
+
+def pyramid_blob_name(blob_name: str) -> str:
+    """GCS sidecar holding a map blob's bin pyramid (npz)"""
+    return f"{os.path.splitext(blob_name)[0]}.pyramid.npz"
+
+def load_pyramid(bucket, blob_name: str, response: LiquidationMapResponse) -> Optional[BinPyramid]:
+    """A map blob's pyramid sidecar, if present and written for this map version"""
     try:
-        bucket = STORAGE_CLIENT.bucket(BUCKET_NAME)
-        blob = bucket.blob(CACHE_BLOB_NAME)
-        # Use model_dump_json() for Pydantic V2
-        blob.upload_from_string(
-            data.model_dump_json(), 
-            content_type='application/json'
-        )
-        print("✅ Cache persisted to GCS")
-        return True
+        sidecar = bucket.get_blob(pyramid_blob_name(blob_name))
+        if sidecar is None:
+            return None
+        pyramid, tag = BinPyramid.from_bytes(sidecar.download_as_bytes())
+        # Sidecar Of Another Map Version (Mid-Publish Or Stale): Fall Back To Raw Points
+        return pyramid if tag == response.timestamp else None
     except Exception as e:
-        print(f"❌ GCS Save failed: {e}")
-        return False
+        print(f"⚠️ Pyramid sidecar of {blob_name} unavailable: {e}")
+        return None
+
+def entry_pyramid(entry: dict) -> BinPyramid:
+    """Entry's bin pyramid (approximated from its raw points when it was published without one)"""
+    if entry.get("pyramid") is None:
+        entry["pyramid"] = BinPyramid.from_raw_columns(entry["columns"], entry["response"].summary.close)
+    return entry["pyramid"]
+
+def set_cached_map(entry: dict, generation: Optional[int], blob_name: str = CACHE_BLOB_NAME):
+    """Install a map version (payloads.build_map_entry output) as the in-memory copy of a blob"""
+    entry = dict(entry, generation=generation)
+    with MAP_CACHE_LOCK:
+        MAP_CACHE[blob_name] = {"entry": entry, "checked_at": time.monotonic()}
+    MAP_BROADCAST.publish(blob_name, entry["response"], entry["meta_json"])
+
+def peek_cached_entry(blob_name: str = CACHE_BLOB_NAME) -> tuple:
+    """
+    In-memory state of a blob without touching GCS.
+
+    Returns:
+        (fresh, entry): fresh is False when the blob is due for revalidation
+    """
+    slot = MAP_CACHE.get(blob_name)
+    if slot is None or time.monotonic() - slot["checked_at"] >= MAP_REVALIDATE_SECONDS:
+        return False, slot["entry"] if slot else None
+    return True, slot["entry"]
+
+def _revalidate_lock(blob_name: str) -> threading.Lock:
+    with MAP_CACHE_LOCK:
+        return MAP_REVALIDATE_LOCKS.setdefault(blob_name, threading.Lock())
+
+def get_cached_entry(blob_name: str = CACHE_BLOB_NAME) -> dict | None:
+    """
+    Published map entry from memory, revalidated against the GCS blob generation at most
+    every MAP_REVALIDATE_SECONDS. The blob is only downloaded, parsed and compressed
+    when its generation changed, so hot requests never touch GCS or pydantic.
+    A missing blob is remembered for the same interval.
+
+    Concurrent revalidations of one blob share a per-blob lock; other blobs and
+    set_cached_map are never blocked by it.
+    """
+    # Fresh Enough: Serve From Memory
+    fresh, entry = peek_cached_entry(blob_name)
+    if fresh:
+        MAP_CACHE_LOOKUPS.inc(blob=blob_name, result="memory")
+        return entry
+
+    with _revalidate_lock(blob_name):
+        # Another request may have revalidated while we waited on the lock
+        fresh, entry = peek_cached_entry(blob_name)
+        if fresh:
+            MAP_CACHE_LOOKUPS.inc(blob=blob_name, result="memory")
+            return entry
+        previous, downloaded = entry, None
+
+        try:
+            bucket = STORAGE_CLIENT.bucket(BUCKET_NAME)
+            blob = bucket.get_blob(blob_name)  # Metadata only (None if missing)
+
+            # New Version Published (Here Or By Another Instance): Download + Parse + Compress Once
+            if blob is not None and (entry is None or blob.generation != entry["generation"]):
+                with stage_timer(None, "gcs_download"):
+                    content = blob.download_as_bytes(if_generation_match=blob.generation)
+                    response = LiquidationMapResponse.model_validate_json(content)
+                    pyramid = load_pyramid(bucket, blob_name, response)
+                    entry = downloaded = dict(build_map_entry(response, json_body=content, pyramid=pyramid), generation=blob.generation)
+                MAP_CACHE_LOOKUPS.inc(blob=blob_name, result="downloaded")
+                print(f"✅ Loaded {blob_name} generation {blob.generation} from GCS")
+            else:
+                MAP_CACHE_LOOKUPS.inc(blob=blob_name, result="missing" if blob is None else "unchanged")
 
-def load_from_gcs() -> LiquidationMapResponse | None:
-    """Load the cache directly from GCS (no memory caching)"""
+        except Exception as e:
+            # Keep serving the copy we have; retry after the next interval
+            MAP_CACHE_LOOKUPS.inc(blob=blob_name, result="error")
+            print(f"⚠️ GCS revalidation of {blob_name} failed: {e}")
+
+        with MAP_CACHE_LOCK:
+            # Published Here While We Revalidated: Keep That Copy Unless Ours Is Newer
+            current = MAP_CACHE.get(blob_name, {}).get("entry")
+            if current is not None and current is not previous and (
+                entry is None or (current["generation"] or 0) >= (entry["generation"] or 0)
+            ):
+                entry = current
+            MAP_CACHE[blob_name] = {"entry": entry, "checked_at": time.monotonic()}
+
+        # Announce Only A Version This Call Installed (set_cached_map Announces Its Own)
+        if downloaded is not None and entry is downloaded:
+            MAP_BROADCAST.publish(blob_name, entry["response"], entry["meta_json"])
+        return entry
+
+
+def get_cached_map() -> LiquidationMapResponse | None:
+    """Latest map model (see get_cached_entry)"""
+    entry = get_cached_entry()
+    return entry["response"] if entry else None
+
+def save_to_gcs(data: LiquidationMapResponse, entry: Optional[dict] = None, blob_name: str = CACHE_BLOB_NAME):
+    """Persists a map to Google Cloud Storage and refreshes the in-memory copy"""
     try:
+        # Serialize + compress once; the same JSON bytes are uploaded and served
+        if entry is None:
+            entry = build_map_entry(data)
+
         bucket = STORAGE_CLIENT.bucket(BUCKET_NAME)
-        blob = bucket.blob(CACHE_BLOB_NAME)
-        if blob.exists():
-            content = blob.download_as_text()
-            response = LiquidationMapResponse.model_validate_json(content)
-            return response
+        blob = bucket.blob(blob_name)
+        with stage_timer(None, "gcs_upload"):
+            # Pyramid Sidecar First, So A New Map Generation Always Finds Its Own
+            if entry.get("pyramid") is not None:
+                bucket.blob(pyramid_blob_name(blob_name)).upload_from_string(
+                    entry["pyramid"].to_bytes(tag=data.timestamp),
+                    content_type='application/octet-stream'
+                )
+            blob.upload_from_string(
+                entry["payload"]["identity"], 
+                content_type='application/json'
+            )
+        # Upload sets the new generation; this instance skips re-downloading it
+        set_cached_map(entry, blob.generation, blob_name)
+        print(f"✅ {blob_name} persisted to GCS")
+        return True
     except Exception as e:
-        print(f"⚠️ GCS Load failed: {e}")
-    return None
+        print(f"❌ GCS Save of {blob_name} failed: {e}")
+        return False
 
 def save_prediction_to_supabase(response_model: LiquidationMapResponse):
     """Save the new prediction and full report to Supabase"""
@@ -120,7 +295,7 @@ def backfill_actuals():
         
         # We need current price. We can get it from the cache or fetch fresh
         # For simplicity, let's assume the cache is reasonably fresh
-        current_data = load_from_gcs()
+        current_data = get_cached_map()
         if not current_data:
             print("⚠️ Cannot grade: No current price available")
             return
@@ -156,59 +331,57 @@ def backfill_actuals():
         print(f"❌ Grading failed: {e}")
 
 def update_cache():
-    """Main loop: Fetch from exchanges and save to GCS (no memory caching)"""
+    """
+    Main loop: Compute every ticker x lookback map, save each to GCS (+ in-memory copies).
+
+    The default map (DEFAULT_TICKER over DEFAULT_LOOKBACK_DAYS) is also published as
+    latest_map.json and is the one graded / saved to Supabase; the update counts as
+    failed only if that map could not be published.
+    """
+    start = time.perf_counter()
     try:
         print("🔄 Updating cache...")
-        # Call Main Sequence (The heavy lifting)
-        result = calculate_map_data()
+        # Call Main Sequence (One fetch per ticker; every lookback computed + encoded in worker processes)
+        matrix = calculate_map_matrix(VALID_TICKERS, PRECOMPUTE_LOOKBACK_DAYS)
 
         # Grade old predictions (do this first to keep logic clean)
-        backfill_actuals()
+        with stage_timer(None, "backfill_actuals"):
+            backfill_actuals()
 
-        # Validate Data Present
-        if not result['bins'].empty:
-            # Prepare bins for Pydantic serialization
-            bins_df = result['bins'].copy()
-            bins_df['bucket'] = bins_df['bucket'].astype(str)
-            
-            # Prepare raw liquidations (convert timestamp to unix time)
-            raw_liqs_list = None
-            if 'raw_liqs' in result and not result['raw_liqs'].empty:
-                raw_df = result['raw_liqs'].copy()
-                # Convert entry_start_time to unix timestamp if it exists
-                if 'entry_start_time' in raw_df.columns:
-                    raw_df['entry_time'] = raw_df['entry_start_time'].astype('int64') // 10**9
-                else:
-                    raw_df['entry_time'] = None
-                
-                raw_liqs_list = [
-                    RawLiquidation(
-                        price=row['price'],
-                        usd=row['usd'],
-                        side=row['side'],
-                        status=row['status'],
-                        entry_time=row.get('entry_time')
-                    ) for _, row in raw_df.iterrows()
-                ]
-            
-            # Construct the DTO
-            response = LiquidationMapResponse(
-                summary=result['summary'],
-                direction=result['direction'],
-                bins=bins_df.to_dict(orient='records'),
-                raw_liquidations=raw_liqs_list,
-                timestamp=time.time()
-            )
+        # Blob Name -> Entry For Every Map That Computed
+        publish = {}
+        for (ticker, days), outcome in matrix.items():
+            if isinstance(outcome, Exception):
+                print(f"⚠️ {ticker} {days}d map failed: {outcome}")
+                continue
+            # Validate Data Present
+            if not outcome["stats"]["bin_count"]:
+                continue
+            publish[map_blob_name(ticker, get_lookback_hours(days))] = outcome["entry"]
+            record_payload_sizes(outcome["entry"])
 
+        default_blob = map_blob_name(DEFAULT_TICKER, get_lookback_hours(DEFAULT_LOOKBACK_DAYS))
+        if default_blob in publish:
             # Save prediction AND full report to Supabase
-            save_prediction_to_supabase(response)
+            with stage_timer(None, "supabase_save"):
+                save_prediction_to_supabase(publish[default_blob]["response"])
+            publish[CACHE_BLOB_NAME] = publish[default_blob]
 
-            # Persist to GCS (no memory copy)
-            if save_to_gcs(response):
-                CACHE_STATUS["status"] = CacheStatus.READY
-                print(f"✅ Cache updated successfully at {pd.Timestamp.now()}")
-            else:
-                CACHE_STATUS["status"] = CacheStatus.ERROR
+        def publish_one(blob_name: str) -> bool:
+            entry = publish[blob_name]
+            return save_to_gcs(entry["response"], entry, blob_name=blob_name)
+
+        # Persist to GCS (also replaces the in-memory copies)
+        with stage_timer(None, "publish"), \
+                ThreadPoolExecutor(max_workers=PUBLISH_MAX_WORKERS, thread_name_prefix="gcs-publish") as pool:
+            saved = dict(zip(publish, pool.map(publish_one, publish)))
+
+        print(f"📦 Published {sum(saved.values())}/{len(publish)} map blobs ({len(matrix)} maps computed)")
+        if saved.get(CACHE_BLOB_NAME):
+            CACHE_STATUS["status"] = CacheStatus.READY
+            print(f"✅ Cache updated successfully at {pd.Timestamp.now()}")
+        else:
+            CACHE_STATUS["status"] = CacheStatus.ERROR
 
     except Exception as e:
         print(f"❌ Update Failed: {e}")
@@ -216,11 +389,31 @@ def update_cache():
         traceback.print_exc()
         CACHE_STATUS["status"] = CacheStatus.ERROR
 
+    STAGE_SECONDS.observe(time.perf_counter() - start, stage="update_cache")
+    UPDATE_RUNS.inc(outcome="ok" if CACHE_STATUS["status"] == CacheStatus.READY else "error")
+
+async def stream_watcher():
+    """Heartbeats for stream subscribers, and GCS revalidation of the blobs they follow"""
+    last_revalidated = time.monotonic()
+    while True:
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        MAP_BROADCAST.heartbeat()
+
+        # Versions Published By Other Instances Reach Subscribers Here (get_cached_entry Publishes)
+        if time.monotonic() - last_revalidated >= MAP_REVALIDATE_SECONDS:
+            last_revalidated = time.monotonic()
+            for blob_name in MAP_BROADCAST.subscriber_counts():
+                await run_blocking(get_cached_entry, blob_name)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Check if cache exists in GCS
+    # Map Versions Published From Any Thread Reach Stream Subscribers Through This Loop
+    MAP_BROADCAST.bind(asyncio.get_running_loop())
+    watcher = asyncio.create_task(stream_watcher())
+
+    # Check if cache exists in GCS (also warms the in-memory copy)
     print("🚀 Application startup...")
-    cached_data = load_from_gcs()
+    cached_data = get_cached_map()
     if cached_data:
         CACHE_STATUS["status"] = CacheStatus.READY
         print("✅ Found existing cache in GCS")
@@ -233,6 +426,8 @@ async def lifespan(app: FastAPI):
     yield
 
     # On Shutdown
+    watcher.cancel()
+    shutdown_compute_pool()
     print("🛑 Application shutdown complete.")
 
 # Define APP
@@ -255,16 +450,144 @@ app.add_middleware(
 # ========== The Endpoints ========== #
 @app.get("/api/status")
 def get_status():
-    """Simple check to see if cache is ready"""
-    return {"status": CACHE_STATUS["status"]}
+    """Simple check to see if cache is ready (+ custom map cache hit/miss statistics)"""
+    return {
+        "status": CACHE_STATUS["status"],
+        "custom_cache": CUSTOM_MAP_CACHE.stats(),
+        "pending_computations": pending_computations(),
+    }
+
+def _custom_cache_counts() -> dict:
+    stats = CUSTOM_MAP_CACHE.stats()
+    return {(event,): stats[event] for event in ("hits", "misses", "coalesced", "errors")}
+
+REGISTRY.callback(
+    "liqmap_custom_cache_events_total", "Custom map cache lookups by outcome", "counter",
+    _custom_cache_counts, ("event",)
+)
+REGISTRY.callback(
+    "liqmap_custom_cache_entries", "Custom maps currently cached", "gauge",
+    lambda: {(): CUSTOM_MAP_CACHE.stats()["size"]}
+)
+REGISTRY.callback(
+    "liqmap_pending_computations", "Maps running or queued in the compute tier", "gauge",
+    lambda: {(): pending_computations()}
+)
+REGISTRY.callback(
+    "liqmap_stream_subscribers", "Open map update streams", "gauge",
+    lambda: {(blob,): count for blob, count in MAP_BROADCAST.subscriber_counts().items()}, ("blob",)
+)
+
+@app.get("/api/metrics")
+def get_metrics():
+    """Pipeline timings, counts, payload sizes and cache counters (Prometheus text format)"""
+    return Response(content=REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+def raw_filters(
+    price_min: Optional[float] = Query(default=None, description="Only raw liquidations priced at or above this"),
+    price_max: Optional[float] = Query(default=None, description="Only raw liquidations priced at or below this"),
+    min_usd: Optional[float] = Query(default=None, description="Only raw liquidations of at least this USD size"),
+    side: Optional[Side] = Query(default=None, description="LONG or SHORT"),
+    status: Optional[Status] = Query(default=None, description="ACTIVE, CLEARED or PARTIAL"),
+) -> dict:
+    """Server-side raw liquidation filters (shared by the map endpoints)"""
+    filters = {
+        "price_min": price_min,
+        "price_max": price_max,
+        "min_usd": min_usd,
+        "side": side,
+        "status": status,
+    }
+    return {k: v for k, v in filters.items() if v is not None}
+
+def serve_map_entry(
+    request: Request,
+    entry: dict,
+    format: str,
+    filters: Optional[dict] = None,
+    buckets: Optional[int] = None
+) -> Response:
+    """
+    Return a cached map entry in the requested format.
+
+    Unfiltered requests get the pre-encoded body. Filtered requests are answered from the
+    entry's price-sorted raw index (raw points then come back ordered by price).
+    With buckets, bins are re-cut from the entry's pyramid over price_min..price_max.
+    """
+    filters = filters or {}
+    if buckets is not None:
+        binned = entry_pyramid(entry).query(buckets, filters.get("price_min"), filters.get("price_max"))
+        if not binned.empty:
+            binned['bucket'] = binned['bucket'].astype(str)
+        response = entry["response"].model_copy(update={
+            "bins": [BinData(**record) for record in binned.to_dict(orient='records')]
+        })
+        columns = filter_raw_columns(entry["index"], **filters) if filters else entry["columns"]
+        media_type = "application/octet-stream" if format == "binary" else "application/json"
+        return Response(content=render_filtered(entry, columns, format, response=response), media_type=media_type)
+
+    if filters:
+        columns = filter_raw_columns(entry["index"], **filters)
+        media_type = "application/octet-stream" if format == "binary" else "application/json"
+        return Response(content=render_filtered(entry, columns, format), media_type=media_type)
+
+    if format == "binary":
+        payload, media_type = entry["binary"], "application/octet-stream"
+    else:
+        payload, media_type = entry["payload"], "application/json"
+
+    body, encoding = choose_encoding(request.headers.get("accept-encoding"), payload)
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type=media_type, headers=headers)
+
+async def serve_map_entry_async(
+    request: Request,
+    entry: dict,
+    format: str,
+    filters: Optional[dict] = None,
+    buckets: Optional[int] = None
+) -> Response:
+    """serve_map_entry for async endpoints: filtered / re-bucketed bodies are rendered off the event loop"""
+    if filters or buckets is not None:
+        return await run_blocking(serve_map_entry, request, entry, format, filters, buckets)
+    return serve_map_entry(request, entry, format, filters, buckets)
+
+FORMAT_QUERY = Query(
+    default="json",
+    pattern="^(json|binary)$",
+    description="'json' (default) or 'binary': packed little-endian columnar raw liquidations (see README)"
+)
+
+BUCKETS_QUERY = Query(
+    default=None,
+    ge=1,
+    le=PYRAMID_MAX_BUCKETS,
+    description="Re-cut bins to at least this many buckets over price_min..price_max (zoom; answered from the precomputed bin pyramid, capped at the finest grid available over the window)"
+)
 
 @app.get("/api/liquidation-map", response_model=LiquidationMapResponse)
-def get_liquidation_map():
-    """Get the full dataset for the UI (cached, reads from GCS)"""
-    # Always read fresh from GCS (no memory cache)
-    data = load_from_gcs()
+def get_liquidation_map(
+    request: Request,
+    format: str = FORMAT_QUERY,
+    filters: dict = Depends(raw_filters),
+    buckets: Optional[int] = BUCKETS_QUERY
+):
+    """
+    Get the full dataset for the UI (served from memory, revalidated against GCS).
+
+    The body is pre-serialized and pre-compressed when the map is published, so it is
+    returned as-is (br / gzip / identity per Accept-Encoding) without re-validation.
+
+    Optional price_min / price_max / min_usd / side / status narrow raw_liquidations
+    server-side (bins and summary are unchanged). With buckets, bins are re-cut to that
+    resolution over the price_min..price_max window instead.
+    """
+    entry = get_cached_entry()
     
-    if data is None:
+    if entry is None:
         raise HTTPException(
             status_code=503, 
             detail={
@@ -273,24 +596,35 @@ def get_liquidation_map():
             }
         )
 
-    return data
+    return serve_map_entry(request, entry, format, filters, buckets)
 
 @app.get("/api/liquidation-map/custom", response_model=LiquidationMapResponse)
-def get_custom_liquidation_map(
+async def get_custom_liquidation_map(
+    request: Request,
     ticker: Optional[str] = Query(default="BTC", description="Ticker symbol (BTC, ETH, SOL, BNB, XRP, DOGE, ADA)"),
     lookback_days: Optional[float] = Query(default=14.0, description="Lookback period in days (0.5 = 12hr, 1 = 1 day, 7 = 1 week, 30 = 1 month)"),
-    exchanges: Optional[str] = Query(default=None, description="Comma-separated list of exchanges (e.g., 'binance,bybit,okx')")
+    exchanges: Optional[str] = Query(default=None, description="Comma-separated list of exchanges (e.g., 'binance,bybit,okx')"),
+    format: str = FORMAT_QUERY,
+    filters: dict = Depends(raw_filters),
+    buckets: Optional[int] = BUCKETS_QUERY
 ):
     """
-    Get liquidation map with custom parameters (NOT CACHED - may be slower).
+    Get liquidation map with custom parameters.
     
-    **Note**: This endpoint calculates fresh data on each request and does not use the cache.
-    Expect response times of 10-30 seconds depending on exchange availability.
+    **Note**: Every ticker over 0.5 / 1 / 7 / 14 / 30 days on the default exchanges is
+    precomputed by the scheduled update and served from memory. Other results are cached
+    for a short TTL per (ticker, lookback, exchange set), and
+    identical concurrent requests share one computation. A cold request calculates fresh
+    data and may take 10-30 seconds depending on exchange availability; the math runs in
+    a bounded worker-process pool and returns 429 when too many maps are already queued.
     
     ### Parameters:
     - **ticker**: BTC, ETH, SOL, BNB, XRP, DOGE, ADA
     - **lookback_days**: 0.5 (12hr), 1 (1 day), 7 (1 week), 30 (1 month)
     - **exchanges**: Comma-separated list from: binance, bybit, okx, hyperliquid, mexc, krakenfutures, kucoinfutures, gateio, bitget, deribit
+    - **format**: json (default) or binary
+    - **price_min / price_max / min_usd / side / status**: optional raw liquidation filters
+    - **buckets**: optional zoom resolution for bins over price_min..price_max
     
     ### Example:
     ```
@@ -309,55 +643,157 @@ def get_custom_liquidation_map(
             if not exchange_list:
                 raise HTTPException(status_code=400, detail="No valid exchanges provided")
         
-        # Calculate fresh data
-        result = calculate_map_data(
-            ticker=ticker,
-            exchanges=exchange_list,
-            lookback_days=lookback_days
-        )
-        
-        # Prepare response
-        bins_df = result['bins'].copy()
-        bins_df['bucket'] = bins_df['bucket'].astype(str)
-        
-        # Prepare raw liquidations
-        raw_liqs_list = None
-        if 'raw_liqs' in result and not result['raw_liqs'].empty:
-            raw_df = result['raw_liqs'].copy()
-            # Convert entry_start_time to unix timestamp if it exists
-            if 'entry_start_time' in raw_df.columns:
-                raw_df['entry_time'] = raw_df['entry_start_time'].astype('int64') // 10**9
-            else:
-                raw_df['entry_time'] = None
-            
-            raw_liqs_list = [
-                RawLiquidation(
-                    price=row['price'],
-                    usd=row['usd'],
-                    side=row['side'],
-                    status=row['status'],
-                    entry_time=row.get('entry_time')
-                ) for _, row in raw_df.iterrows()
-            ]
-        
-        response = LiquidationMapResponse(
-            summary=result['summary'],
-            direction=result['direction'],
-            bins=bins_df.to_dict(orient='records'),
-            raw_liquidations=raw_liqs_list,
-            timestamp=time.time()
+        # Normalized key: same ticker, lookback (hours) and exchange set -> same map
+        exchange_key = tuple(sorted(exchange_list or ACTIVE_EXCHANGES))
+        lookback_hours = get_lookback_hours(lookback_days)
+        cache_key = (ticker, lookback_hours, exchange_key)
+
+        # Precomputed By The Scheduled Update: Serve The Published Map
+        if exchange_key == DEFAULT_EXCHANGE_KEY and lookback_hours in PRECOMPUTED_HOURS:
+            blob_name = map_blob_name(ticker, lookback_hours)
+            fresh, entry = peek_cached_entry(blob_name)
+            if not fresh:
+                entry = await run_blocking(get_cached_entry, blob_name)
+            if entry is not None:
+                return await serve_map_entry_async(request, entry, format, filters, buckets)
+
+        def compute() -> dict:
+            # Backpressure: refuse new work once the compute tier is full
+            with compute_slot():
+                # Serialized And Compressed In The Worker, Like The Scheduled Update's Maps
+                entry = calculate_published_map(
+                    ticker=ticker,
+                    exchanges=list(exchange_key),
+                    lookback_days=lookback_days
+                )
+                record_payload_sizes(entry)
+                return entry
+
+        # Hits are looked up right here on the event loop; misses wait off the request threadpool
+        entry = CUSTOM_MAP_CACHE.peek(cache_key)
+        if entry is None:
+            # Cached for CUSTOM_CACHE_TTL_SECONDS; identical concurrent requests share one computation
+            entry = await run_blocking(CUSTOM_MAP_CACHE.get_or_compute, cache_key, compute)
+
+        return await serve_map_entry_async(request, entry, format, filters, buckets)
+
+    except HTTPException:
+        raise
+
+    except ComputeBusyError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Too many maps being calculated, retry shortly: {str(e)}",
+            headers={"Retry-After": "5"}
         )
         
-        return response
-        
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to calculate custom map: {str(e)}"
         )
 
+@app.get("/api/liquidation-map/stream")
+async def stream_liquidation_map(
+    request: Request,
+    ticker: Optional[str] = Query(default=DEFAULT_TICKER, description="Ticker symbol (BTC, ETH, SOL, BNB, XRP, DOGE, ADA)"),
+    lookback_days: Optional[float] = Query(default=DEFAULT_LOOKBACK_DAYS, description="Precomputed lookback in days (0.5, 1, 7, 14, 30)")
+):
+    """
+    Server-sent events for a precomputed map: a snapshot (map without raw_liquidations) on
+    connect, then a compact diff of summary / direction / bins each time a new version is
+    published, and a keep-alive comment every 15 seconds in between.
+
+    Reconnecting clients send Last-Event-ID (done by EventSource automatically) and only get
+    what they missed. Fetch /api/liquidation-map(/custom) for raw liquidations after an update.
+    """
+    ticker = validate_ticker(ticker)
+    lookback_hours = get_lookback_hours(validate_lookback(lookback_days))
+    if lookback_hours not in PRECOMPUTED_HOURS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Streams are available for precomputed lookbacks only: {PRECOMPUTE_LOOKBACK_DAYS} days"
+        )
+
+    # First Subscriber Of A Blob On This Instance: Seed The Broadcast With The Current Version
+    blob_name = map_blob_name(ticker, lookback_hours)
+    if not MAP_BROADCAST.has(blob_name):
+        _, entry = peek_cached_entry(blob_name)
+        if entry is None:
+            entry = await run_blocking(get_cached_entry, blob_name)
+        if entry is not None:
+            MAP_BROADCAST.publish(blob_name, entry["response"], entry["meta_json"])
+
+    return StreamingResponse(
+        MAP_BROADCAST.subscribe(blob_name, request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/magnetism-curve", response_model=MagnetismCurveResponse)
+def get_magnetism_curve(
+    ticker: Optional[str] = Query(default=DEFAULT_TICKER, description="Ticker symbol (BTC, ETH, SOL, BNB, XRP, DOGE, ADA)"),
+    lookback_days: Optional[float] = Query(default=DEFAULT_LOOKBACK_DAYS, description="Precomputed lookback in days (0.5, 1, 7, 14, 30)"),
+    price_min: Optional[float] = Query(default=None, gt=0, description="Lowest grid price (default: current price - 10%)"),
+    price_max: Optional[float] = Query(default=None, gt=0, description="Highest grid price (default: current price + 10%)"),
+    points: int = Query(default=200, ge=2, le=MAGNETISM_CURVE_MAX_POINTS, description="Evenly spaced grid prices")
+):
+    """
+    Upward / downward magnetism and bias as if price were at each point of a price grid.
+
+    Computed from the active raw liquidations of a precomputed map (default exchanges),
+    the same pull calculate_magnetism gives at the current price. Also returns, per price,
+    the cumulative active long USD at or above it and short USD at or below it.
+    """
+    ticker = validate_ticker(ticker)
+    lookback_hours = get_lookback_hours(validate_lookback(lookback_days))
+    if lookback_hours not in PRECOMPUTED_HOURS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Magnetism curves are available for precomputed lookbacks only: {PRECOMPUTE_LOOKBACK_DAYS} days"
+        )
+
+    entry = get_cached_entry(map_blob_name(ticker, lookback_hours))
+    if entry is None:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": "Data is warming up, please wait...",
+                "status": CACHE_STATUS["status"]
+            }
+        )
+
+    response = entry["response"]
+    current_price = response.summary.close
+    low = price_min if price_min is not None else current_price * (1 - MAGNETISM_CURVE_DEFAULT_RANGE)
+    high = price_max if price_max is not None else current_price * (1 + MAGNETISM_CURVE_DEFAULT_RANGE)
+    if not low < high:
+        raise HTTPException(status_code=400, detail="price_min must be below price_max")
+
+    # Price-Sorted Raw Index -> Active Points Stay Sorted
+    index = entry["index"]
+    active = index["status"] == STATUS_CODES.index(Status.ACTIVE)
+    curve = magnetism_curve(
+        index["price"][active],
+        index["usd"][active],
+        index["side"][active] == SIDE_CODES.index(Side.SHORT),
+        np.linspace(low, high, points)
+    )
+
+    body = MagnetismCurveResponse(
+        current_price=current_price,
+        price=curve["price"].tolist(),
+        upward_mag=curve["upward_mag"].tolist(),
+        downward_mag=curve["downward_mag"].tolist(),
+        bias=curve["bias"],
+        long_usd_above=curve["long_usd_above"].tolist(),
+        short_usd_below=curve["short_usd_below"].tolist(),
+        timestamp=response.timestamp
+    )
+    return Response(content=body.model_dump_json(), media_type="application/json")
+
 @app.post("/api/admin/update")
-def trigger_update(secret: str = Query(..., description="Secret key for authorization")):
+async def trigger_update(secret: str = Query(..., description="Secret key for authorization")):
     """
     Manually trigger cache update (for Cloud Scheduler or manual testing).
     
@@ -380,7 +816,7 @@ def trigger_update(secret: str = Query(..., description="Secret key for authoriz
     # Run synchronously so Cloud Run waits for completion
     try:
         print("🔄 Manual update triggered via /api/admin/update")
-        update_cache()
+        await run_blocking(update_cache)
         return {
             "status": "success",
             "message": "Cache updated successfully",
@@ -0,0 +1,165 @@
+"""
+Map Update Broadcast (Server-Sent Events)
+
+One in-memory broadcast per published blob: the latest map version is encoded once into
+SSE messages (a full snapshot and, while the blob has subscribers, a compact diff against
+the previous version) and every subscriber of that blob waits on one shared asyncio.Event.
+Publishing sets the event and swaps in a fresh one, so waking thousands of idle subscribers
+is one set() and each sends the same pre-encoded bytes.
+
+Publishers may run on any thread (update_cache, GCS revalidation); they hand the new
+version id and its meta JSON to the event loop with call_soon_threadsafe. Only those are
+kept per blob (never the map DTO), and diffs are taken between meta JSONs.
+
+Messages:
+
+    event: snapshot            Map without raw_liquidations (summary, direction, bins, timestamp)
+    event: diff                {"base": previous id, "timestamp", changed "summary" / "direction"
+                                fields, and "bins_changed" (same buckets) or "bins" (new buckets)}
+    : keep-alive               Comment line every HEARTBEAT_SECONDS
+
+Every event's id is its map version; a subscriber whose last id is the diff's base gets
+the diff, anyone else the snapshot (also honoured via the Last-Event-ID header on reconnect).
+"""
+
+import json
+import asyncio
+import threading
+from typing import AsyncIterator, Dict, Optional
+from .models import LiquidationMapResponse
+
+HEARTBEAT_SECONDS = 15
+HEARTBEAT = ": keep-alive\n\n"
+
+
+def map_version(response: LiquidationMapResponse) -> str:
+    """Event id of a map version (its generation timestamp)"""
+    return f"{response.timestamp:.6f}"
+
+
+def sse_message(event: str, event_id: str, data: str) -> str:
+    return f"event: {event}\nid: {event_id}\ndata: {data}\n\n"
+
+
+def map_diff(previous: dict, current: dict, base: str) -> dict:
+    """
+    Changed summary / direction fields and bins between two map versions.
+
+    Args:
+        previous, current: Parsed meta JSON of each version (map without raw_liquidations)
+        base: Event id of the previous version
+    """
+    diff = {"base": base, "timestamp": current["timestamp"]}
+
+    for field in ("summary", "direction"):
+        before, after = previous[field], current[field]
+        changed = {name: value for name, value in after.items() if before.get(name) != value}
+        if changed:
+            diff[field] = changed
+
+    # Same Buckets: Only The Bins That Changed; Otherwise The Edges Moved And Every Bin Is New
+    before_bins = {b["bucket"]: b for b in previous["bins"]}
+    after_bins = current["bins"]
+    if set(before_bins) == {b["bucket"] for b in after_bins}:
+        changed_bins = [b for b in after_bins if before_bins[b["bucket"]] != b]
+        if changed_bins:
+            diff["bins_changed"] = changed_bins
+    else:
+        diff["bins"] = after_bins
+
+    return diff
+
+
+class MapBroadcast:
+    """Latest version + shared wake-up event per key (blob name)"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._latest: Dict[str, dict] = {}          # key -> {"id", "base", "meta", "snapshot", "diff"}
+        self._events: Dict[str, asyncio.Event] = {}
+        self._subscribers: Dict[str, int] = {}
+        self._lock = threading.Lock()               # Subscriber counts are read from other threads
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Event loop that owns the subscribers (call at startup)"""
+        self._loop = loop
+
+    def publish(self, key: str, response: LiquidationMapResponse, meta_json: str):
+        """
+        Announce a map version from any thread (no-op before bind, or for a version already sent).
+
+        Args:
+            response: The map DTO (only its version id is kept)
+            meta_json: Its JSON without raw_liquidations (payloads.build_map_entry 'meta_json')
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._publish, key, map_version(response), meta_json)
+
+    def _publish(self, key: str, version: str, meta_json: str):
+        # On The Event Loop: Encode Once, Then Wake Every Subscriber Of The Key
+        previous = self._latest.get(key)
+        if previous is not None and previous["id"] == version:
+            return
+
+        # Diff Only For Blobs Someone Is Watching (Late Subscribers Get The Snapshot)
+        diff = None
+        if previous is not None and self.subscriber_counts().get(key):
+            body = map_diff(json.loads(previous["meta"]), json.loads(meta_json), previous["id"])
+            diff = sse_message("diff", version, json.dumps(body, separators=(",", ":")))
+
+        self._latest[key] = {
+            "id": version,
+            "base": previous["id"] if previous else None,
+            "meta": meta_json,
+            "snapshot": sse_message("snapshot", version, meta_json),
+            "diff": diff,
+        }
+        self._wake(key)
+
+    def _wake(self, key: str):
+        event = self._events.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def heartbeat(self):
+        """Wake every subscriber (those without a new version send a keep-alive); on the loop"""
+        for key in list(self._events):
+            self._wake(key)
+
+    def has(self, key: str) -> bool:
+        return key in self._latest
+
+    def subscriber_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {key: count for key, count in self._subscribers.items() if count}
+
+    async def subscribe(self, key: str, last_id: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        SSE messages for key until the caller stops iterating: the current version first
+        (unless last_id already is it), then one message per new version or heartbeat.
+        """
+        with self._lock:
+            self._subscribers[key] = self._subscribers.get(key, 0) + 1
+        try:
+            while True:
+                # Take The Event Before Reading State, So A Publish In Between Is Not Missed
+                event = self._events.get(key)
+                if event is None:
+                    event = self._events[key] = asyncio.Event()
+
+                latest = self._latest.get(key)
+                if latest is not None and latest["id"] != last_id:
+                    yield latest["diff"] if latest["diff"] and latest["base"] == last_id else latest["snapshot"]
+                    last_id = latest["id"]
+
+                await event.wait()
+
+                # Woken Without A New Version: Heartbeat
+                latest = self._latest.get(key)
+                if latest is None or latest["id"] == last_id:
+                    yield HEARTBEAT
+        finally:
+            with self._lock:
+                self._subscribers[key] -= 1
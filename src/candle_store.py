@@ -0,0 +1,244 @@
+"""
+Append-Only Local Store For Closed Candles & OI History
+
+Layout: {root}/{exchange}/{symbol}/{timeframe}/{kind}/{column}.bin
+
+Every column is its own raw little-endian array (int64 timestamps, float64 values).
+Rows are appended at the newest end, so reads are zero-copy np.memmap slices and a refresh
+only has to ask the exchange for candles newer than the last stored timestamp.
+"""
+
+import os
+import re
+import fcntl
+import threading
+import numpy as np
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+# Column Schemas Per Series Kind (timestamp Always First)
+OHLCV_COLUMNS: Tuple[str, ...] = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+OI_COLUMNS: Tuple[str, ...] = ('timestamp', 'oi_value', 'oi_amount')
+
+SCHEMAS = {
+    'ohlcv': OHLCV_COLUMNS,
+    'oi': OI_COLUMNS,
+}
+
+TIMESTAMP_DTYPE = np.dtype('<i8')
+VALUE_DTYPE = np.dtype('<f8')
+
+
+def _dtype(column: str) -> np.dtype:
+    return TIMESTAMP_DTYPE if column == 'timestamp' else VALUE_DTYPE
+
+
+def _safe(part: str) -> str:
+    # 'BTC/USDT:USDT' -> 'BTC_USDT_USDT'
+    return re.sub(r'[^A-Za-z0-9.-]+', '_', part)
+
+
+class CandleStore:
+    """Append-only columnar store keyed by (exchange, symbol, timeframe, kind)"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _series_dir(self, exchange_id: str, symbol: str, timeframe: str, kind: str) -> str:
+        return os.path.join(self.root, _safe(exchange_id), _safe(symbol), _safe(timeframe), kind)
+
+    @contextmanager
+    def _locked(self, series_dir: str):
+        # Thread Lock (Same Process) + File Lock (Other Workers Sharing The Directory)
+        with self._locks_guard:
+            lock = self._locks.setdefault(series_dir, threading.Lock())
+
+        with lock:
+            os.makedirs(series_dir, exist_ok=True)
+            with open(os.path.join(series_dir, '.lock'), 'a') as fh:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _shared(self, series_dir: str):
+        # Readers Share The File Lock, So Sizing + Mapping Never Overlaps An Append / Replace
+        if not os.path.isdir(series_dir):
+            yield
+            return
+
+        with open(os.path.join(series_dir, '.lock'), 'a') as fh:
+            fcntl.flock(fh, fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _row_count(series_dir: str, columns: Tuple[str, ...]) -> int:
+        # A Crash Mid-Append Can Leave Columns Uneven; Only Complete Rows Count
+        counts = []
+        for column in columns:
+            path = os.path.join(series_dir, f'{column}.bin')
+            if not os.path.exists(path):
+                return 0
+            counts.append(os.path.getsize(path) // _dtype(column).itemsize)
+        return min(counts)
+
+    def read(
+        self,
+        exchange_id: str,
+        symbol: str,
+        timeframe: str,
+        kind: str,
+        since: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Memory-map a stored series.
+
+        Args:
+            since: Optional timestamp (ms); only rows at or after it are returned
+
+        Returns:
+            Column name -> read-only array view (empty arrays if nothing is stored)
+        """
+        columns = SCHEMAS[kind]
+        series_dir = self._series_dir(exchange_id, symbol, timeframe, kind)
+
+        # Maps Stay Valid After Unlocking (Appends Only Grow Files, Replaces Swap In New Ones)
+        with self._shared(series_dir):
+            rows = self._row_count(series_dir, columns)
+            if rows == 0:
+                return {column: np.empty(0, dtype=_dtype(column)) for column in columns}
+
+            data = {
+                column: np.memmap(os.path.join(series_dir, f'{column}.bin'), dtype=_dtype(column), mode='r', shape=(rows,))
+                for column in columns
+            }
+
+        # Timestamps Are Strictly Increasing, So The Window Start Is A Binary Search
+        start = 0
+        if since is not None:
+            start = int(np.searchsorted(data['timestamp'], since, side='left'))
+
+        return {column: values[start:] for column, values in data.items()}
+
+    def time_range(self, exchange_id: str, symbol: str, timeframe: str, kind: str) -> Optional[Tuple[int, int]]:
+        """(oldest, newest) stored timestamp in ms, or None if the series is empty"""
+        columns = SCHEMAS[kind]
+        series_dir = self._series_dir(exchange_id, symbol, timeframe, kind)
+
+        with self._shared(series_dir):
+            rows = self._row_count(series_dir, columns)
+            if rows == 0:
+                return None
+
+            stamps = np.memmap(os.path.join(series_dir, 'timestamp.bin'), dtype=TIMESTAMP_DTYPE, mode='r', shape=(rows,))
+            return int(stamps[0]), int(stamps[-1])
+
+    def append(
+        self,
+        exchange_id: str,
+        symbol: str,
+        timeframe: str,
+        kind: str,
+        data: Dict[str, np.ndarray]
+    ) -> int:
+        """
+        Append rows newer than the last stored timestamp (older/duplicate rows are ignored).
+
+        Args:
+            data: Column name -> array; must contain every column of the kind's schema
+
+        Returns:
+            Number of rows written
+        """
+        columns = SCHEMAS[kind]
+        series_dir = self._series_dir(exchange_id, symbol, timeframe, kind)
+
+        stamps = np.asarray(data['timestamp'], dtype=TIMESTAMP_DTYPE)
+        if stamps.size == 0:
+            return 0
+
+        # Sort + Dedupe Incoming Rows
+        stamps, first = np.unique(stamps, return_index=True)
+
+        with self._locked(series_dir):
+            rows = self._row_count(series_dir, columns)
+
+            # Keep Only Rows Strictly After What Is Already Stored
+            if rows:
+                stored = np.memmap(os.path.join(series_dir, 'timestamp.bin'), dtype=TIMESTAMP_DTYPE, mode='r', shape=(rows,))
+                keep = stamps > stored[-1]
+                stamps, first = stamps[keep], first[keep]
+
+            if stamps.size == 0:
+                return 0
+
+            for column in columns:
+                path = os.path.join(series_dir, f'{column}.bin')
+
+                # Trim Any Partial Tail Left By An Interrupted Append
+                if os.path.exists(path) and os.path.getsize(path) != rows * _dtype(column).itemsize:
+                    os.truncate(path, rows * _dtype(column).itemsize)
+
+                values = stamps if column == 'timestamp' else np.asarray(data[column], dtype=VALUE_DTYPE)[first]
+                with open(path, 'ab') as fh:
+                    fh.write(np.ascontiguousarray(values, dtype=_dtype(column)).tobytes())
+
+            return int(stamps.size)
+
+    def replace(
+        self,
+        exchange_id: str,
+        symbol: str,
+        timeframe: str,
+        kind: str,
+        data: Dict[str, np.ndarray]
+    ) -> int:
+        """
+        Rewrite a series from scratch (used when a longer history than stored is fetched,
+        since appends can only extend the newest end).
+
+        Returns:
+            Number of rows written
+        """
+        columns = SCHEMAS[kind]
+        series_dir = self._series_dir(exchange_id, symbol, timeframe, kind)
+
+        stamps, first = np.unique(np.asarray(data['timestamp'], dtype=TIMESTAMP_DTYPE), return_index=True)
+
+        with self._locked(series_dir):
+            for column in columns:
+                path = os.path.join(series_dir, f'{column}.bin')
+                values = stamps if column == 'timestamp' else np.asarray(data[column], dtype=VALUE_DTYPE)[first]
+
+                # Write Aside, Then Swap In (Readers Never See A Half-Written Column)
+                with open(path + '.tmp', 'wb') as fh:
+                    fh.write(np.ascontiguousarray(values, dtype=_dtype(column)).tobytes())
+                os.replace(path + '.tmp', path)
+
+            return int(stamps.size)
+
+
+# ========== PROCESS-WIDE STORE ========== #
+_STORE: Optional[CandleStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_candle_store() -> Optional[CandleStore]:
+    """Shared store rooted at CANDLE_STORE_DIR (None when disabled, or when recording / replaying)"""
+    global _STORE
+    from .config import CANDLE_STORE_DIR, EXCHANGE_REPLAY_MODE
+
+    if not CANDLE_STORE_DIR or EXCHANGE_REPLAY_MODE in ('record', 'replay'):
+        return None
+
+    with _STORE_LOCK:
+        if _STORE is None or _STORE.root != CANDLE_STORE_DIR:
+            _STORE = CandleStore(CANDLE_STORE_DIR)
+        return _STORE
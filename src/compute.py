@@ -0,0 +1,242 @@
+"""
+Compute Tier For Map Calculations
+
+The exchange fetch is network-bound and shares the process-wide exchange clients and
+market caches, so it stays in the API process. The pandas / NumPy half of the pipeline
+(main.build_map_data), along with serializing and compressing its result, is CPU-bound
+and runs in a bounded pool of worker processes, so it neither holds the GIL nor occupies
+the web server's request threads.
+
+The scheduled update uses calculate_map_matrix: one fetch per ticker (all tickers
+fetched at once), every lookback computed (and serialized) in parallel across the same
+worker pool.
+
+Admission is bounded: once COMPUTE_MAX_PENDING computations are running or queued,
+new ones fail fast with ComputeBusyError (served as 429) instead of piling up. Update jobs
+are fed to the pool at most MATRIX_MAX_IN_FLIGHT at a time and count as pending while
+there, so an admitted request queues behind one round of them, not the whole matrix.
+"""
+
+import asyncio
+import threading
+import multiprocessing
+import pandas as pd
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config import (
+    COMPUTE_WORKERS,
+    COMPUTE_MAX_PENDING,
+    MATRIX_FETCH_WORKERS,
+    MATRIX_MAX_IN_FLIGHT,
+    get_lookback_hours,
+    get_symbols_for_ticker
+)
+from .exchange_data import fetch_data, fetch_exchanges_data, combine_exchange_data, get_exchanges
+from .main import build_map_data
+from .payloads import build_map_response, build_map_entry
+from .metrics import stage_timer, record_map_stats, map_result_stats
+
+
+class ComputeBusyError(Exception):
+    """Raised when the compute tier is at its queue-depth limit"""
+
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+# Admitted computations (running + queued)
+_PENDING = {"count": 0}
+_PENDING_LOCK = threading.Lock()
+
+# Threads that wait on the pool on behalf of async requests (kept off the web server's threadpool)
+_WAIT_EXECUTOR = ThreadPoolExecutor(max_workers=COMPUTE_MAX_PENDING * 4, thread_name_prefix="compute-wait")
+
+
+def get_compute_pool() -> ProcessPoolExecutor:
+    """Shared worker-process pool (created on first use)"""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            # Spawned Workers Import Only The Pipeline (Not The API / Its Clients)
+            _POOL = ProcessPoolExecutor(
+                max_workers=COMPUTE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _POOL
+
+
+def shutdown_compute_pool():
+    """Stop the worker processes (called on application shutdown)"""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = None
+
+
+def run_in_pool(fn: Callable, *args) -> Any:
+    """Run fn(*args) in a worker process and block until it returns"""
+    global _POOL
+    try:
+        return get_compute_pool().submit(fn, *args).result()
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM); drop the pool so the next call starts a fresh one
+        with _POOL_LOCK:
+            _POOL = None
+        raise
+
+
+@contextmanager
+def compute_slot():
+    """
+    Admit one computation, or raise ComputeBusyError if COMPUTE_MAX_PENDING are
+    already running or queued.
+    """
+    with _PENDING_LOCK:
+        if _PENDING["count"] >= COMPUTE_MAX_PENDING:
+            raise ComputeBusyError(f"Compute tier busy ({_PENDING['count']} maps in progress)")
+        _PENDING["count"] += 1
+    try:
+        yield
+    finally:
+        _release_slot()
+
+
+def _release_slot():
+    with _PENDING_LOCK:
+        _PENDING["count"] -= 1
+
+
+def pending_computations() -> int:
+    return _PENDING["count"]
+
+
+def calculate_published_map(
+    ticker: Optional[str] = None,
+    exchanges: Optional[List[str]] = None,
+    lookback_days: Optional[float] = None
+) -> dict:
+    """
+    Fetch here, then compute, serialize and compress in a worker process (build_published_map),
+    so the API process only receives finished bytes.
+
+    Blocking; callers apply compute_slot() themselves when they need backpressure.
+
+    Returns:
+        payloads.build_map_entry output
+    """
+    lookback_hours = get_lookback_hours(lookback_days) if lookback_days else None
+    with stage_timer(None, "fetch_data"):
+        df = fetch_data(ticker=ticker, exchanges=exchanges, lookback=lookback_hours)
+
+    outcome = run_in_pool(build_published_map, df)
+    record_map_stats(outcome["stats"])
+    return outcome["entry"]
+
+
+def build_published_map(df: pd.DataFrame) -> dict:
+    """
+    Worker-side: compute a map and everything needed to serve it.
+
+    Serializing and compressing happen here too, so the API process only
+    receives finished bytes. The raw build_map_data result stays in the worker;
+    only the entry and the scalars metrics need are sent back.
+
+    Returns:
+        {'entry': payloads.build_map_entry output, 'stats': metrics.map_result_stats output}
+    """
+    result = build_map_data(df)
+    with stage_timer(result['timings'], "serialize"):
+        entry = build_map_entry(build_map_response(result), raw_df=result['raw_liqs'], pyramid=result['pyramid'])
+    return {"entry": entry, "stats": map_result_stats(result)}
+
+
+def calculate_map_matrix(
+    tickers: List[str],
+    lookbacks_days: List[float],
+    exchanges: Optional[List[str]] = None
+) -> Dict[Tuple[str, float], Any]:
+    """
+    Compute every ticker x lookback map in parallel worker processes.
+
+    Each ticker is fetched once at the longest lookback (tickers fetched concurrently);
+    shorter lookbacks are per-exchange slices of that fetch, so they match what a direct
+    fetch would return. Jobs start as soon as their ticker's fetch lands, at most
+    MATRIX_MAX_IN_FLIGHT at a time, each holding a pending slot while in the pool.
+
+    Returns:
+        (ticker, lookback_days) -> build_published_map output, or the Exception that key raised
+    """
+    max_hours = get_lookback_hours(max(lookbacks_days))
+    pool = get_compute_pool()
+    results: Dict[Tuple[str, float], Any] = {}
+    jobs = deque()  # (key, combined frame) waiting for a pool slot
+    running = {}    # future -> key
+
+    def fetch(ticker: str) -> List[pd.DataFrame]:
+        with stage_timer(None, "fetch_data"):
+            return fetch_exchanges_data(
+                get_exchanges(exchanges), symbols=get_symbols_for_ticker(ticker), lookback=max_hours
+            )
+
+    global _POOL
+    with ThreadPoolExecutor(max_workers=max(1, min(MATRIX_FETCH_WORKERS, len(tickers))), thread_name_prefix="matrix-fetch") as fetchers:
+        fetches = {fetchers.submit(fetch, ticker): ticker for ticker in tickers}
+
+        while fetches or jobs or running:
+            # Top Up The Pool (Update Jobs Count Against The Pending Budget While In It)
+            while jobs and len(running) < MATRIX_MAX_IN_FLIGHT:
+                key, df = jobs.popleft()
+                with _PENDING_LOCK:
+                    _PENDING["count"] += 1
+                try:
+                    running[pool.submit(build_published_map, df)] = key
+                except Exception as e:
+                    _release_slot()
+                    results[key] = e
+
+            done, _ = wait(list(fetches) + list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                # Ticker Fetched: Fan Out One Job Per Lookback, All Sharing This Fetch
+                if future in fetches:
+                    ticker = fetches.pop(future)
+                    try:
+                        frames = future.result()
+                    except Exception as e:
+                        for days in lookbacks_days:
+                            results[(ticker, days)] = e
+                        continue
+
+                    for days in lookbacks_days:
+                        hours = get_lookback_hours(days)
+                        try:
+                            jobs.append(((ticker, days), combine_exchange_data([frame.tail(hours) for frame in frames])))
+                        except Exception as e:
+                            results[(ticker, days)] = e
+                    continue
+
+                # Map Computed
+                key = running.pop(future)
+                _release_slot()
+                try:
+                    results[key] = future.result()
+                    record_map_stats(results[key]["stats"])
+                except BrokenProcessPool as e:
+                    results[key] = e
+                    with _POOL_LOCK:
+                        if _POOL is pool:
+                            _POOL = None
+                except Exception as e:
+                    results[key] = e
+
+    return results
+
+
+async def run_blocking(fn: Callable, *args) -> Any:
+    """Await a blocking call on the compute tier's waiter threads"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_WAIT_EXECUTOR, fn, *args)
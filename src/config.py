@@ -1,3 +1,5 @@
+import os
+
 # ========== DEFAULT VALUES ========== #
 DEFAULT_TICKER = 'BTC'
 DEFAULT_EXCHANGES = ['binance', 'bybit', 'okx', 'hyperliquid']
@@ -11,6 +13,40 @@ LOOKBACK = 24 * DEFAULT_LOOKBACK_DAYS
 # SYMBOLS is generated dynamically based on ticker
 SYMBOLS = []
 
+# ========== EXCHANGE FETCHING ========== #
+FETCH_CONCURRENT = True   # Query all exchanges at once (False = one after another)
+FETCH_MAX_WORKERS = 10    # Upper bound on exchanges fetched in parallel
+ENDPOINT_WORKERS_PER_EXCHANGE = 8  # Each exchange's own pool for its endpoint calls (OHLCV, funding, OI, ticker, OI history);
+                                   # a hung venue can tie up at most this many threads, never another venue's
+EXCHANGE_TIME_BUDGET = 20.0  # Seconds one exchange may take before it is dropped from the run
+MARKETS_TTL_SECONDS = 6 * 60 * 60  # Pooled clients reload market metadata (and re-resolve symbols) after this
+
+# Shared per-(exchange, symbol) frames at the max lookback, refreshed once per candle;
+# every lookback up to this many candles is served as a slice of one fetch
+MARKET_CACHE_ENABLED = True
+MARKET_CACHE_LOOKBACK = 24 * 30
+
+# ========== COMPUTE TIER ========== #
+COMPUTE_WORKERS = int(os.environ.get("COMPUTE_WORKERS", max(1, (os.cpu_count() or 2) - 1)))  # Worker processes for map math
+COMPUTE_MAX_PENDING = int(os.environ.get("COMPUTE_MAX_PENDING", 8))  # Running + queued maps before requests get 429
+
+# Scheduled update precomputes every VALID_TICKERS x these lookbacks (default exchanges)
+PRECOMPUTE_LOOKBACK_DAYS = [0.5, 1, 7, 14, 30]
+MATRIX_FETCH_WORKERS = 8  # Tickers fetched at once by the scheduled update
+# Update jobs in the worker pool at once; they count as pending, so requests keep the rest of the budget
+MATRIX_MAX_IN_FLIGHT = int(os.environ.get("MATRIX_MAX_IN_FLIGHT", max(1, min(COMPUTE_WORKERS, COMPUTE_MAX_PENDING // 2))))
+
+# ========== LOCAL CANDLE STORE ========== #
+# Append-only OHLCV / OI history per (exchange, symbol, timeframe). Opt-in: set a directory to fetch
+# only the candles it lacks; "" (default) always fetches the full lookback and writes nothing to disk
+CANDLE_STORE_DIR = os.environ.get("CANDLE_STORE_DIR", "")
+
+# ========== RECORD / REPLAY ========== #
+# "record": save every exchange response to EXCHANGE_ARCHIVE_DIR; "replay": serve them back (no network)
+# Either mode bypasses the candle store so each run sees (and records) full responses
+EXCHANGE_REPLAY_MODE = os.environ.get("EXCHANGE_REPLAY_MODE", "").lower()
+EXCHANGE_ARCHIVE_DIR = os.environ.get("EXCHANGE_ARCHIVE_DIR", "exchange-archive")
+
 # ========== HELPER FUNCTIONS ========== #
 def get_symbols_for_ticker(ticker: str) -> list:
     """Generate symbol list for a given ticker (BTC, ETH, etc.)"""
@@ -35,9 +71,10 @@ def validate_exchanges(exchanges: list) -> list:
     }
     return [ex for ex in exchanges if ex.lower() in VALID_EXCHANGES]
 
+VALID_TICKERS = ['BTC', 'ETH', 'SOL', 'BNB', 'XRP', 'DOGE', 'ADA']
+
 def validate_ticker(ticker: str) -> str:
     """Validate ticker symbol"""
-    VALID_TICKERS = {'BTC', 'ETH', 'SOL', 'BNB', 'XRP', 'DOGE', 'ADA'}
     ticker = ticker.upper()
     return ticker if ticker in VALID_TICKERS else 'BTC'
 
@@ -60,8 +97,9 @@ DELTA_MASK = 0.70   # Top 30%
 
 
 
-# Liquidation Prices - Continuous Leverage Sampling
-NUM_LEVERAGE_SAMPLES = 200  # Number of leverage samples per entry (more = smoother)
+# Liquidation Prices - Deterministic Leverage Grid (Normal Quantiles, See sample_leverages)
+NUM_LEVERAGE_SAMPLES = 64  # Leverage points per entry (quantile grid; 64 matches ~200 random draws)
+FUNDING_RATE_QUANTUM = 1e-6  # Funding rates are rounded to this step before keying the grid cache
 
 # Leverage profiles as normal distributions (mean, std)
 LEVERAGE_PROFILES = {
@@ -80,5 +118,14 @@ TOTAL_BUFFER = MMR + FEE_BUFFER
 
 NUM_BUCKETS = 40
 
+# 'analytic': USD per bucket integrated from each entry's leverage density (no sampling noise)
+# 'sampled': Histogram of the raw entry x leverage points (reference mode for validation)
+BINNING_ENGINE = os.environ.get("BINNING_ENGINE", "analytic").lower()
+
+# Bin Pyramid (Zoom Queries): Bucket Counts Over The Full Map Span, Plus Finer Grids Near Price
+PYRAMID_LEVELS = [20, 40, 80, 160, 320]
+PYRAMID_FINE_GRIDS = [(0.05, 250), (0.01, 200)]  # (half-width as a fraction of price, buckets)
+PYRAMID_MAX_BUCKETS = max(PYRAMID_LEVELS)  # Largest buckets= a zoom query may ask for (what the full span can deliver)
+
 # Price Resolution
 DISTANCE_DECAY_FACTOR = 2
\ No newline at end of file
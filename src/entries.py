@@ -1,6 +1,7 @@
 import ccxt
+import numpy as np
 import pandas as pd
-from typing import List, Any
+from typing import Callable, Dict, List, Any, Optional
 from .config import WEIGHT_VOLUME_OI, WEIGHT_HOTZONE, WEIGHT_VWAP, VOL_MASK, DELTA_MASK, PRICE_MASK
 from .models import Side, Entry
 import math
@@ -14,8 +15,10 @@ WE USE THREE PROXIES TO GUAGE ENTRY:
 '''
 
 
-def get_summary_stats(df: pd.DataFrame) -> dict:
-    agg_df = aggregate_market_view(df)
+def get_summary_stats(df: pd.DataFrame, agg_df: Optional[pd.DataFrame] = None) -> dict:
+    # Reuse The Caller's Aggregated View When It Already Has One
+    if agg_df is None:
+        agg_df = aggregate_market_view(df)
 
     # SAFETY: Check if empty first
     if agg_df.empty:
@@ -52,176 +55,193 @@ def aggregate_market_view(df: pd.DataFrame):
     return agg_df
 
 
-def detect_hotzones(df: pd.DataFrame) -> List[Entry]:
+# ========== RUN-LENGTH DETECTORS ========== #
+class RunDetector:
+    """
+    One entry methodology: boolean masks over the aggregated view, one per side.
+
+    Every maximal run of consecutive True rows becomes one Entry priced at the run's VWAP,
+    weighted by the clipped sum of weight_column over the run (1.0 per run if None),
+    then normalized within the detector and scaled by method_weight.
+
+    Args:
+        name: Registry key
+        method_weight: Share of the final entry book (see config WEIGHT_*)
+        masks: Callable(df) -> [(Side, bool ndarray), ...]; must not modify df
+        weight_column: Column summed per run for the raw weight
+    """
 
-    # List of Entires
-    entries: List[Entry] = []
+    def __init__(self, name: str, method_weight: float, masks: Callable, weight_column: Optional[str] = None):
+        self.name = name
+        self.method_weight = method_weight
+        self.masks = masks
+        self.weight_column = weight_column
 
+
+def hotzone_masks(df: pd.DataFrame) -> list:
     VOLUME_QUANTILE = df['volume_usd'].quantile(VOL_MASK)  # top 20% volume
     PRICE_THRESHOLD = PRICE_MASK  # 0.8% move
     OI_DELTA_QUANTILE = df['oi_delta'].abs().quantile(
         DELTA_MASK)  # top 30% move
 
-    # Masks for a likely long entry
-    long_conditions = (
-    (df['price_return'] > PRICE_THRESHOLD) &
-    (df['oi_delta'] > OI_DELTA_QUANTILE) &
-    (df['volume_usd'] > VOLUME_QUANTILE))
-    
-    # Masks for a likely short entry
-    short_conditions = (
-    (df['price_return'] < -PRICE_THRESHOLD) &   # price DOWN
-        # OI still INCREASING (new shorts)
-        (df['oi_delta'] > OI_DELTA_QUANTILE) &
-    (df['volume_usd'] > VOLUME_QUANTILE))
-
-    # Group For Consecutive True Long Periods
-    df['long_group'] = (long_conditions != long_conditions.shift()).cumsum()
-    hot_long_periods = df[long_conditions].groupby('long_group')
-
-    # Append Longs
-    for _, long_period in hot_long_periods:
-
-        entry_price = (
-            long_period['close'] * long_period['volume']).sum() / long_period['volume'].sum()
-        raw_weight = max(long_period['oi_delta'].sum(), 0)
-
-        # Times
-        start_time = long_period['timestamp'].min()
-        end_time = long_period['timestamp'].max()
-
-        entries.append(
-            Entry(side=Side.LONG, price=entry_price, weight=raw_weight, start_time=start_time, end_time=end_time))
-    
-    # Group For Consecutive True Short Periods
-    df['short_group'] = (short_conditions != short_conditions.shift()).cumsum()
-    hot_short_periods = df[short_conditions].groupby('short_group')
-
-    # Append Shorts
-    for _, short_period in hot_short_periods:
-        
-        entry_price = (
-            short_period['close'] * short_period['volume']).sum() / short_period['volume'].sum()
-        raw_weight = max(short_period['oi_delta'].sum(), 0)
-        
-         # Times
-        start_time = short_period['timestamp'].min()
-        end_time = short_period['timestamp'].max()
-
-        entries.append(
-            Entry(side=Side.SHORT, price=entry_price, weight=raw_weight, start_time=start_time, end_time=end_time))
-    
-    # Normalize
-    if entries:
-        total_weight = sum(e.weight for e in entries)
-        if total_weight > 0:
-            for e in entries:
-                e.weight /= total_weight
-        else:
-            # fallback: equal weight
-            equal_w = 1.0 / len(entries)
-            for e in entries:
-                e.weight = equal_w
-
-    # Clean Up Columns
-    df.drop(columns=['long_group', 'short_group'],
-            errors='ignore', inplace=True)
+    price_return = df['price_return'].to_numpy()
+    # OI still INCREASING (new positions) on heavy volume, for either side
+    backed = (df['oi_delta'].to_numpy() > OI_DELTA_QUANTILE) & (df['volume_usd'].to_numpy() > VOLUME_QUANTILE)
 
-    return entries
+    return [
+        (Side.LONG, (price_return > PRICE_THRESHOLD) & backed),    # Price UP
+        (Side.SHORT, (price_return < -PRICE_THRESHOLD) & backed),  # Price DOWN
+    ]
 
 
 # TLDR: Hotzones LITE; Huge Move, W/ VOL to backup but OI Unphased -- Lower Sig. But Lev. Def Adj
-def detect_high_vol_and_oi_spike(df: pd.DataFrame) -> List[Entry]:
-
-    # List of Entires
-    entries: List[Entry] = []
-
+def volume_spike_masks(df: pd.DataFrame) -> list:
     VOLUME_QUANTILE = df['volume_usd'].quantile(VOL_MASK)  # top 20% volume
     PRICE_THRESHOLD = PRICE_MASK  # 1% move
 
-    # Masks for a likely long entry
-    long_conditions = (
-        (df['price_return'] > PRICE_THRESHOLD) &  # Price UP
-        (df['volume_usd'] > VOLUME_QUANTILE))    # In VOL Bracked (>= 20%)
-
-    # Masks for a likely short entry
-    short_conditions = (
-        (df['price_return'] < -PRICE_THRESHOLD) &  # price DOWN
-        (df['volume_usd'] > VOLUME_QUANTILE))     # In VOL Bracked (>= 20%)
-
-    # Group For Consecutive True Long Periods
-    df['long_group'] = (long_conditions != long_conditions.shift()).cumsum()
-    hot_long_periods = df[long_conditions].groupby('long_group')
-
-    # Append Longs
-    for _, long_period in hot_long_periods:
-
-        entry_price = (
-            long_period['close'] * long_period['volume']).sum() / long_period['volume'].sum()
-        raw_weight = max(long_period['volume_usd'].sum(), 0)
-
-        # Times
-        start_time = long_period['timestamp'].min()
-        end_time = long_period['timestamp'].max()
-
-        entries.append(
-            Entry(side=Side.LONG, price=entry_price, weight=raw_weight, start_time=start_time, end_time=end_time))
-
-    # Group For Consecutive True Short Periods
-    df['short_group'] = (short_conditions != short_conditions.shift()).cumsum()
-    hot_short_periods = df[short_conditions].groupby('short_group')
-
-    # Append Shorts
-    for _, short_period in hot_short_periods:
-
-        entry_price = (
-            short_period['close'] * short_period['volume']).sum() / short_period['volume'].sum()
-        raw_weight = max(short_period['volume_usd'].sum(), 0)
-
-        # Times
-        start_time = short_period['timestamp'].min()
-        end_time = short_period['timestamp'].max()
-
-        entries.append(
-            Entry(side=Side.SHORT, price=entry_price, weight=raw_weight, start_time=start_time, end_time=end_time))
-
-    if entries:
-        total_weight = sum(e.weight for e in entries)
-        if total_weight > 0:
-            for e in entries:
-                e.weight /= total_weight
-        else:
-            # fallback: equal weight
-            equal_w = 1.0 / len(entries)
-            for e in entries:
-                e.weight = equal_w
-
-    # Clean Up Columns
-    df.drop(columns=['long_group', 'short_group'],
-            errors='ignore', inplace=True)
-    
-    return entries
+    price_return = df['price_return'].to_numpy()
+    heavy = df['volume_usd'].to_numpy() > VOLUME_QUANTILE  # In VOL Bracked (>= 20%)
 
-# TODO: No Such Thing as Neutral Leverage always in {LONG< SHORT}, We could CMP w/ a MA as a trend Proxy, if broad +, LONG | if broad -, SHORT
+    return [
+        (Side.LONG, (price_return > PRICE_THRESHOLD) & heavy),    # Price UP
+        (Side.SHORT, (price_return < -PRICE_THRESHOLD) & heavy),  # price DOWN
+    ]
 
 
-def detect_vwap(df: pd.DataFrame) -> List[Entry]:
+# TODO: No Such Thing as Neutral Leverage always in {LONG< SHORT}, We could CMP w/ a MA as a trend Proxy, if broad +, LONG | if broad -, SHORT
+def vwap_masks(df: pd.DataFrame) -> list:
+    # Whole Window Is One Run -> One Entry At The Window's VWAP
+    return [(Side.NEUTRAL, np.ones(len(df), dtype=bool))]
+
+
+# Evaluated In Order; Entry Book Order Follows (Detector, Then Mask, Then Run)
+DETECTORS: List[RunDetector] = [
+    RunDetector('hotzones', WEIGHT_HOTZONE, hotzone_masks, weight_column='oi_delta'),
+    RunDetector('volume_oi', WEIGHT_VOLUME_OI, volume_spike_masks, weight_column='volume_usd'),
+    RunDetector('vwap', WEIGHT_VWAP, vwap_masks),
+]
+
+
+def register_detector(detector: RunDetector):
+    """Add (or replace, by name) a detector evaluated by estimate_entries"""
+    for i, existing in enumerate(DETECTORS):
+        if existing.name == detector.name:
+            DETECTORS[i] = detector
+            return
+    DETECTORS.append(detector)
+
+
+def _segment_sums(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    # Sum Of values[start:end] Per Run, One reduceat (Runs Are Non-Empty And Ordered)
+    if starts.size == 0:
+        return np.empty(0)
+    bounds = np.empty(starts.size * 2, dtype=np.intp)
+    bounds[0::2] = starts
+    bounds[1::2] = ends
+    padded = np.append(values, 0.0)  # ends may point one past the last row
+    return np.add.reduceat(padded, bounds)[0::2]
+
+
+def detect_runs(df: pd.DataFrame, detectors: Optional[List[RunDetector]] = None) -> Dict[str, List[Entry]]:
+    """
+    Evaluate detectors over the aggregated view in one pass.
+
+    All masks are stacked into one matrix; run boundaries come from a single diff, and each
+    run's turnover, volume and weight sums from np.add.reduceat over the tiled columns.
+
+    Returns:
+        Detector name -> entries, normalized within the detector (not yet method-weighted)
+    """
+    if detectors is None:
+        detectors = DETECTORS
+
+    n = len(df)
+    results: Dict[str, List[Entry]] = {d.name: [] for d in detectors}
+    if n == 0 or not detectors:
+        return results
+
+    # Mask Rows, Remembering Which Detector / Side Each Came From
+    rows, sides, owners = [], [], []
+    for index, detector in enumerate(detectors):
+        for side, mask in detector.masks(df):
+            rows.append(np.asarray(mask, dtype=bool))
+            sides.append(side)
+            owners.append(index)
+    masks = np.vstack(rows)
+
+    # Run Starts (Inclusive) / Ends (Exclusive) Per Mask Row, Row-Major
+    edges = np.diff(np.pad(masks, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+    start_rows, start_cols = np.nonzero(edges == 1)
+    _, end_cols = np.nonzero(edges == -1)
+
+    # Offsets Into The Mask Rows Laid End To End
+    starts = start_rows * n + start_cols
+    ends = start_rows * n + end_cols
+
+    # NaN Rows Count As Zero (Same As pandas' Skipna Sums)
+    close = df['close'].to_numpy(dtype=float)
+    volume = df['volume'].to_numpy(dtype=float)
+    turnover = np.tile(np.nan_to_num(close * volume), len(rows))
+    volume_sum = _segment_sums(np.tile(np.nan_to_num(volume), len(rows)), starts, ends)
+    prices = _segment_sums(turnover, starts, ends) / volume_sum
+
+    # Raw Weight Per Run From Each Detector's Column
+    raw_weights = np.ones(starts.size)
+    run_owner = np.asarray(owners)[start_rows]
+    for index, detector in enumerate(detectors):
+        if detector.weight_column is None:
+            continue
+        column = np.tile(np.nan_to_num(df[detector.weight_column].to_numpy(dtype=float)), len(rows))
+        own = run_owner == index
+        raw_weights[own] = np.maximum(_segment_sums(column, starts[own], ends[own]), 0)
+
+    timestamps = df['timestamp']
+    start_times = timestamps.take(start_cols).tolist()
+    end_times = timestamps.take(end_cols - 1).tolist()
+
+    for k in range(starts.size):
+        detector = detectors[run_owner[k]]
+        results[detector.name].append(Entry(
+            side=sides[start_rows[k]],
+            price=prices[k],
+            weight=raw_weights[k],
+            start_time=start_times[k],
+            end_time=end_times[k]
+        ))
+
+    # Normalize Within Each Detector
+    for entries in results.values():
+        if entries:
+            total_weight = sum(e.weight for e in entries)
+            if total_weight > 0:
+                for e in entries:
+                    e.weight /= total_weight
+            else:
+                # fallback: equal weight
+                equal_w = 1.0 / len(entries)
+                for e in entries:
+                    e.weight = equal_w
+
+    return results
+
+
+def _detector(name: str) -> RunDetector:
+    return next(d for d in DETECTORS if d.name == name)
 
-    # No Data Passed
-    if df.empty:
-        return []
 
-    # For Each TF Close; Calculate Vol * Price; To Calc ~"Dollars Moved"
-    df['candle_turnover'] = df['close'] * df['volume']
+def detect_hotzones(df: pd.DataFrame) -> List[Entry]:
+    """OI + price direction runs (see hotzone_masks)"""
+    return detect_runs(df, [_detector('hotzones')])['hotzones']
+
 
-    # Aggregate All Candle Turnovers, and Divide by Total Volume to Vol. Weighted. Price
-    vwap_price = df['candle_turnover'].sum() / df['volume'].sum()
+def detect_high_vol_and_oi_spike(df: pd.DataFrame) -> List[Entry]:
+    """Large move + heavy volume runs (see volume_spike_masks)"""
+    return detect_runs(df, [_detector('volume_oi')])['volume_oi']
 
-    start_time = df['timestamp'].min()
-    end_time = df['timestamp'].max()
 
-    # Only One Entry, So 1.0 Weight
-    return [Entry(side=Side.NEUTRAL, price=vwap_price, weight=1.0, start_time=start_time, end_time=end_time)]
+def detect_vwap(df: pd.DataFrame) -> List[Entry]:
+    """Single NEUTRAL entry at the window's VWAP"""
+    return detect_runs(df, [_detector('vwap')])['vwap']
 
 
 def scale_entries(entries: List[Entry], method_weight: float):
@@ -248,15 +268,16 @@ def scale_entries(entries: List[Entry], method_weight: float):
     return entries
 
 
-def estimate_entries(input: pd.DataFrame) -> List[Entry]:
+def estimate_entries(input: pd.DataFrame, agg_df: Optional[pd.DataFrame] = None) -> List[Entry]:
 
-    # Aggregate DF by Timestamp, Rather than Exchange
-    df = aggregate_market_view(input)
+    # Aggregate DF by Timestamp, Rather than Exchange (Unless Already Aggregated)
+    df = aggregate_market_view(input) if agg_df is None else agg_df
 
-    # Master List Storing Entries; Built From Methodologies
-    entry_book: List[Entry] = scale_entries(detect_hotzones(df), WEIGHT_HOTZONE) + \
-        scale_entries(detect_high_vol_and_oi_spike(df), WEIGHT_VOLUME_OI) + \
-        scale_entries(detect_vwap(df), WEIGHT_VWAP)
+    # Master List Storing Entries; Every Registered Methodology In One Pass
+    detected = detect_runs(df)
+    entry_book: List[Entry] = []
+    for detector in DETECTORS:
+        entry_book += scale_entries(detected[detector.name], detector.method_weight)
 
     # Safety Normalization
     total = sum(e.weight for e in entry_book)
@@ -1,40 +1,317 @@
 import ccxt
+import time
+import threading
+import weakref
 import pandas as pd
-from typing import List, Any, Optional
-from .config import ACTIVE_EXCHANGES, TIMEFRAME, LOOKBACK, SYMBOLS
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Any, Optional, Dict
+from .config import (
+    ACTIVE_EXCHANGES, 
+    TIMEFRAME, 
+    LOOKBACK, 
+    SYMBOLS, 
+    FETCH_CONCURRENT, 
+    FETCH_MAX_WORKERS,
+    ENDPOINT_WORKERS_PER_EXCHANGE,
+    EXCHANGE_TIME_BUDGET,
+    MARKETS_TTL_SECONDS,
+    MARKET_CACHE_ENABLED,
+    MARKET_CACHE_LOOKBACK,
+    EXCHANGE_REPLAY_MODE,
+    EXCHANGE_ARCHIVE_DIR
+)
+from .candle_store import get_candle_store, OHLCV_COLUMNS, OI_COLUMNS
+from .metrics import EXCHANGE_FETCH_SECONDS
+from .replay import build_client, flush_recordings
+
+# Per-Exchange Pools For Endpoint Calls (Outlive Any Single Fetch). Calls still queued at the
+# deadline are cancelled; calls already running on a hung venue finish in the background and
+# hold at most ENDPOINT_WORKERS_PER_EXCHANGE of that venue's own threads.
+_ENDPOINT_POOLS: Dict[str, ThreadPoolExecutor] = {}
+_ENDPOINT_POOLS_LOCK = threading.Lock()
+
+# Process-Wide Client Pool: One Long-Lived Instance Per Exchange ID (Keeps Its HTTP Session Alive)
+_CLIENT_POOL: Dict[str, ccxt.Exchange] = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+
+# Per-Instance Market State: {'lock', 'loaded_at', 'markets', 'symbols': {candidates -> resolved}}
+_MARKET_STATE: "weakref.WeakKeyDictionary[Any, dict]" = weakref.WeakKeyDictionary()
+_MARKET_STATE_LOCK = threading.Lock()
+
+
+# Shared Raw Market Frames: (exchange, symbol, timeframe) -> {'lock', 'candle_open', 'frame'}
+_FRAME_CACHE: Dict[tuple, dict] = {}
+_FRAME_CACHE_LOCK = threading.Lock()
+
+
+def _market_state(exchange: Any) -> dict:
+    with _MARKET_STATE_LOCK:
+        state = _MARKET_STATE.get(exchange)
+        if state is None:
+            state = {'lock': threading.Lock(), 'loaded_at': None, 'markets': None, 'symbols': {}}
+            _MARKET_STATE[exchange] = state
+        return state
+
+
+def resolve_symbol(exchange: Any, symbols: List[str]) -> Optional[str]:
+    """
+    Return the first candidate symbol listed on the exchange, using cached market metadata.
+
+    Markets are (re)loaded at most once per MARKETS_TTL_SECONDS per client, and the
+    candidate search result is cached alongside them until the next reload.
+    """
+    state = _market_state(exchange)
+    key = tuple(symbols)
+
+    # One Loader Per Client; Concurrent Callers Wait And Reuse Its Result
+    with state['lock']:
+        now = time.monotonic()
+        stale = state['loaded_at'] is None or now - state['loaded_at'] >= MARKETS_TTL_SECONDS
+
+        if stale:
+            # Pull Market (Force Refresh Once CCXT Already Holds An Expired Copy)
+            state['markets'] = exchange.load_markets(reload=state['loaded_at'] is not None)
+            state['loaded_at'] = now
+            state['symbols'] = {}
+
+        if key not in state['symbols']:
+            # Try multiple possible symbols until one works
+            state['symbols'][key] = next(
+                (sym for sym in symbols if sym in state['markets']), None
+            )
+
+        return state['symbols'][key]
+
+
+def _candle_clock() -> tuple:
+    """(timeframe length in ms, open time in ms of the still-forming candle)"""
+    tf_ms = int(ccxt.Exchange.parse_timeframe(TIMEFRAME) * 1000)
+    current_open = int(time.time() * 1000) // tf_ms * tf_ms
+    return tf_ms, current_open
+
+
+def _normalize_oi_history(oi_history: List[dict]) -> pd.DataFrame:
+    """Reduce CCXT OI history records to timestamp / USD value / contract amount columns"""
+    raw = pd.DataFrame(oi_history)
+    oi_df = pd.DataFrame({'timestamp': raw['timestamp'].astype('int64')})
+
+    # Initialize target columns with NaNs
+    oi_df['oi_value'] = float('nan')
+    oi_df['oi_amount'] = float('nan')
+
+    # Try: explicit USD Value (CCXT Standard API), then Binance variant
+    for column in ('openInterestValue', 'openInterestUSD'):
+        if column in raw.columns:
+            oi_df['oi_value'] = oi_df['oi_value'].fillna(pd.to_numeric(raw[column], errors='coerce'))
+
+    # Fallback Source: Contracts/Amount (Bybit, OKX), else generic key 'openInterest'
+    if 'openInterestAmount' in raw.columns:
+        oi_df['oi_amount'] = pd.to_numeric(raw['openInterestAmount'], errors='coerce')
+    elif 'openInterest' in raw.columns:
+        oi_df['oi_amount'] = pd.to_numeric(raw['openInterest'], errors='coerce')
+
+    return oi_df
+
+
+def _fetch_incremental(
+    exchange: Any,
+    symbol: str,
+    lookback: int,
+    kind: str,
+    fetch: Any,
+    to_frame: Any
+) -> pd.DataFrame:
+    """
+    Return the newest `lookback` rows of a series, asking the exchange only for what the local store lacks.
+
+    Closed rows are appended to the store; the still-forming candle is always re-fetched.
+
+    Args:
+        kind: 'ohlcv' or 'oi' (candle store schema)
+        fetch: Callable(since, limit) -> raw CCXT rows
+        to_frame: Callable(raw rows) -> DataFrame with the kind's columns
+    """
+    store = get_candle_store()
+
+    # Store Disabled: Full Lookback Every Time
+    if store is None:
+        return to_frame(fetch(None, lookback))
+
+    tf_ms, current_open = _candle_clock()
+    window_start = current_open - (lookback - 1) * tf_ms
+    stored_range = store.time_range(exchange.id, symbol, TIMEFRAME, kind)
+
+    # Stored History Covers The Window Without Holes: Only Request Candles After It
+    covered = False
+    if stored_range is not None and stored_range[0] <= window_start and stored_range[1] >= window_start - tf_ms:
+        stored_rows = len(store.read(exchange.id, symbol, TIMEFRAME, kind, since=window_start)['timestamp'])
+        covered = stored_rows == (stored_range[1] - window_start) // tf_ms + 1
+
+    if covered:
+        since = stored_range[1] + tf_ms
+        fresh = to_frame(fetch(since, (current_open - since) // tf_ms + 1))
+    else:
+        fresh = to_frame(fetch(None, lookback))
+
+    # Persist Closed Rows Only (The Open Candle Keeps Changing)
+    closed = fresh[fresh['timestamp'] < current_open]
+    closed_data = {c: closed[c].to_numpy() for c in closed.columns}
+
+    # Full Fetch Over An Existing Store (It Starts Too Late, Ends Before The Window Or Has Holes):
+    # Rebuild It, So Appending Never Leaves A Gap Behind; Otherwise Append
+    if not covered and stored_range is not None and not closed.empty:
+        store.replace(exchange.id, symbol, TIMEFRAME, kind, closed_data)
+    else:
+        store.append(exchange.id, symbol, TIMEFRAME, kind, closed_data)
+
+    # Memory-Mapped History Up To The First Fresh Row, Then The Fresh Rows
+    history = pd.DataFrame(store.read(exchange.id, symbol, TIMEFRAME, kind, since=window_start))
+    if not fresh.empty:
+        history = history[history['timestamp'] < fresh['timestamp'].min()]
+
+    return pd.concat([history, fresh], ignore_index=True).tail(lookback).reset_index(drop=True)
+
+
+def fetch_ohlcv_frame(exchange: Any, symbol: str, lookback: int) -> pd.DataFrame:
+    """Newest `lookback` candles (timestamp in ms) via the incremental candle store"""
+    def fetch(since, limit):
+        return exchange.fetch_ohlcv(symbol, timeframe=TIMEFRAME, since=since, limit=limit)
+
+    def to_frame(rows):
+        return pd.DataFrame(rows, columns=list(OHLCV_COLUMNS))
+
+    return _fetch_incremental(exchange, symbol, lookback, 'ohlcv', fetch, to_frame)
+
+
+def fetch_oi_history_frame(exchange: Any, symbol: str, lookback: int) -> pd.DataFrame:
+    """Newest `lookback` OI history rows (timestamp in ms, oi_value, oi_amount) via the candle store"""
+    def fetch(since, limit):
+        return exchange.fetch_open_interest_history(symbol, timeframe=TIMEFRAME, since=since, limit=limit)
+
+    def to_frame(rows):
+        if not rows:
+            return pd.DataFrame({c: pd.Series(dtype='int64' if c == 'timestamp' else 'float64') for c in OI_COLUMNS})
+        return _normalize_oi_history(rows)
+
+    return _fetch_incremental(exchange, symbol, lookback, 'oi', fetch, to_frame)
+
+
+def get_client(exchange_id: str) -> ccxt.Exchange:
+    """
+    Return the pooled CCXT client for an exchange ID, creating it on first use.
+
+    Under EXCHANGE_REPLAY_MODE the client records its responses or replays an archive (see replay.py).
+    """
+    with _CLIENT_POOL_LOCK:
+        client = _CLIENT_POOL.get(exchange_id)
+        if client is None:
+            # Create Exchange Object From ID (Raises AttributeError If Unknown)
+            client = build_client(exchange_id, EXCHANGE_REPLAY_MODE, EXCHANGE_ARCHIVE_DIR)
+            _CLIENT_POOL[exchange_id] = client
+        return client
+
+
+def _endpoint_pool(exchange_id: str) -> ThreadPoolExecutor:
+    """Exchange's own endpoint-call pool (created on first use)"""
+    with _ENDPOINT_POOLS_LOCK:
+        pool = _ENDPOINT_POOLS.get(exchange_id)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=ENDPOINT_WORKERS_PER_EXCHANGE, thread_name_prefix=f"endpoint-{exchange_id}")
+            _ENDPOINT_POOLS[exchange_id] = pool
+        return pool
+
+
+def reset_exchange_pool():
+    """Drop every pooled client, endpoint pool, cached market and cached market frame (next fetch starts cold)"""
+    with _CLIENT_POOL_LOCK:
+        _CLIENT_POOL.clear()
+    with _ENDPOINT_POOLS_LOCK:
+        for pool in _ENDPOINT_POOLS.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _ENDPOINT_POOLS.clear()
+    with _MARKET_STATE_LOCK:
+        _MARKET_STATE.clear()
+    with _FRAME_CACHE_LOCK:
+        _FRAME_CACHE.clear()
+
+
+def _cached_market_frame(exchange: Any, symbol: str, deadline: float) -> pd.DataFrame | None:
+    """
+    Exchange frame at MARKET_CACHE_LOOKBACK, fetched at most once per candle.
+
+    The frame is refreshed when a new candle opens; until then every caller (any lookback,
+    any request) shares it. Concurrent misses on one key wait for a single fetch, but
+    no longer than their own deadline (time.monotonic()); a caller out of budget gets None.
+    """
+    key = (exchange.id, symbol, TIMEFRAME)
+    with _FRAME_CACHE_LOCK:
+        slot = _FRAME_CACHE.setdefault(key, {'lock': threading.Lock(), 'candle_open': None, 'frame': None})
+
+    # Another Caller's Refill Counts Against This Caller's Budget Too
+    if not slot['lock'].acquire(timeout=max(deadline - time.monotonic(), 0)):
+        print(f"{exchange.id}: Exceeded budget waiting on the shared {symbol} frame")
+        return None
+
+    try:
+        _, current_open = _candle_clock()
+
+        if slot['frame'] is None or slot['candle_open'] != current_open:
+            frame = fetch_single_exchange_data(
+                exchange, [symbol], lookback=MARKET_CACHE_LOOKBACK,
+                time_budget=max(deadline - time.monotonic(), 0), use_cache=False
+            )
+            # Failed Fetches Are Not Cached
+            if frame is None:
+                return None
+
+            slot['frame'] = frame
+            slot['candle_open'] = current_open
+
+        return slot['frame']
+    finally:
+        slot['lock'].release()
 
 def fetch_single_exchange_data(
     exchange: Any, 
     symbols: Optional[List[str]] = None,
-    lookback: Optional[int] = None
+    lookback: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    use_cache: Optional[bool] = None
 ) -> pd.DataFrame | None:
     """
     Fetch data from a single exchange.
+
+    Once the symbol is resolved the endpoint calls are independent, so they are issued
+    concurrently and the exchange costs roughly its slowest call rather than the sum.
+
+    Lookbacks up to MARKET_CACHE_LOOKBACK are sliced from one shared frame per
+    (exchange, symbol) that is refreshed once per candle, so repeat requests within the
+    same candle (any lookback) make no network calls. Funding, current OI and mark price
+    in that frame are therefore as of the candle's first fetch.
     
     Args:
         exchange: CCXT exchange instance
         symbols: Optional list of symbols to try. If None, uses global SYMBOLS
         lookback: Optional lookback in hours. If None, uses global LOOKBACK
+        time_budget: Optional seconds allowed for this exchange. If None, uses EXCHANGE_TIME_BUDGET
+        use_cache: Optional override of MARKET_CACHE_ENABLED (False = always hit the exchange)
     """
     if symbols is None:
         symbols = SYMBOLS
     if lookback is None:
         lookback = LOOKBACK
+    if time_budget is None:
+        time_budget = EXCHANGE_TIME_BUDGET
+    if use_cache is None:
+        use_cache = MARKET_CACHE_ENABLED
 
-    # Aggregator that Carries Each Applicable Pair (If Multiple)
-    all_symbols: List[pd.DataFrame] = []
+    start = time.perf_counter()
+    deadline = time.monotonic() + time_budget
 
     try:
 
-        # Pull Market
-        markets = exchange.load_markets()
-
-        # Try multiple possible symbols until one works
-        valid_symbol = None
-        for sym_candidate in symbols:
-            if sym_candidate in markets:
-                valid_symbol = sym_candidate
-                break
+        # Resolve Symbol Against Cached Markets (Loads Them On First Use / Expiry)
+        valid_symbol = resolve_symbol(exchange, symbols)
 
         # No Valid Symbol Exists
         if not valid_symbol:
@@ -44,18 +321,66 @@ def fetch_single_exchange_data(
         # First Working Symbol
         symbol = valid_symbol
 
+        # Shorter Lookbacks Are A Slice Of The Shared Max-Lookback Frame
+        if use_cache and lookback <= MARKET_CACHE_LOOKBACK:
+            frame = _cached_market_frame(exchange, symbol, deadline)
+            return None if frame is None else frame.tail(lookback).reset_index(drop=True)
+
+        # Network Fetch: Timed Per Exchange (Cache Hits Above Would Swamp The Latency Histogram)
+        df = _fetch_exchange_frame(exchange, symbol, lookback, time_budget, deadline)
+        outcome = "ok" if df is not None and not df.empty else "failed"
+        EXCHANGE_FETCH_SECONDS.observe(time.perf_counter() - start, exchange=exchange.id, outcome=outcome)
+        return df
+
+    except Exception as e:
+        print(f"Error in {exchange.id}: {e}")
+        # traceback.print_exc() # Uncomment for deep debugging
+        return None
+
+def _fetch_exchange_frame(exchange: Any, symbol: str, lookback: int, time_budget: float, deadline: float) -> pd.DataFrame | None:
+    """Query every endpoint of one exchange for a resolved symbol (within deadline) and build its frame"""
+
+    # Aggregator that Carries Each Applicable Pair (If Multiple)
+    all_symbols: List[pd.DataFrame] = []
+
+    try:
+        # Issue Every Endpoint At Once (On This Exchange's Own Pool)
+        pool = _endpoint_pool(exchange.id)
+        calls = {
+            'ohlcv': pool.submit(fetch_ohlcv_frame, exchange, symbol, lookback),                     # Open, High, Low, Close, Volume
+            'funding': pool.submit(exchange.fetch_funding_rate, symbol),                              # Funding Rate
+            'current_oi': pool.submit(exchange.fetch_open_interest, symbol),                          # Open Interest
+            'ticker': pool.submit(exchange.fetch_ticker, symbol),                                     # Real-Time Ticker Data
+        }
+
+        # Exchnage Has ccxt api-interface default
+        if exchange.has['fetchOpenInterestHistory']:
+            # Pull OI History overy tf, lookback
+            calls['oi_history'] = pool.submit(fetch_oi_history_frame, exchange, symbol, lookback)
+
+        # Wait Only As Long As The Exchange's Remaining Budget (Calls Not Yet Started Never Run)
+        _, pending = wait(calls.values(), timeout=max(deadline - time.monotonic(), 0))
+        for future in pending:
+            future.cancel()
+
+        # Core Data Must Arrive In Budget (Failures Re-Raise Below, As Before)
+        late = [name for name in ('ohlcv', 'funding', 'current_oi', 'ticker') if calls[name] in pending]
+        if late:
+            print(f"{exchange.id}: Exceeded {time_budget:g}s budget waiting on {', '.join(late)}")
+            return None
+
         # Core Data That Will Be Duplicated Across Timestamps (1/T.F. Metric)
-        ohlcv = exchange.fetch_ohlcv(symbol, timeframe=TIMEFRAME, limit=lookback) # Open, High, Low, Close, Volume
-        funding = exchange.fetch_funding_rate(symbol)                              # Funding Rate
-        current_oi = exchange.fetch_open_interest(symbol)                          # Open Interest
-        ticker = exchange.fetch_ticker(symbol)                                     # Real-Time Ticker Data
+        ohlcv = calls['ohlcv'].result()
+        funding = calls['funding'].result()
+        current_oi = calls['current_oi'].result()
+        ticker = calls['ticker'].result()
 
         # Gets Current Price For Ticker Via: {markPrice -> last -> close -> OHLCV close}
         current_price = (
             ticker.get('markPrice') or 
             ticker.get('last') or 
             ticker.get('close') or 
-            (ohlcv[-1][4] if ohlcv else None)
+            (ohlcv['close'].iloc[-1] if not ohlcv.empty else None)
         )
         
         # Error: Price DNE 
@@ -65,23 +390,19 @@ def fetch_single_exchange_data(
         # Historical Open Interest
         oi_history = None
 
-        # Exchnage Has ccxt api-interface default
-        if exchange.has['fetchOpenInterestHistory']:
-            try:
-                # Pull OI History overy tf, lookback
-                oi_history = exchange.fetch_open_interest_history(
-                    symbol, timeframe=TIMEFRAME, limit=lookback
-                )
+        if 'oi_history' in calls:
+            if calls['oi_history'] in pending:
+                print(f"{exchange.id}: Unified OI history exceeded {time_budget:g}s budget")
+            else:
+                try:
+                    oi_history = calls['oi_history'].result()
 
-            # Base CCXT API Failed    
-            except Exception as e:
-                print(f"{exchange.id}: Unified OI history failed: {e}")
+                # Base CCXT API Failed    
+                except Exception as e:
+                    print(f"{exchange.id}: Unified OI history failed: {e}")
 
         # Build base candle DataFrame
-        df = pd.DataFrame(
-            ohlcv,
-            columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-        )
+        df = ohlcv.copy()
         df['volume_usd'] = df['volume'] * df['close']
         df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume', 'volume_usd']].copy()
         df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
@@ -100,49 +421,28 @@ def fetch_single_exchange_data(
         df['symbol'] = symbol
 
         # Historical Open Interest
-        if oi_history: # Validate Field Exists
+        if oi_history is not None and not oi_history.empty: # Validate Field Exists
 
-            # Build Open Interest Dataframe
-            oi_df = pd.DataFrame(oi_history)
+            # Open Interest Dataframe (Already Normalized To oi_value / oi_amount)
+            oi_df = oi_history.copy()
 
             # Clean Timestamp
             oi_df['timestamp'] = pd.to_datetime(oi_df['timestamp'], unit='ms')
 
-            # Initialize target column with NaNs
-            oi_df['oi_usd_hist'] = float('nan')
+            # Explicit USD Value, Fallback: Calculate from Contracts/Amount * Price (Bybit, OKX)
+            calculated_oi = oi_df['oi_amount'] * (current_price or float('nan'))
+            oi_df['oi_usd_hist'] = oi_df['oi_value'].fillna(calculated_oi)
 
-            # Try: explicit USD Value (CCXT Standard API)
-            if 'openInterestValue' in oi_df.columns:
-                 oi_df['oi_usd_hist'] = oi_df['oi_usd_hist'].fillna(oi_df['openInterestValue']).infer_objects(copy=False)
+            # Drop rows where we still couldn't find ANY data
+            oi_df = oi_df.dropna(subset=['oi_usd_hist'])
             
-            # Try: explicit USD Value (Binance variant)
-            if 'openInterestUSD' in oi_df.columns:
-                 oi_df['oi_usd_hist'] = oi_df['oi_usd_hist'].fillna(oi_df['openInterestUSD']).infer_objects(copy=False)
-
-            # Fallback: Calculate from Contracts/Amount * Price (Bybit, OKX)
-            if 'openInterestAmount' in oi_df.columns:
-                calculated_oi = oi_df['openInterestAmount'] * current_price
-                oi_df['oi_usd_hist'] = oi_df['oi_usd_hist'].fillna(calculated_oi).infer_objects(copy=False)
+            # Organize & Clean Dups
+            oi_df = oi_df[['timestamp', 'oi_usd_hist']]
+            oi_df = oi_df.drop_duplicates(subset=['timestamp'])
             
-            elif 'openInterest' in oi_df.columns: # try generic key 'openInterest'
-                calculated_oi = oi_df['openInterest'] * current_price
-                oi_df['oi_usd_hist'] = oi_df['oi_usd_hist'].fillna(calculated_oi).infer_objects(copy=False)
-
-            # Cleanup
-            if 'oi_usd_hist' in oi_df.columns:
-               
-                # Drop rows where we still couldn't find ANY data
-                oi_df = oi_df.dropna(subset=['oi_usd_hist'])
-                
-                # Organize & Clean Dups
-                oi_df = oi_df[['timestamp', 'oi_usd_hist']]
-                oi_df = oi_df.drop_duplicates(subset=['timestamp'])
-                
-                # Merge to Main DF
-                df = df.merge(oi_df, on='timestamp', how='left')
-                df['oi_usd_hist'] = df['oi_usd_hist'].ffill()
-            else:
-                df['oi_usd_hist'] = None
+            # Merge to Main DF
+            df = df.merge(oi_df, on='timestamp', how='left')
+            df['oi_usd_hist'] = df['oi_usd_hist'].ffill()
         else:
             df['oi_usd_hist'] = None
 
@@ -159,12 +459,13 @@ def fetch_single_exchange_data(
         # traceback.print_exc() # Uncomment for deep debugging
         return None
             
-def get_exchanges(exchange_list: Optional[List[str]] = None)->List[ccxt.Exchange]:
+def get_exchanges(exchange_list: Optional[List[Any]] = None)->List[ccxt.Exchange]:
     """
-    Initialize exchange objects.
+    Get exchange objects from the process-wide client pool.
     
     Args:
-        exchange_list: Optional list of exchange IDs. If None, uses ACTIVE_EXCHANGES
+        exchange_list: Optional list of exchange IDs. If None, uses ACTIVE_EXCHANGES.
+                       Entries that are already exchange instances (e.g. benchmark stubs) are passed through.
     """
     if exchange_list is None:
         exchange_list = ACTIVE_EXCHANGES
@@ -174,51 +475,63 @@ def get_exchanges(exchange_list: Optional[List[str]] = None)->List[ccxt.Exchange
 
     # Create Exchange Object From Each Active
     for exchange_id in exchange_list:
+
+        # Already Built (Stub / Pre-Configured Instance)
+        if not isinstance(exchange_id, str):
+            exchanges.append(exchange_id)
+            continue
+
         try:
-            # Create Exchange Object From ID
-            exchange_class = getattr(ccxt, exchange_id)
-            # Append to List
-            exchanges.append(exchange_class())
+            # Reuse Pooled Exchange Object (Created On First Use)
+            exchanges.append(get_client(exchange_id))
         except AttributeError:
             print(f"⚠️ Exchange '{exchange_id}' not found in CCXT")
     
     return exchanges
 
-def fetch_data(
-    ticker: Optional[str] = None,
-    exchanges: Optional[List[str]] = None,
-    lookback: Optional[int] = None
-)->pd.DataFrame:
+def fetch_exchanges_data(
+    exchange_objects: List[Any],
+    symbols: Optional[List[str]] = None,
+    lookback: Optional[int] = None,
+    concurrent: Optional[bool] = None
+) -> List[pd.DataFrame]:
     """
-    Fetch data from multiple exchanges.
+    Fetch every exchange, either all at once on a bounded thread pool or one after another.
+
+    Exchange calls are network-bound, so threads overlap the round trips and the total
+    time approaches the slowest exchange instead of the sum of all of them.
     
     Args:
-        ticker: Optional ticker symbol (e.g., 'BTC'). If None, uses config default
-        exchanges: Optional list of exchange IDs. If None, uses ACTIVE_EXCHANGES
-        lookback: Optional lookback in hours. If None, uses LOOKBACK from config
+        exchange_objects: CCXT exchange instances (or compatible stubs)
+        symbols: Optional list of symbols to try. If None, uses global SYMBOLS
+        lookback: Optional lookback in hours. If None, uses global LOOKBACK
+        concurrent: Optional override of FETCH_CONCURRENT
+
+    Returns:
+        Non-empty per-exchange DataFrames, in the same order as exchange_objects
     """
-    from .config import get_symbols_for_ticker
-    
-    # Use defaults if not provided
-    if ticker:
-        symbols = get_symbols_for_ticker(ticker)
+    if concurrent is None:
+        concurrent = FETCH_CONCURRENT
+
+    def fetch(ex: Any) -> pd.DataFrame | None:
+        return fetch_single_exchange_data(ex, symbols=symbols, lookback=lookback)
+
+    if concurrent and len(exchange_objects) > 1:
+        workers = min(FETCH_MAX_WORKERS, len(exchange_objects))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="exchange-fetch") as pool:
+            # map() keeps input order, so the combined frame matches the sequential path
+            results = list(pool.map(fetch, exchange_objects))
     else:
-        symbols = SYMBOLS
-    
-    # Get Exchanges
-    exchange_objects:List[ccxt.Exchange] = get_exchanges(exchanges)
+        results = [fetch(ex) for ex in exchange_objects]
 
-    # List of DF
-    all_df: List[pd.DataFrame] = []
+    # Record Mode: Write This Run's Responses Once (Not Per Call)
+    flush_recordings()
 
-    for ex in exchange_objects:
-        
-        # Fetch All Symbols (USDT/USDC/USD) For Single Exchange
-        df = fetch_single_exchange_data(ex, symbols=symbols, lookback=lookback)
+    # Only keep exchanges that returned data
+    return [df for df in results if df is not None and not df.empty]
 
-        # Only append if data was successfully fetched
-        if df is not None and not df.empty:
-            all_df.append(df)
+def combine_exchange_data(all_df: List[pd.DataFrame]) -> pd.DataFrame:
+    """Merge per-exchange frames into the combined, timestamp-ordered frame with OI deltas"""
 
     # Ensure we have at least some data
     if not all_df:
@@ -235,4 +548,37 @@ def fetch_data(
     combined_df = combined_df.sort_values(['exchange', 'timestamp'])
     combined_df['oi_delta'] = combined_df.groupby('exchange')['oi_usd_hist'].diff()
 
-    return combined_df
\ No newline at end of file
+    return combined_df
+
+def fetch_data(
+    ticker: Optional[str] = None,
+    exchanges: Optional[List[Any]] = None,
+    lookback: Optional[int] = None,
+    concurrent: Optional[bool] = None
+)->pd.DataFrame:
+    """
+    Fetch data from multiple exchanges.
+    
+    Args:
+        ticker: Optional ticker symbol (e.g., 'BTC'). If None, uses config default
+        exchanges: Optional list of exchange IDs (or exchange instances). If None, uses ACTIVE_EXCHANGES
+        lookback: Optional lookback in hours. If None, uses LOOKBACK from config
+        concurrent: Optional override of FETCH_CONCURRENT (False = sequential, for comparison)
+    """
+    from .config import get_symbols_for_ticker
+    
+    # Use defaults if not provided
+    if ticker:
+        symbols = get_symbols_for_ticker(ticker)
+    else:
+        symbols = SYMBOLS
+    
+    # Get Exchanges
+    exchange_objects:List[ccxt.Exchange] = get_exchanges(exchanges)
+
+    # Fetch All Symbols (USDT/USDC/USD) For Every Exchange
+    all_df: List[pd.DataFrame] = fetch_exchanges_data(
+        exchange_objects, symbols=symbols, lookback=lookback, concurrent=concurrent
+    )
+
+    return combine_exchange_data(all_df)
\ No newline at end of file
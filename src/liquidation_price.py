@@ -1,75 +1,167 @@
 from .config import (
     LEVERAGE_PROFILES, 
     NUM_LEVERAGE_SAMPLES,
+    FUNDING_RATE_QUANTUM,
     MIN_LEVERAGE,
     MAX_LEVERAGE,
     TOTAL_BUFFER, 
-    NUM_BUCKETS
+    NUM_BUCKETS,
+    BINNING_ENGINE
 )
-from typing import List, Tuple
-from .models import Side, Entry, Status, Liquidation, Direction
+from typing import List, Optional, Tuple
+from functools import lru_cache
+from statistics import NormalDist
+import math
+from .models import Side, Entry, Status, Direction
 import pandas as pd
-import random
 import numpy as np
 
 from . import entries
 
 
+def leverage_distribution(profile: str = "neutral", funding_rate: float = 0.0) -> Tuple[float, float]:
+    """(mean, std) of the leverage normal for a profile ('dynamic' reads the funding rate)"""
+    # Dynamic profile adjusts based on funding rate
+    if profile == "dynamic":
+        # High funding = market is hot = traders use higher leverage
+        aggressiveness = min(abs(funding_rate) * 10000, 2.0)  # 0.0003 -> 3.0, cap at 2.0
+
+        mean = 25.0 + (aggressiveness * 30.0)  # 25x -> 85x as funding increases
+        std = 15.0 - (aggressiveness * 5.0)    # 15 -> 5 (tighter distribution at high funding)
+        return mean, std
+
+    # Use predefined profile
+    params = LEVERAGE_PROFILES.get(profile, LEVERAGE_PROFILES["neutral"])
+    return params["mean"], params["std"]
+
+
+@lru_cache(maxsize=256)
+def _leverage_grid(profile: str, funding_steps: int, num_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+    mean, std = leverage_distribution(profile, funding_steps * FUNDING_RATE_QUANTUM)
+    normal = NormalDist(mean, std)
+
+    # Midpoint Quantiles: Each Point Stands For An Equal 1/n Slice Of The Normal
+    leverages = np.array([normal.inv_cdf((i + 0.5) / num_samples) for i in range(num_samples)])
+
+    # Clip to realistic bounds
+    leverages = np.clip(leverages, MIN_LEVERAGE, MAX_LEVERAGE)
+
+    # Leverages near the mean get more USD allocation (density at each point, normalized)
+    pdf_values = np.array([normal.pdf(x) for x in leverages])
+    weights = pdf_values / pdf_values.sum()
+
+    # Shared Between Callers Via The Cache
+    leverages.setflags(write=False)
+    weights.setflags(write=False)
+    return leverages, weights
+
+
 def sample_leverages(
     profile: str = "neutral", 
     funding_rate: float = 0.0, 
     num_samples: int = None
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Sample leverages from a continuous normal distribution with probability weights.
-    
-    This creates smooth, realistic liquidation gradients with proper USD allocation
-    based on how likely each leverage is to be used.
-    
+    Deterministic leverage grid with probability weights.
+
+    Points sit at the midpoint quantiles of the profile's normal distribution (a
+    stratified sample: same distribution as random draws, without the noise), each
+    weighted by the normal density, so identical inputs always give identical maps.
+    Grids are cached by (profile, funding rate rounded to FUNDING_RATE_QUANTUM, num_samples).
+
     Args:
         profile: 'conservative', 'neutral', 'aggressive', or 'dynamic'
         funding_rate: Current funding rate (used for dynamic adjustment)
-        num_samples: Number of samples to generate (defaults to NUM_LEVERAGE_SAMPLES)
-    
+        num_samples: Number of grid points (defaults to NUM_LEVERAGE_SAMPLES)
+
     Returns:
         Tuple of (leverages, weights) where:
-        - leverages: Array of leverage values between MIN_LEVERAGE and MAX_LEVERAGE
-        - weights: Probability weights (sum to 1.0) based on normal distribution density
+        - leverages: Read-only array of leverage values between MIN_LEVERAGE and MAX_LEVERAGE
+        - weights: Read-only probability weights (sum to 1.0) based on normal distribution density
     """
     if num_samples is None:
         num_samples = NUM_LEVERAGE_SAMPLES
-    
-    # Dynamic profile adjusts based on funding rate
-    if profile == "dynamic":
-        # High funding = market is hot = traders use higher leverage
-        aggressiveness = min(abs(funding_rate) * 10000, 2.0)  # 0.0003 -> 3.0, cap at 2.0
-        
-        mean = 25.0 + (aggressiveness * 30.0)  # 25x -> 85x as funding increases
-        std = 15.0 - (aggressiveness * 5.0)    # 15 -> 5 (tighter distribution at high funding)
-        
-    else:
-        # Use predefined profile
-        params = LEVERAGE_PROFILES.get(profile, LEVERAGE_PROFILES["neutral"])
-        mean = params["mean"]
-        std = params["std"]
-    
-    # Sample from normal distribution
-    leverages = np.random.normal(mean, std, num_samples)
-    
-    # Clip to realistic bounds
-    leverages = np.clip(leverages, MIN_LEVERAGE, MAX_LEVERAGE)
-    
-    # Calculate probability density for each leverage using numpy
-    # PDF of normal distribution: (1 / (σ√(2π))) * e^(-((x-μ)²)/(2σ²))
-    # This ensures leverages near the mean get more USD allocation
-    coefficient = 1.0 / (std * np.sqrt(2 * np.pi))
-    exponent = -((leverages - mean) ** 2) / (2 * std ** 2)
-    pdf_values = coefficient * np.exp(exponent)
-    
-    # Normalize to sum to 1.0
-    weights = pdf_values / pdf_values.sum()
-    
-    return leverages, weights
+
+    return _leverage_grid(profile, _funding_steps(profile, funding_rate), num_samples)
+
+
+def _funding_steps(profile: str, funding_rate: float) -> int:
+    # Only The Dynamic Profile Depends On Funding; Keep Other Profiles On One Cache Entry
+    if profile == "dynamic" and funding_rate is not None and np.isfinite(funding_rate):
+        return int(round(funding_rate / FUNDING_RATE_QUANTUM))
+    return 0
+
+
+class LeverageMeasure:
+    """
+    Continuous limit of a sample_leverages grid: the USD share it assigns to any leverage range.
+
+    Grid points are spread like the normal and weighted by its density, so the share per unit
+    leverage is proportional to pdf(x)^2, i.e. a normal with std / sqrt(2). Points clipped to
+    MIN_LEVERAGE / MAX_LEVERAGE become atoms there. Support is limited to the grid's own range
+    (so bucket edges match the sampled engine) and the total is normalized to 1.
+    """
+
+    def __init__(self, mean: float, std: float, low: float, high: float):
+        self.low = low
+        self.high = high
+        self._mean = mean
+        self._scale = std / math.sqrt(2)
+        normal = NormalDist(mean, std)
+
+        # Unnormalized: Continuous Part Is pdf^2 = N(mean, std/sqrt2) / (2 std sqrt(pi))
+        self._density = 1.0 / (2.0 * std * math.sqrt(math.pi))
+        atom_low = normal.cdf(MIN_LEVERAGE) * normal.pdf(MIN_LEVERAGE) if low <= MIN_LEVERAGE else 0.0
+        atom_high = (1.0 - normal.cdf(MAX_LEVERAGE)) * normal.pdf(MAX_LEVERAGE) if high >= MAX_LEVERAGE else 0.0
+        continuous = self._density * (self._cdf(np.array([high]))[0] - self._cdf(np.array([low]))[0])
+
+        total = atom_low + atom_high + continuous
+        self.atoms = np.array([low, high])
+        self.atom_shares = np.array([atom_low, atom_high]) / total
+        self._density /= total
+
+    def _cdf(self, x: np.ndarray) -> np.ndarray:
+        z = (np.asarray(x, dtype=float) - self._mean) / (self._scale * math.sqrt(2))
+        return 0.5 * _erfc(-z)
+
+    def continuous_share(self, leverage: np.ndarray) -> np.ndarray:
+        """Share of the continuous part at or below each leverage (atoms excluded)"""
+        clipped = np.clip(leverage, self.low, self.high)
+        return self._density * (self._cdf(clipped) - self._cdf(np.array([self.low]))[0])
+
+
+# erfc Chebyshev Fit (Numerical Recipes erfcc): Relative Error < 1.2e-7 Everywhere, So The
+# Normal CDF Keeps That Precision Deep Into Both Tails (scipy Is Not A Dependency)
+_ERFC_COEFFICIENTS = (
+    -1.26551223, 1.00002368, 0.37409196, 0.09678418, -0.18628806,
+    0.27886807, -1.13520398, 1.48851587, -0.82215223, 0.17087277
+)
+
+
+def _erfc(x: np.ndarray) -> np.ndarray:
+    """Vectorized complementary error function (see _ERFC_COEFFICIENTS for accuracy)"""
+    x = np.asarray(x, dtype=float)
+    t = 1.0 / (1.0 + 0.5 * np.abs(x))
+    poly = np.zeros_like(t)
+    for coefficient in reversed(_ERFC_COEFFICIENTS):
+        poly = coefficient + t * poly
+    tail = t * np.exp(-x * x + poly)
+    return np.where(x >= 0, tail, 2.0 - tail)
+
+
+@lru_cache(maxsize=256)
+def _leverage_measure(profile: str, funding_steps: int, num_samples: int) -> LeverageMeasure:
+    leverages, _ = _leverage_grid(profile, funding_steps, num_samples)
+    mean, std = leverage_distribution(profile, funding_steps * FUNDING_RATE_QUANTUM)
+    return LeverageMeasure(mean, std, float(leverages.min()), float(leverages.max()))
+
+
+def leverage_measure(profile: str = "neutral", funding_rate: float = 0.0, num_samples: int = None) -> LeverageMeasure:
+    """LeverageMeasure of the sample_leverages grid for the same arguments (cached alike)"""
+    if num_samples is None:
+        num_samples = NUM_LEVERAGE_SAMPLES
+
+    return _leverage_measure(profile, _funding_steps(profile, funding_rate), num_samples)
 
 
 def get_liq(entry_price: float, leverage: int, is_long: bool) -> float:
@@ -81,84 +173,121 @@ def get_liq(entry_price: float, leverage: int, is_long: bool) -> float:
         return entry_price * (1 + base) - entry_price * TOTAL_BUFFER
 
 
-def fetch_liquidation_levels(entries: List[Entry], distribution: str, total_oi_usd, close_usd: float, funding_rate: float, agg_df: pd.DataFrame):
-
-    # Will Store All Price Liq Lvls
-    liquidations: List[Liquidation] = []
-
-    # Sample continuous leverages with probability weights
-    # Leverages near the mean get higher weights (more USD allocation)
-    leverages, weights = sample_leverages(profile=distribution, funding_rate=funding_rate)
-
-    for entry in entries:
-        # Determine direction for this entry
-        if entry.side == Side.NEUTRAL:
-            is_long_liq = random.random() < 0.5
-        else:
-            is_long_liq = (entry.side == Side.LONG)
-        
-        side_str = 'long' if is_long_liq else 'short'
-        
-        # Create liquidation point for each sampled leverage
-        # USD allocation is weighted by probability (common leverages get more USD)
-        for leverage, weight in zip(leverages, weights):
-            liq_price = get_liq(entry.price, leverage, is_long_liq)
-            usd = entry.weight * weight * total_oi_usd  # Weight varies by leverage probability!
-            
-            liquidations.append(Liquidation(
-                liq_price=liq_price,
-                amnt_usd_liq=usd,
-                side=side_str,
-                entry_start_time=entry.start_time
-            ))
-
-    binned = bin_liquidations(liquidations, close_usd, agg_df, NUM_BUCKETS)
-
-    # Create a DF of Raw Points (Used in Calculating Gravity; Easiest Place to Extract)
-    raw_data = []
-    for l in liquidations:
-        status = Status.ACTIVE
-        history = agg_df[agg_df['timestamp'] > l.entry_start_time]
-
-        if not history.empty:
-            low_after = history['low'].min()
-            high_after = history['high'].max()
-
-            if l.side == 'long':
-                if low_after <= l.liq_price:
-                    status = Status.CLEARED
-            else:  # short
-                if high_after >= l.liq_price:
-                    status = Status.CLEARED
-
-        raw_data.append({
-            'price': l.liq_price,
-            'usd': l.amnt_usd_liq,
-            'side': Side.LONG if l.side == 'long' else Side.SHORT,
-            'entry_start_time': l.entry_start_time,
-            'status': status
-        })
-
-    df_liq = pd.DataFrame(raw_data)
-
-    # Return Tuple
-    return binned, df_liq
-
-
-def bin_liquidations(liquidations: List[Liquidation], current_price: float, agg_df: pd.DataFrame, num_buckets: int = 20):
-    if not liquidations:
-        return pd.DataFrame()
+def entry_legs(entries: List[Entry]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    One row per (entry, side): NEUTRAL entries are split evenly, half the weight long, half short.
 
-    df_liq = pd.DataFrame([{
-        'price': l.liq_price,
-        'usd': l.amnt_usd_liq,
-        'side': l.side,
-        'entry_start_time': l.entry_start_time
-    } for l in liquidations])
+    Returns:
+        (prices, weights, start_times as datetime64[ns], is_long)
+    """
+    legs = [
+        (e, is_long, 0.5 if e.side == Side.NEUTRAL else 1.0)
+        for e in entries
+        for is_long in ((True, False) if e.side == Side.NEUTRAL else (e.side == Side.LONG,))
+    ]
 
-    # Create symmetric buckets around current price
-    max_distance = df_liq['price'].sub(current_price).abs().max()
+    return (
+        np.array([e.price for e, _, _ in legs], dtype=float),
+        np.array([e.weight * share for e, _, share in legs], dtype=float),
+        pd.to_datetime([e.start_time for e, _, _ in legs]).to_numpy(dtype='datetime64[ns]'),
+        np.array([is_long for _, is_long, _ in legs], dtype=bool),
+    )
+
+
+def build_liquidation_points(entries: List[Entry], leverages: np.ndarray, weights: np.ndarray, total_oi_usd: float) -> pd.DataFrame:
+    """
+    Broadcast entries x sampled leverages into columnar liquidation points.
+
+    Same math as get_liq, evaluated for every (entry, leverage) pair at once; rows are
+    entry-major, i.e. the order the old per-point loop produced them in. A NEUTRAL entry
+    contributes a long block then a short block, each with half its weight.
+
+    Returns:
+        DataFrame with price, usd, side (Side) and entry_start_time columns
+    """
+    if not entries:
+        return pd.DataFrame(columns=['price', 'usd', 'side', 'entry_start_time'])
+
+    entry_prices, entry_weights, start_times, is_long = entry_legs(entries)
 
+    # Longs: Entry * (1 - 1/Lev + Buffer) | Shorts: Entry * (1 + 1/Lev - Buffer)
+    direction = np.where(is_long, -1.0, 1.0)[:, None]
+    prices = entry_prices[:, None] * (1.0 + direction * (1.0 / leverages[None, :] - TOTAL_BUFFER))
+
+    # USD allocation is weighted by probability (common leverages get more USD)
+    usd = entry_weights[:, None] * weights[None, :] * total_oi_usd
+
+    num_samples = len(leverages)
+    sides = np.repeat(np.where(is_long, 0, 1), num_samples)
+
+    return pd.DataFrame({
+        'price': prices.ravel(),
+        'usd': usd.ravel(),
+        'side': pd.Categorical.from_codes(sides, categories=[Side.LONG, Side.SHORT]),
+        'entry_start_time': np.repeat(start_times, num_samples),
+    })
+
+
+def build_extreme_index(agg_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Precompute suffix extremes of the aggregated candles.
+
+    Returns:
+        (timestamps as int64 ns, suffix_min_low, suffix_max_high) where suffix_min_low[i] is the
+        lowest low of candles i..end. Both suffix arrays carry a trailing NaN so a lookup past
+        the last candle reads as "no history".
+    """
+    ordered = agg_df.sort_values('timestamp')
+    stamps = ordered['timestamp'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+
+    # Reverse Running min/max (fmin/fmax Skip NaN Candles, Like Series.min/max)
+    suffix_min_low = np.fmin.accumulate(ordered['low'].to_numpy(dtype=float)[::-1])[::-1]
+    suffix_max_high = np.fmax.accumulate(ordered['high'].to_numpy(dtype=float)[::-1])[::-1]
+
+    return (
+        stamps,
+        np.append(suffix_min_low, np.nan),
+        np.append(suffix_max_high, np.nan),
+    )
+
+
+def post_entry_extremes(index: Tuple[np.ndarray, np.ndarray, np.ndarray], entry_times) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lowest low / highest high of all candles strictly after each entry time.
+
+    Args:
+        index: Output of build_extreme_index
+        entry_times: Array-like of entry timestamps
+
+    Returns:
+        (low_after, high_after) arrays; NaN where no candle follows the entry
+    """
+    stamps, suffix_min_low, suffix_max_high = index
+    times = pd.to_datetime(entry_times).to_numpy(dtype='datetime64[ns]')
+
+    # First Candle Strictly After Entry (NaT Entries Land Past The End)
+    positions = np.searchsorted(stamps, times.astype(np.int64), side='right')
+    positions[np.isnat(times)] = len(stamps)
+
+    return suffix_min_low[positions], suffix_max_high[positions]
+
+
+def raw_point_status(df_liq: pd.DataFrame, extremes) -> pd.Categorical:
+    """ACTIVE / CLEARED per raw point, from the extremes of the candles after its entry"""
+    low_after, high_after = post_entry_extremes(extremes, df_liq['entry_start_time'])
+
+    # Long liquidated once price trades at/below it, short once at/above (no history -> NaN -> ACTIVE)
+    is_long = (df_liq['side'] == Side.LONG).to_numpy()
+    point_prices = df_liq['price'].to_numpy()
+    cleared = np.where(is_long, low_after <= point_prices, high_after >= point_prices)
+
+    return pd.Categorical.from_codes(
+        cleared.astype(np.int8), categories=[Status.ACTIVE, Status.CLEARED]
+    )
+
+
+def bucket_edges(current_price: float, max_distance: float, num_buckets: int) -> np.ndarray:
+    """num_buckets + 1 edges, symmetric around current price and reaching max_distance"""
     # Just In Case They're All Clustered; Stops Error Down Line
     if max_distance == 0:
         max_distance = current_price * 0.01
@@ -168,7 +297,19 @@ def bin_liquidations(liquidations: List[Liquidation], current_price: float, agg_
     # Edges: from low to high, centered on current
     lower = current_price - (num_buckets // 2) * bucket_size
     upper = current_price + (num_buckets // 2) * bucket_size
-    edges = np.linspace(lower, upper, num_buckets + 1)
+    return np.linspace(lower, upper, num_buckets + 1)
+
+
+def bin_liquidations(liquidations: pd.DataFrame, current_price: float, agg_df: pd.DataFrame, num_buckets: int = 20, extremes=None):
+    if liquidations.empty:
+        return pd.DataFrame()
+
+    df_liq = liquidations[['price', 'usd', 'side', 'entry_start_time']].copy()
+
+    # Create symmetric buckets around current price
+    max_distance = df_liq['price'].sub(current_price).abs().max()
+
+    edges = bucket_edges(current_price, max_distance, num_buckets)
 
     df_liq['bucket'] = pd.cut(df_liq['price'], bins=edges, include_lowest=True)
     binned = df_liq.groupby('bucket', observed=False)[
@@ -183,78 +324,230 @@ def bin_liquidations(liquidations: List[Liquidation], current_price: float, agg_
     # Sort by intensity
     binned = binned.sort_values('intensity', ascending=False)
 
-    return add_liquidation_status(binned, df_liq, agg_df)
+    return add_liquidation_status(binned, df_liq, agg_df, extremes=extremes)
 
 
-def add_liquidation_status(binned: pd.DataFrame, df_liq: pd.DataFrame, agg_df: pd.DataFrame) -> pd.DataFrame:
+def add_liquidation_status(binned: pd.DataFrame, df_liq: pd.DataFrame, agg_df: pd.DataFrame, extremes=None) -> pd.DataFrame:
+    """
+    Status per bin from the USD share of its points that price has since swept.
 
-    # Stores Status Per; Pushed to DF Col @END
-    statuses = []
+    Each point is checked against its own bin's edges using the extremes of the candles after
+    its entry; cleared / partial USD is then summed per bin with one bincount.
 
-    # Iterate Through ALl Bins
-    for row in binned.itertuples():
-        bucket = row.bucket  # Pull Our Interval object
+    Args:
+        binned: Bins with a categorical 'bucket' column (from bin_liquidations)
+        df_liq: Points with 'bucket' (same categories), 'usd', 'side' and 'entry_start_time'
+        agg_df: Aggregated candles (only used if extremes is None)
+        extremes: Optional prebuilt build_extreme_index(agg_df)
+    """
+    if extremes is None:
+        extremes = build_extreme_index(agg_df)
+
+    # Bucket Codes Once (-1 = Outside Every Bin)
+    buckets = df_liq['bucket'].cat
+    codes = buckets.codes.to_numpy()
+    num_bins = len(buckets.categories)
+    in_bin = codes >= 0
+    codes = codes[in_bin]
+
+    # Bin edges for each point
+    bin_low = buckets.categories.left.to_numpy(dtype=float)[codes]
+    bin_high = buckets.categories.right.to_numpy(dtype=float)[codes]
+
+    # Relevant extremes after each point's entry (NaN = no history = active)
+    low_after, high_after = post_entry_extremes(extremes, df_liq['entry_start_time'].to_numpy()[in_bin])
+
+    # Determine if cleared/partial
+    is_long = (df_liq['side'] == Side.LONG).to_numpy()[in_bin]
+    fully_cleared = np.where(is_long, low_after <= bin_low, high_after >= bin_high)
+    partially = np.where(is_long, low_after < bin_high, high_after > bin_low) & ~fully_cleared
+
+    # Weight by each point's USD, summed per bin
+    usd = df_liq['usd'].to_numpy(dtype=float)[in_bin]
+    bin_usd = np.bincount(codes, weights=usd, minlength=num_bins)
+    cleared_usd = np.bincount(codes, weights=usd * fully_cleared, minlength=num_bins)
+    partial_usd = np.bincount(codes, weights=usd * partially, minlength=num_bins)
+
+    binned['status'] = bin_statuses(bin_usd, cleared_usd, partial_usd)[binned['bucket'].cat.codes.to_numpy()]
+    return binned
 
-        # Extract original liquidations in bucket
-        group = df_liq[df_liq['bucket'] == bucket]
 
-        if group.empty:
-            statuses.append(Status.ACTIVE)  # no points = active by default
-            continue
+def bin_statuses(bin_usd: np.ndarray, cleared_usd: np.ndarray, partial_usd: np.ndarray) -> np.ndarray:
+    """Status per bin (object array, bin order) from its total / cleared / partial USD"""
+    # Aggregate status weighted by USD (empty bins stay active)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cleared_pct = np.where(bin_usd > 0, cleared_usd / bin_usd, 0.0)
+        partial_pct = np.where(bin_usd > 0, partial_usd / bin_usd, 0.0)
 
-        cleared_usd = 0.0
-        partial_usd = 0.0
-        bin_usd = group['usd'].sum()
+    # Majority rule: if >80% cleared, full cleared; >20% partial, partial; else active
+    status_by_bin = np.select(
+        [cleared_pct > 0.8, (partial_pct > 0.2) | (cleared_pct > 0.2)],
+        [2, 1],
+        default=0
+    )
 
-        # Check each point individually for max acc.
-        for p in group.itertuples():
+    statuses = np.array([Status.ACTIVE, Status.PARTIAL, Status.CLEARED], dtype=object)
+    return statuses[status_by_bin]
 
-            # Only Pull Price history after this specific entry was opened
-            history_after = agg_df[agg_df['timestamp'] > p.entry_start_time]
 
-            if history_after.empty:
-                # No history after entry = active
-                continue
+def bucket_dtype(edges: np.ndarray) -> pd.CategoricalDtype:
+    """Interval categories pd.cut would give these edges (rounded labels, lowest edge included)"""
+    return pd.cut(pd.Series([], dtype=float), bins=edges, include_lowest=True).dtype
 
-            # Get relevant extremes after entry
-            low_after = history_after['low'].min()
-            high_after = history_after['high'].max()
 
-            # Bin edges for this point
-            bin_low = bucket.left
-            bin_high = bucket.right
+def binned_frame(dtype: pd.CategoricalDtype, bin_usd: np.ndarray, cleared_usd: np.ndarray, partial_usd: np.ndarray) -> pd.DataFrame:
+    """Bins DataFrame (bin_liquidations columns, sorted by intensity) from per-bucket USD sums"""
+    binned = pd.DataFrame({
+        'bucket': pd.Categorical.from_codes(np.arange(len(bin_usd)), dtype=dtype),
+        'usd': bin_usd,
+    })
 
-            # Determine if cleared/partial
-            if p.side == 'long':
-                fully_cleared = low_after <= bin_low
-                partially = low_after < bin_high and not fully_cleared
-            else:  # short
-                fully_cleared = high_after >= bin_high
-                partially = high_after > bin_low and not fully_cleared
+    # Add mid price and intensity %
+    binned['mid_price'] = binned['bucket'].apply(lambda x: x.mid)
+    max_usd = binned['usd'].max()
+    binned['intensity'] = (binned['usd'] / max_usd *
+                           100).round(1) if max_usd > 0 else 0
+
+    # Sort by intensity
+    binned = binned.sort_values('intensity', ascending=False)
+
+    statuses = bin_statuses(bin_usd, cleared_usd, partial_usd)
+    binned['status'] = statuses[binned['bucket'].cat.codes.to_numpy()]
+    return binned
 
-            # Weight by this point's USD
-            if fully_cleared:
-                cleared_usd += p.usd
-            elif partially:
-                partial_usd += p.usd
-            # else active = rest
 
-        # Aggregate status weighted by USD
-        cleared_pct = cleared_usd / bin_usd if bin_usd > 0 else 0
-        partial_pct = partial_usd / bin_usd if bin_usd > 0 else 0
+def density_max_distance(entries: List[Entry], distribution: str, funding_rate: float, current_price: float) -> float:
+    """Distance from current price to the farthest point the sampled engine would produce (grid ends)"""
+    measure = leverage_measure(distribution, funding_rate)
+    entry_prices, _, _, is_long = entry_legs(entries)
+    direction = np.where(is_long, -1.0, 1.0)[:, None]
 
-        # Majority rule: if >80% cleared, full cleared; >20% partial, partial; else active
-        if cleared_pct > 0.8:
-            status = Status.CLEARED
-        elif partial_pct > 0.2 or cleared_pct > 0.2:
-            status = Status.PARTIAL
-        else:
-            status = Status.ACTIVE
+    support = np.array([measure.low, measure.high])[None, :]
+    end_prices = entry_prices[:, None] * (1.0 + direction * (1.0 / support - TOTAL_BUFFER))
+    return float(np.abs(end_prices - current_price).max())
 
-        statuses.append(status)
 
-    binned['status'] = statuses
-    return binned
+def density_bucket_sums(
+    entries: List[Entry],
+    distribution: str,
+    funding_rate: float,
+    total_oi_usd: float,
+    edges: np.ndarray,
+    extremes,
+    bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    USD per bucket of arbitrary ascending edges, integrated from each entry's leverage measure.
+
+    Args:
+        edges: Bucket edges (buckets are right-closed, the lowest edge included)
+        extremes: build_extreme_index output
+        bounds: Optional (low, high) per bucket for the status checks (defaults to the edges)
+
+    Returns:
+        (usd, cleared_usd, partial_usd) per bucket
+    """
+    num_buckets = len(edges) - 1
+    measure = leverage_measure(distribution, funding_rate)
+    entry_prices, entry_weights, start_times, is_long = entry_legs(entries)
+    direction = np.where(is_long, -1.0, 1.0)[:, None]
+
+    # Leverage At Each Edge: Longs 1 / (1 + Buffer - Edge/Entry), Shorts 1 / (Edge/Entry - 1 + Buffer)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        denominator = direction * (edges[None, :] / entry_prices[:, None] - 1.0) + TOTAL_BUFFER
+        edge_leverage = np.where(denominator > 0, 1.0 / denominator, np.inf)
+
+    # Continuous Share Per Bucket (Longs Rise With Leverage, Shorts Fall)
+    cumulative = measure.continuous_share(edge_leverage)
+    shares = np.abs(np.diff(cumulative, axis=1))
+
+    # Clip Atoms Land In The Bucket Holding Their Price (Dropped Outside The Edges, Like pd.cut)
+    atom_prices = entry_prices[:, None] * (1.0 + direction * (1.0 / measure.atoms[None, :] - TOTAL_BUFFER))
+    tolerance = (edges[-1] - edges[0]) * 1e-9
+    atom_codes = np.searchsorted(edges, atom_prices, side='left') - 1
+    atom_codes[np.abs(atom_prices - edges[0]) <= tolerance] = 0
+    atom_codes[np.abs(atom_prices - edges[-1]) <= tolerance] = num_buckets - 1
+    for k in range(len(measure.atoms)):
+        inside = (atom_codes[:, k] >= 0) & (atom_codes[:, k] < num_buckets)
+        shares[np.flatnonzero(inside), atom_codes[inside, k]] += measure.atom_shares[k]
+
+    usd = shares * (entry_weights * total_oi_usd)[:, None]
+
+    # Status Per (Entry, Bucket) From The Candles After The Entry
+    bin_low, bin_high = bounds if bounds is not None else (edges[:-1], edges[1:])
+    bin_low, bin_high = bin_low[None, :], bin_high[None, :]
+    low_after, high_after = post_entry_extremes(extremes, start_times)
+    low_after, high_after = low_after[:, None], high_after[:, None]
+    longs = is_long[:, None]
+    fully_cleared = np.where(longs, low_after <= bin_low, high_after >= bin_high)
+    partially = np.where(longs, low_after < bin_high, high_after > bin_low) & ~fully_cleared
+
+    return usd.sum(axis=0), (usd * fully_cleared).sum(axis=0), (usd * partially).sum(axis=0)
+
+
+def point_bucket_sums(df_liq: pd.DataFrame, edges: np.ndarray, extremes) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """density_bucket_sums for materialized points (sampled engine), same bucket / status rules"""
+    num_buckets = len(edges) - 1
+    prices = df_liq['price'].to_numpy(dtype=float)
+
+    # Right-Closed Buckets, Lowest Edge Included (-1 / num_buckets = Outside)
+    codes = np.searchsorted(edges, prices, side='left') - 1
+    codes[prices == edges[0]] = 0
+    in_bin = (codes >= 0) & (codes < num_buckets)
+    codes = codes[in_bin]
+
+    low_after, high_after = post_entry_extremes(extremes, df_liq['entry_start_time'].to_numpy()[in_bin])
+    bin_low, bin_high = edges[:-1][codes], edges[1:][codes]
+    is_long = (df_liq['side'] == Side.LONG).to_numpy()[in_bin]
+    fully_cleared = np.where(is_long, low_after <= bin_low, high_after >= bin_high)
+    partially = np.where(is_long, low_after < bin_high, high_after > bin_low) & ~fully_cleared
+
+    usd = df_liq['usd'].to_numpy(dtype=float)[in_bin]
+    return (
+        np.bincount(codes, weights=usd, minlength=num_buckets),
+        np.bincount(codes, weights=usd * fully_cleared, minlength=num_buckets),
+        np.bincount(codes, weights=usd * partially, minlength=num_buckets),
+    )
+
+
+def bin_liquidation_density(
+    entries: List[Entry],
+    distribution: str,
+    funding_rate: float,
+    total_oi_usd: float,
+    current_price: float,
+    agg_df: pd.DataFrame,
+    num_buckets: int = 20,
+    extremes=None
+) -> pd.DataFrame:
+    """
+    Analytic bin_liquidations: USD per bucket without materializing liquidation points.
+
+    Bucket edges are mapped back through get_liq into leverage space per entry side, and the
+    leverage measure of the sample_leverages grid (LeverageMeasure) is integrated between
+    them. Cost is O(entries x buckets) regardless of NUM_LEVERAGE_SAMPLES; edges and
+    statuses follow the same rules as the sampled engine. Support stops at the grid's
+    outermost quantiles (as its edges do), so it matches a dense grid over that leverage
+    range (~1e-5 of total USD), not the dense grid's wider tails (~1e-4 to 1e-3).
+
+    Returns:
+        Same columns as bin_liquidations (bucket, usd, mid_price, intensity, status)
+    """
+    if not entries:
+        return pd.DataFrame()
+
+    if extremes is None:
+        extremes = build_extreme_index(agg_df)
+
+    max_distance = density_max_distance(entries, distribution, funding_rate, current_price)
+    edges = bucket_edges(current_price, max_distance, num_buckets)
+
+    # Same Interval Labels (And Status Bounds) As pd.cut
+    dtype = bucket_dtype(edges)
+    bounds = (dtype.categories.left.to_numpy(dtype=float), dtype.categories.right.to_numpy(dtype=float))
+
+    sums = density_bucket_sums(entries, distribution, funding_rate, total_oi_usd, edges, extremes, bounds=bounds)
+    return binned_frame(dtype, *sums)
 
 
 # Render Helper
@@ -1,9 +1,8 @@
 from .exchange_data import fetch_data
-from .entries import estimate_entries, get_summary_stats, aggregate_market_view
 from typing import List, Optional
-from .liquidation_price import fetch_liquidation_levels, render_bins
-from .resolution import calculate_magnetism
-from .models import SummaryStats, Direction, Entry
+from .liquidation_price import render_bins
+from .pipeline import MapPipeline
+from .metrics import stage_timer, record_map_result
 import pandas as pd
 import ccxt
 
@@ -23,40 +22,13 @@ def main(ticker: Optional[str] = None, exchanges: Optional[List[str]] = None, lo
     lookback_hours = get_lookback_hours(lookback_days) if lookback_days else None
     
     df = fetch_data(ticker=ticker, exchanges=exchanges, lookback=lookback_hours)
-    agg_df = aggregate_market_view(df)
-    entries: List[Entry] = estimate_entries(df)
 
-    # Get Summary Stats
-    recieved = get_summary_stats(df)
-    summary_stats = SummaryStats(total_oi_usd=recieved.get("total_oi_usd"),
-                                 close=recieved.get("cur_price"),
-                                 funding_rate=recieved.get("funding_rate"),
-                                 high=recieved.get("high"),
-                                 low=recieved.get("low"))
-
-    # Get My LVLs Binned
-    bins, raw_liqs = fetch_liquidation_levels(
-        entries,
-        "dynamic",
-        summary_stats.total_oi_usd,
-        summary_stats.close,
-        summary_stats.funding_rate,
-        agg_df
-    )
-
-    # Pass the raw points into magnetism
-    bias, upward_mag, downward_mag = calculate_magnetism(
-        summary_stats.close, raw_liqs)
-
-    direction = Direction(
-        bias=bias,
-        upward_mag=upward_mag,
-        downward_mag=downward_mag
-    )
+    # Every Stage (Aggregation, Entries, Leverages, Points, Bins, Magnetism) Computed Once
+    pipeline = MapPipeline(df)
 
     # Render
-    render_bins(bins, summary_stats.close,
-                summary_stats.total_oi_usd, direction)
+    render_bins(pipeline.bins, pipeline.summary.close,
+                pipeline.summary.total_oi_usd, pipeline.direction)
 
 
 def calculate_map_data(
@@ -77,42 +49,29 @@ def calculate_map_data(
     # Convert days to hours if provided
     lookback_hours = get_lookback_hours(lookback_days) if lookback_days else None
     
-    df = fetch_data(ticker=ticker, exchanges=exchanges, lookback=lookback_hours)
-    agg_df = aggregate_market_view(df)
-    entries = estimate_entries(df)
+    with stage_timer(None, "fetch_data"):
+        df = fetch_data(ticker=ticker, exchanges=exchanges, lookback=lookback_hours)
 
-    recieved = get_summary_stats(df)
-    summary_stats = SummaryStats(
-        total_oi_usd=recieved.get("total_oi_usd"),
-        close=recieved.get("cur_price"),
-        funding_rate=recieved.get("funding_rate"),
-        high=recieved.get("high"),
-        low=recieved.get("low")
-    )
+    result = build_map_data(df)
+    record_map_result(result)
 
-    bins, raw_liqs = fetch_liquidation_levels(
-        entries,
-        "dynamic",
-        summary_stats.total_oi_usd,
-        summary_stats.close,
-        summary_stats.funding_rate,
-        agg_df
-    )
+    return result
 
-    bias, upward_mag, downward_mag = calculate_magnetism(
-        summary_stats.close, raw_liqs
-    )
-    
-    direction = Direction(bias=bias, upward_mag=upward_mag, downward_mag=downward_mag)
 
-    # RETURN a dictionary that defines your API structure
-    return {
-        "summary": summary_stats,
-        "direction": direction,
-        "bins": bins,           # DataFrame of binned/bucketed data
-        "raw_liqs": raw_liqs,   # DataFrame of individual liquidation points
-        "generated_at": pd.Timestamp.now()
-    }
+def build_map_data(df: pd.DataFrame):
+    """
+    CPU-bound half of calculate_map_data: everything after the exchange fetch.
+
+    Kept separate (and picklable in / out) so it can run in a worker process
+    while the network-bound fetch stays with the shared exchange clients.
+
+    Args:
+        df: Combined exchange frame from fetch_data
+
+    Stage timings are returned under 'timings' (metrics.record_map_result records them).
+    See pipeline.MapPipeline for the individual intermediates.
+    """
+    return MapPipeline(df).result()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,243 @@
+"""
+In-Process Metrics (Prometheus Text Format)
+
+A deliberately small registry: counters and fixed-bucket histograms keyed by label values,
+plus callback metrics read at scrape time. Recording is a lock and a bisect, so it stays
+on in production; /api/metrics renders everything with REGISTRY.render().
+
+Map computations can run in worker processes, whose registries are never scraped. Those
+stages are timed into a plain dict (stage_timer) that travels back with the result (or
+just its map_result_stats), and the API process records it with record_map_result() /
+record_map_stats().
+"""
+
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Default Buckets (Seconds): Sub-Millisecond Stages Up To Slow Exchange Fetches
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+COUNT_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+BYTE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic count per label set"""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram per label set (cumulative buckets rendered at scrape time)"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = TIME_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], list] = {}  # key -> [per-bucket counts (+Inf last), sum]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = [[0] * (len(self.buckets) + 1), 0.0]
+                self._values[key] = state
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the with-block (also when it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+
+        lines = self.header()
+        for key, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """Values read from a callback at scrape time: fn() -> {label values tuple: value}"""
+
+    def __init__(self, name: str, help: str, kind: str, fn: Callable[[], dict], labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self.kind = kind
+        self.fn = fn
+
+    def render(self) -> List[str]:
+        try:
+            values = self.fn()
+        except Exception:
+            return []
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            # Re-registering a name (e.g. module reload) keeps the first instance
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = TIME_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def callback(self, name: str, help: str, kind: str, fn: Callable[[], dict], labelnames: Sequence[str] = ()) -> CallbackMetric:
+        return self.register(CallbackMetric(name, help, kind, fn, labelnames))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# ========== PIPELINE METRICS ========== #
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "liqmap_stage_seconds", "Wall time of one map pipeline / update stage", ("stage",)
+)
+EXCHANGE_FETCH_SECONDS = REGISTRY.histogram(
+    "liqmap_exchange_fetch_seconds", "Wall time of one exchange fetch", ("exchange", "outcome")
+)
+MAP_POINTS = REGISTRY.histogram(
+    "liqmap_points", "Items produced per computed map", ("kind",), buckets=COUNT_BUCKETS
+)
+PAYLOAD_BYTES = REGISTRY.histogram(
+    "liqmap_payload_bytes", "Size of a published map body", ("format", "encoding"), buckets=BYTE_BUCKETS
+)
+MAP_CACHE_LOOKUPS = REGISTRY.counter(
+    "liqmap_map_cache_lookups_total", "Published map lookups by outcome (memory, unchanged, downloaded, missing, error)", ("blob", "result")
+)
+UPDATE_RUNS = REGISTRY.counter(
+    "liqmap_update_runs_total", "Scheduled update runs by outcome", ("outcome",)
+)
+
+
+@contextmanager
+def stage_timer(timings: Optional[dict], stage: str):
+    """
+    Time a with-block into timings[stage] (seconds), for stages that may run in a worker process.
+    With timings=None the block goes straight to STAGE_SECONDS.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if timings is None:
+            STAGE_SECONDS.observe(elapsed, stage=stage)
+        else:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def map_result_stats(result: dict) -> dict:
+    """The scalars record_map_stats needs from a build_map_data result (cheap to send between processes)"""
+    bins, raw_liqs = result.get("bins"), result.get("raw_liqs")
+    return {
+        "timings": dict(result.get("timings", {})),
+        "bin_count": None if bins is None else len(bins),
+        "raw_count": None if raw_liqs is None else len(raw_liqs),
+        "entry_count": result.get("entry_count"),
+    }
+
+
+def record_map_stats(stats: dict):
+    """Record a computed map's stage timings and point counts (map_result_stats output; API process)"""
+    for stage, seconds in stats["timings"].items():
+        STAGE_SECONDS.observe(seconds, stage=stage)
+
+    for kind, key in (("bins", "bin_count"), ("raw_points", "raw_count"), ("entries", "entry_count")):
+        if stats[key] is not None:
+            MAP_POINTS.observe(stats[key], kind=kind)
+
+
+def record_map_result(result: dict):
+    """Record a computed map's stage timings and point counts (call in the API process)"""
+    record_map_stats(map_result_stats(result))
+
+
+def record_payload_sizes(entry: dict):
+    """Record the body sizes of a published map entry (payloads.build_map_entry output)"""
+    for format, key in (("json", "payload"), ("binary", "binary")):
+        for encoding, body in entry.get(key, {}).items():
+            PAYLOAD_BYTES.observe(len(body), format=format, encoding=encoding)
@@ -77,3 +77,14 @@ class LiquidationMapResponse(BaseModel):
     timestamp: float
 
 
+
+class MagnetismCurveResponse(BaseModel):
+    """Magnetism at a grid of hypothetical prices (columnar: one list entry per price)"""
+    current_price: float
+    price: List[float]
+    upward_mag: List[float]
+    downward_mag: List[float]
+    bias: List[Bias]
+    long_usd_above: List[float]   # Active long USD priced at or above each price (swept by a fall to it)
+    short_usd_below: List[float]  # Active short USD priced at or below each price (swept by a rise to it)
+    timestamp: float              # Timestamp of the map the curve was computed from
@@ -0,0 +1,305 @@
+"""
+Pre-Encoded Response Bodies
+
+A published map is serialized once (JSON) and compressed once per supported
+Content-Encoding, so serving it is just picking the right byte string.
+
+Binary map format (format=binary), all little-endian:
+
+    offset 0   magic       4s   b'LQMP'
+    offset 4   version     u16  1
+    offset 6   reserved    u16  0
+    offset 8   n_points    u32
+    offset 12  meta_len    u32
+    offset 16  meta        UTF-8 JSON of the response without raw_liquidations,
+                           zero-padded to a multiple of 8 bytes
+    then       price       f8[n_points]
+               usd         f8[n_points]
+               entry_time  f8[n_points]  unix seconds, NaN if unknown
+               side        u1[n_points]  0 = LONG, 1 = SHORT
+               status      u1[n_points]  0 = ACTIVE, 1 = CLEARED, 2 = PARTIAL
+"""
+
+import gzip
+import json
+import time
+import struct
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from .models import LiquidationMapResponse, RawLiquidation, Side, Status
+
+# Optional: brotli variant only when the package is installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Mid Levels: Filtered / Custom Bodies Are Encoded Per Request, And On A Map Body
+# gzip 9 Saves ~3% Over 6 At ~2x The Time (Brotli 10-11 Costs Far More Still)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Preferred order when the client accepts several
+ENCODING_PREFERENCE = ('br', 'gzip')
+
+# Binary Map Format
+BINARY_MAGIC = b'LQMP'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sHHII')
+SIDE_CODES = [Side.LONG, Side.SHORT]
+STATUS_CODES = [Status.ACTIVE, Status.CLEARED, Status.PARTIAL]
+
+
+def build_map_response(result: dict) -> LiquidationMapResponse:
+    """Turn calculate_map_data() output into the API DTO"""
+
+    # Prepare bins for Pydantic serialization
+    bins_df = result['bins'].copy()
+    bins_df['bucket'] = bins_df['bucket'].astype(str)
+    
+    # Raw liquidations from the same typed columns the filtered / binary paths serve
+    # (already typed, so the models skip per-row validation)
+    raw_liqs_list = None
+    if 'raw_liqs' in result and not result['raw_liqs'].empty:
+        raw_liqs_list = [
+            RawLiquidation.model_construct(**record) for record in raw_records(raw_columns(result['raw_liqs']))
+        ]
+    
+    # Construct the DTO
+    return LiquidationMapResponse(
+        summary=result['summary'],
+        direction=result['direction'],
+        bins=bins_df.to_dict(orient='records'),
+        raw_liquidations=raw_liqs_list,
+        timestamp=time.time()
+    )
+
+
+def raw_columns(raw_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Raw liquidation points as typed column arrays, straight from the raw_liqs DataFrame.
+
+    Returns:
+        price/usd/entry_time as float64 (entry_time in unix seconds, NaN if missing),
+        side/status as uint8 codes (see SIDE_CODES / STATUS_CODES)
+    """
+    n = len(raw_df)
+    if n == 0:
+        return {
+            'price': np.empty(0), 'usd': np.empty(0), 'entry_time': np.empty(0),
+            'side': np.empty(0, dtype=np.uint8), 'status': np.empty(0, dtype=np.uint8),
+        }
+
+    if 'entry_start_time' in raw_df.columns:
+        stamps = pd.to_datetime(raw_df['entry_start_time']).to_numpy(dtype='datetime64[ns]')
+        entry_time = np.where(np.isnat(stamps), np.nan, (stamps.astype(np.int64) // 10**9).astype(float))
+    else:
+        entry_time = np.full(n, np.nan)
+
+    return {
+        'price': raw_df['price'].to_numpy(dtype=float),
+        'usd': raw_df['usd'].to_numpy(dtype=float),
+        'entry_time': entry_time,
+        'side': pd.Categorical(raw_df['side'], categories=SIDE_CODES).codes.astype(np.uint8),
+        'status': pd.Categorical(raw_df['status'], categories=STATUS_CODES).codes.astype(np.uint8),
+    }
+
+
+def _finite_or_none(values: np.ndarray) -> list:
+    # NaN / inf -> None (null), as pydantic serializes them
+    return np.where(np.isfinite(values), values, None).tolist()
+
+
+def raw_records(columns: Dict[str, np.ndarray]) -> List[dict]:
+    """
+    Raw point columns as RawLiquidation field dicts, JSON-safe (non-finite floats -> None).
+
+    Shared by build_map_response and render_filtered, so full and filtered responses
+    serialize every point identically.
+    """
+    return [
+        {'price': price, 'usd': usd, 'side': SIDE_CODES[side].value, 'status': STATUS_CODES[status], 'entry_time': entry_time}
+        for price, usd, side, status, entry_time in zip(
+            _finite_or_none(columns['price']), _finite_or_none(columns['usd']),
+            columns['side'].tolist(), columns['status'].tolist(), _finite_or_none(columns['entry_time'])
+        )
+    ]
+
+
+def raw_columns_from_models(raw_liquidations: Optional[List[RawLiquidation]]) -> Dict[str, np.ndarray]:
+    """Same columns as raw_columns, for a map that only exists as a parsed response"""
+    raw_liquidations = raw_liquidations or []
+    side_index = {side: code for code, side in enumerate(SIDE_CODES)}
+    status_index = {status: code for code, status in enumerate(STATUS_CODES)}
+
+    return {
+        'price': np.array([r.price for r in raw_liquidations], dtype=float),
+        'usd': np.array([r.usd for r in raw_liquidations], dtype=float),
+        'entry_time': np.array([np.nan if r.entry_time is None else r.entry_time for r in raw_liquidations], dtype=float),
+        'side': np.array([side_index[Side(r.side.upper())] for r in raw_liquidations], dtype=np.uint8),
+        'status': np.array([status_index[r.status] for r in raw_liquidations], dtype=np.uint8),
+    }
+
+
+def pack_map_binary(response: LiquidationMapResponse, columns: Dict[str, np.ndarray]) -> bytes:
+    """Pack a map into the binary format (see module docstring)"""
+    meta = response.model_dump_json(exclude={'raw_liquidations'}).encode('utf-8')
+    meta += b'\0' * (-len(meta) % 8)
+    n = len(columns['price'])
+
+    return b''.join([
+        BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, n, len(meta)),
+        meta,
+        columns['price'].astype('<f8').tobytes(),
+        columns['usd'].astype('<f8').tobytes(),
+        columns['entry_time'].astype('<f8').tobytes(),
+        columns['side'].astype(np.uint8).tobytes(),
+        columns['status'].astype(np.uint8).tobytes(),
+    ])
+
+
+def encode_payload(body: bytes) -> Dict[str, bytes]:
+    """
+    Compress a serialized body into every supported encoding.
+
+    Returns:
+        {'identity': body, 'gzip': ..., 'br': ...} ('br' only if brotli is installed)
+    """
+    payload = {
+        'identity': body,
+        'gzip': gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+    }
+    if brotli is not None:
+        payload['br'] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return payload
+
+
+def encode_response(response: LiquidationMapResponse) -> Dict[str, bytes]:
+    """Serialize a map response to JSON once and pre-compress it"""
+    return encode_payload(response.model_dump_json().encode('utf-8'))
+
+
+def build_map_entry(
+    response: LiquidationMapResponse,
+    raw_df: Optional[pd.DataFrame] = None,
+    json_body: Optional[bytes] = None,
+    pyramid=None
+) -> dict:
+    """
+    Everything needed to serve one published map without further per-request work.
+
+    Args:
+        response: The map DTO
+        raw_df: Optional raw_liqs DataFrame (columns are built from it directly when given)
+        json_body: Optional already-serialized JSON of response (e.g. the GCS blob bytes)
+        pyramid: Optional pyramid.BinPyramid for zoom queries
+
+    Returns:
+        {'response', 'payload': JSON variants, 'columns': raw point arrays, 'binary': binary format variants, 'pyramid'}
+    """
+    payload = encode_payload(json_body) if json_body is not None else encode_response(response)
+    columns = raw_columns(raw_df) if raw_df is not None else raw_columns_from_models(response.raw_liquidations)
+
+    return {
+        'response': response,
+        'payload': payload,
+        'columns': columns,
+        'binary': encode_payload(pack_map_binary(response, columns)),
+        'index': build_raw_index(columns),
+        'meta_json': response.model_dump_json(exclude={'raw_liquidations'}),
+        'pyramid': pyramid,
+    }
+
+
+def build_raw_index(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Raw point columns re-ordered by ascending price (stable), for searchsorted range queries"""
+    order = np.argsort(columns['price'], kind='stable')
+    return {name: values[order] for name, values in columns.items()}
+
+
+def filter_raw_columns(
+    index: Dict[str, np.ndarray],
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+    min_usd: Optional[float] = None,
+    side: Optional[Side] = None,
+    status: Optional[Status] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Raw points inside a price window (inclusive) matching the optional USD / side / status filters.
+
+    The price window is two binary searches on the price-sorted index; the remaining
+    filters are a mask over that slice only.
+    """
+    prices = index['price']
+    lo = 0 if price_min is None else int(np.searchsorted(prices, price_min, side='left'))
+    hi = len(prices) if price_max is None else int(np.searchsorted(prices, price_max, side='right'))
+    window = {name: values[lo:hi] for name, values in index.items()}
+
+    mask = np.ones(max(hi - lo, 0), dtype=bool)
+    if min_usd is not None:
+        mask &= window['usd'] >= min_usd
+    if side is not None:
+        mask &= window['side'] == SIDE_CODES.index(side)
+    if status is not None:
+        mask &= window['status'] == STATUS_CODES.index(status)
+
+    if mask.all():
+        return window
+    return {name: values[mask] for name, values in window.items()}
+
+
+def render_filtered(
+    entry: dict,
+    columns: Dict[str, np.ndarray],
+    format: str,
+    response: Optional[LiquidationMapResponse] = None
+) -> bytes:
+    """
+    Serialize a map entry with only the given raw points (JSON or binary format).
+    response replaces the entry's map (e.g. with zoomed bins); raw_liquidations still come from columns.
+    """
+    if format == 'binary':
+        return pack_map_binary(response or entry['response'], columns)
+
+    raw = raw_records(columns)
+
+    # Splice the raw list into the pre-serialized rest of the response
+    meta = entry['meta_json'] if response is None else response.model_dump_json(exclude={'raw_liquidations'})
+    return (meta[:-1] + ',"raw_liquidations":' + json.dumps(raw, separators=(',', ':'), allow_nan=False) + '}').encode('utf-8')
+
+
+def _accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    # 'gzip, br;q=0.9, *;q=0' -> {'gzip': 1.0, 'br': 0.9, '*': 0.0}
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        token, _, params = part.strip().partition(';')
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: Optional[str], payload: Dict[str, bytes]) -> Tuple[bytes, Optional[str]]:
+    """
+    Pick the best pre-encoded body for an Accept-Encoding header.
+
+    Returns:
+        (body, content_encoding) where content_encoding is None for the identity body
+    """
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get('*', 0.0)
+
+    for encoding in ENCODING_PREFERENCE:
+        if encoding in payload and accepted.get(encoding, wildcard) > 0:
+            return payload[encoding], encoding
+
+    return payload['identity'], None
@@ -0,0 +1,167 @@
+"""
+Memoized Map Pipeline
+
+One MapPipeline per combined exchange frame. Every intermediate is a cached property,
+computed on first access from the ones it depends on and then reused, so the aggregated
+view is built once (not once per consumer) and any stage can be inspected or cached.
+
+    combined frame ─> agg_df ─┬─> summary ─> leverage_samples ─┐
+                              ├─> entries ──────────────────────┴─> raw_points ─┬─> bins (sampled)
+                              └─> extremes ──────────────────────────────────────┴─> raw_liqs ─> direction
+
+With the analytic BINNING_ENGINE, bins come from summary + entries + extremes directly;
+pyramid (zoom bins) is built from the same inputs as bins.
+"""
+
+import pandas as pd
+import numpy as np
+from functools import cached_property
+from typing import List, Tuple
+from .config import NUM_BUCKETS, BINNING_ENGINE
+from .models import SummaryStats, Direction, Entry
+from .entries import aggregate_market_view, estimate_entries, get_summary_stats
+from .liquidation_price import (
+    sample_leverages,
+    build_liquidation_points,
+    build_extreme_index,
+    bin_liquidations,
+    bin_liquidation_density,
+    density_max_distance,
+    density_bucket_sums,
+    point_bucket_sums,
+    raw_point_status
+)
+from .pyramid import BinPyramid
+from .resolution import calculate_magnetism
+from .metrics import stage_timer
+
+# Leverage Profile Used For Published Maps
+LEVERAGE_PROFILE = "dynamic"
+
+
+class MapPipeline:
+    """
+    Lazily evaluated stages of one liquidation map.
+
+    Args:
+        df: Combined exchange frame from fetch_data
+
+    Stage wall times (seconds) accumulate in .timings as stages are first computed.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.timings = {}
+
+    @cached_property
+    def agg_df(self) -> pd.DataFrame:
+        """Per-timestamp market view across exchanges"""
+        with stage_timer(self.timings, "aggregate_market_view"):
+            return aggregate_market_view(self.df)
+
+    @cached_property
+    def summary(self) -> SummaryStats:
+        agg_df = self.agg_df
+        with stage_timer(self.timings, "summary_stats"):
+            recieved = get_summary_stats(self.df, agg_df=agg_df)
+        return SummaryStats(
+            total_oi_usd=recieved.get("total_oi_usd"),
+            close=recieved.get("cur_price"),
+            funding_rate=recieved.get("funding_rate"),
+            high=recieved.get("high"),
+            low=recieved.get("low")
+        )
+
+    @cached_property
+    def entries(self) -> List[Entry]:
+        agg_df = self.agg_df
+        with stage_timer(self.timings, "estimate_entries"):
+            return estimate_entries(self.df, agg_df=agg_df)
+
+    @cached_property
+    def leverage_samples(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(leverages, weights) for the current funding rate"""
+        summary = self.summary
+        with stage_timer(self.timings, "leverage_samples"):
+            return sample_leverages(profile=LEVERAGE_PROFILE, funding_rate=summary.funding_rate)
+
+    @cached_property
+    def raw_points(self) -> pd.DataFrame:
+        """Every entry x leverage liquidation point (price, usd, side, entry_start_time)"""
+        leverages, weights = self.leverage_samples
+        entries, summary = self.entries, self.summary
+        with stage_timer(self.timings, "raw_points"):
+            return build_liquidation_points(entries, leverages, weights, summary.total_oi_usd)
+
+    @cached_property
+    def extremes(self):
+        """Post-entry low / high index over agg_df (shared by bin and raw-point status)"""
+        agg_df = self.agg_df
+        with stage_timer(self.timings, "extreme_index"):
+            return build_extreme_index(agg_df)
+
+    @cached_property
+    def bins(self) -> pd.DataFrame:
+        """USD per price bucket (BINNING_ENGINE: integrated density, or the sampled raw points)"""
+        if BINNING_ENGINE == "sampled":
+            raw_points, extremes, summary = self.raw_points, self.extremes, self.summary
+            with stage_timer(self.timings, "bins"):
+                return bin_liquidations(raw_points, summary.close, self.agg_df, NUM_BUCKETS, extremes=extremes)
+
+        entries, extremes, summary = self.entries, self.extremes, self.summary
+        with stage_timer(self.timings, "bins"):
+            return bin_liquidation_density(
+                entries, LEVERAGE_PROFILE, summary.funding_rate, summary.total_oi_usd,
+                summary.close, self.agg_df, NUM_BUCKETS, extremes=extremes
+            )
+
+    @cached_property
+    def pyramid(self) -> BinPyramid:
+        """Multi-resolution bins for zoom queries, from the same engine as bins"""
+        entries, extremes, summary = self.entries, self.extremes, self.summary
+        if BINNING_ENGINE == "sampled":
+            raw_points = self.raw_points
+            with stage_timer(self.timings, "pyramid"):
+                max_distance = float(raw_points['price'].sub(summary.close).abs().max()) if len(raw_points) else 0.0
+                return BinPyramid.build(
+                    summary.close, max_distance, lambda edges: point_bucket_sums(raw_points, edges, extremes)
+                )
+
+        with stage_timer(self.timings, "pyramid"):
+            max_distance = density_max_distance(entries, LEVERAGE_PROFILE, summary.funding_rate, summary.close) if entries else 0.0
+            return BinPyramid.build(summary.close, max_distance, lambda edges: density_bucket_sums(
+                entries, LEVERAGE_PROFILE, summary.funding_rate, summary.total_oi_usd, edges, extremes
+            ))
+
+    @cached_property
+    def raw_liqs(self) -> pd.DataFrame:
+        """raw_points plus ACTIVE / CLEARED status (the points served as raw_liquidations)"""
+        raw_points, extremes = self.raw_points, self.extremes
+        with stage_timer(self.timings, "raw_status"):
+            raw_liqs = raw_points.copy()
+            raw_liqs['status'] = raw_point_status(raw_liqs, extremes)
+            return raw_liqs
+
+    @cached_property
+    def direction(self) -> Direction:
+        raw_liqs, summary = self.raw_liqs, self.summary
+        with stage_timer(self.timings, "magnetism"):
+            bias, upward_mag, downward_mag = calculate_magnetism(summary.close, raw_liqs)
+        return Direction(bias=bias, upward_mag=upward_mag, downward_mag=downward_mag)
+
+    def result(self) -> dict:
+        """The map as build_map_data returns it (computes whatever is still missing)"""
+        summary, entries = self.summary, self.entries
+        bins, raw_liqs, direction = self.bins, self.raw_liqs, self.direction
+        pyramid = self.pyramid
+
+        return {
+            "summary": summary,
+            "direction": direction,
+            "bins": bins,           # DataFrame of binned/bucketed data
+            "raw_liqs": raw_liqs,   # DataFrame of individual liquidation points
+            "pyramid": pyramid,     # BinPyramid for zoom queries
+            "generated_at": pd.Timestamp.now(),
+            "entry_count": len(entries),
+            "timings": dict(self.timings)
+        }
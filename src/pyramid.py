@@ -0,0 +1,167 @@
+"""
+Multi-Resolution Bin Pyramid
+
+Every computed map also carries USD / cleared USD / partial USD per bucket for several
+uniform grids: PYRAMID_LEVELS buckets over the map's full span (same span as the main
+bins, centered on current price) plus PYRAMID_FINE_GRIDS close to current price.
+
+A zoom query (bucket count + optional price window) is answered from the grid nearest the
+requested resolution by summing adjacent buckets: no recomputation, no raw points.
+Statuses of merged buckets come from their summed cleared / partial USD.
+
+Published maps persist their pyramid next to the JSON blob as an .npz sidecar
+(to_bytes / from_bytes), so instances that load a map from GCS answer zoom queries too.
+"""
+
+import io
+import math
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Tuple
+from .config import PYRAMID_LEVELS, PYRAMID_FINE_GRIDS
+from .liquidation_price import bucket_edges, bucket_dtype, binned_frame
+from .payloads import STATUS_CODES
+from .models import Status
+
+# bucket_sums(edges) -> (usd, cleared_usd, partial_usd) per bucket
+BucketSums = Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+
+class BinPyramid:
+    """
+    Per-bucket sums for a set of uniform grids.
+
+    Args:
+        current_price: Price the grids are centered on
+        grids: [{'edges', 'usd', 'cleared', 'partial'}, ...] (edges ascending, len(usd) + 1)
+    """
+
+    def __init__(self, current_price: float, grids: List[Dict[str, np.ndarray]]):
+        self.current_price = current_price
+        self.grids = grids
+
+    @classmethod
+    def build(
+        cls,
+        current_price: float,
+        max_distance: float,
+        bucket_sums: BucketSums,
+        levels: Optional[List[int]] = None,
+        fine_grids: Optional[List[Tuple[float, int]]] = None
+    ) -> 'BinPyramid':
+        """
+        Evaluate bucket_sums on every grid.
+
+        Args:
+            max_distance: Half-width of the full span (as used for the main bins)
+            bucket_sums: Binning engine over arbitrary edges (density or point sums)
+            levels: Bucket counts over the full span (defaults to PYRAMID_LEVELS)
+            fine_grids: (half-width fraction of price, buckets) pairs (defaults to PYRAMID_FINE_GRIDS)
+        """
+        levels = PYRAMID_LEVELS if levels is None else levels
+        fine_grids = PYRAMID_FINE_GRIDS if fine_grids is None else fine_grids
+
+        all_edges = [bucket_edges(current_price, max_distance, n) for n in levels]
+        all_edges += [
+            np.linspace(current_price * (1 - width), current_price * (1 + width), n + 1)
+            for width, n in fine_grids
+        ]
+
+        grids = []
+        for edges in all_edges:
+            usd, cleared, partial = bucket_sums(edges)
+            grids.append({'edges': edges, 'usd': usd, 'cleared': cleared, 'partial': partial})
+        return cls(current_price, grids)
+
+    @classmethod
+    def from_raw_columns(cls, columns: Dict[str, np.ndarray], current_price: float) -> 'BinPyramid':
+        """
+        Approximate pyramid from raw point columns (payloads.raw_columns), for a map published
+        without a sidecar. Statuses come from each point's own status instead of its bucket.
+        """
+        prices, usd = columns['price'], columns['usd']
+        cleared = usd * (columns['status'] == STATUS_CODES.index(Status.CLEARED))
+        partial = usd * (columns['status'] == STATUS_CODES.index(Status.PARTIAL))
+        max_distance = float(np.abs(prices - current_price).max()) if len(prices) else 0.0
+
+        def bucket_sums(edges: np.ndarray):
+            n = len(edges) - 1
+            codes = np.searchsorted(edges, prices, side='left') - 1
+            codes[prices == edges[0]] = 0
+            inside = (codes >= 0) & (codes < n)
+            return tuple(
+                np.bincount(codes[inside], weights=values[inside], minlength=n)
+                for values in (usd, cleared, partial)
+            )
+
+        return cls.build(current_price, max_distance, bucket_sums)
+
+    def query(self, buckets: int, price_min: Optional[float] = None, price_max: Optional[float] = None) -> pd.DataFrame:
+        """
+        Bins for a zoom window, from the grid nearest the requested resolution.
+
+        The window is clamped to the full span and answered from the coarsest grid with at
+        least `buckets` buckets inside it; if no grid has that many, the finest covering grid
+        is returned unmerged, with fewer than `buckets` bins. Otherwise its k buckets in the
+        window are summed in groups of k // buckets adjacent ones, giving between `buckets`
+        and 2 x `buckets` bins (the last may be narrower).
+
+        Returns:
+            Same columns as liquidation_price.bin_liquidations (empty if the window is empty)
+        """
+        span_low = min(grid['edges'][0] for grid in self.grids)
+        span_high = max(grid['edges'][-1] for grid in self.grids)
+        low = span_low if price_min is None else max(price_min, span_low)
+        high = span_high if price_max is None else min(price_max, span_high)
+        if not low < high:
+            return pd.DataFrame()
+
+        # Buckets Each Covering Grid Has Inside The Window
+        tolerance = (span_high - span_low) * 1e-9
+        candidates = []
+        for grid in self.grids:
+            edges = grid['edges']
+            if edges[0] > low + tolerance or edges[-1] < high - tolerance:
+                continue
+            step = (edges[-1] - edges[0]) / (len(edges) - 1)
+            first = max(0, math.floor((low - edges[0]) / step + 1e-9))
+            last = min(len(edges) - 1, math.ceil((high - edges[0]) / step - 1e-9))
+            candidates.append((last - first, first, last, grid))
+
+        enough = [c for c in candidates if c[0] >= buckets]
+        count, first, last, grid = min(enough, key=lambda c: c[0]) if enough else max(candidates, key=lambda c: c[0])
+
+        # Sum Every `group` Adjacent Buckets
+        group = max(1, count // buckets)
+        starts = np.arange(first, last, group)
+        edges = grid['edges'][np.append(starts, last)]
+        sums = [np.add.reduceat(grid[name][first:last], starts - first) for name in ('usd', 'cleared', 'partial')]
+
+        return binned_frame(bucket_dtype(edges), *sums)
+
+    def to_bytes(self, tag: float) -> bytes:
+        """npz sidecar; tag identifies the map it belongs to (the response timestamp)"""
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            tag=np.float64(tag),
+            current_price=np.float64(self.current_price),
+            counts=np.array([len(grid['usd']) for grid in self.grids], dtype=np.int64),
+            **{name: np.concatenate([grid[name] for grid in self.grids]) for name in ('edges', 'usd', 'cleared', 'partial')}
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Tuple['BinPyramid', float]:
+        """Inverse of to_bytes: (pyramid, tag)"""
+        with np.load(io.BytesIO(data)) as npz:
+            counts = npz['counts']
+            edge_splits = np.cumsum(counts + 1)[:-1]
+            bucket_splits = np.cumsum(counts)[:-1]
+
+            grids = [{'edges': edges} for edges in np.split(npz['edges'], edge_splits)]
+            for name in ('usd', 'cleared', 'partial'):
+                for grid, values in zip(grids, np.split(npz[name], bucket_splits)):
+                    grid[name] = values
+
+            return cls(float(npz['current_price']), grids), float(npz['tag'])
@@ -0,0 +1,249 @@
+"""
+Record & Replay For Exchange Responses
+
+EXCHANGE_REPLAY_MODE = "record": pooled clients are wrapped in RecordingExchange, which
+keeps every response fetch_single_exchange_data uses in memory and writes them to one
+gzip JSON archive per exchange under EXCHANGE_ARCHIVE_DIR once per fetch run
+(flush_recordings; responses that land after a run's flush go out with the next one,
+or at interpreter exit).
+
+EXCHANGE_REPLAY_MODE = "replay": pooled clients are ReplayExchange instances serving those
+archives back, with no network and identical results on every run.
+
+Archive layout ({EXCHANGE_ARCHIVE_DIR}/{exchange_id}.json.gz):
+
+    {
+        "exchange": "binance",
+        "recorded_at": 1760000000.0,
+        "has": {"fetchOpenInterestHistory": true},
+        "markets": ["BTC/USDT:USDT", ...],              # symbols only
+        "calls": {"fetch_ticker|BTC/USDT:USDT": {...},  # method|symbol -> response
+                  "fetch_ohlcv|BTC/USDT:USDT|1h": [...], ...}
+    }
+
+Kept compact: markets are stored as their symbol list (all resolve_symbol needs) and the
+raw 'info' payload is dropped from every response. Series calls (OHLCV, OI history) are
+keyed without since / limit; every recorded window is merged by timestamp and replay
+applies since / limit to the merged rows the way ccxt does.
+"""
+
+import os
+import gzip
+import json
+import time
+import atexit
+import threading
+import ccxt
+from typing import Any, Dict, List, Optional
+
+ARCHIVE_SUFFIX = '.json.gz'
+
+# Capabilities fetch_single_exchange_data checks on exchange.has
+RECORDED_CAPABILITIES = ('fetchOpenInterestHistory',)
+
+# Archives Being Recorded In This Process (Flushed Together By flush_recordings)
+_RECORDING: List['ExchangeArchive'] = []
+_RECORDING_LOCK = threading.Lock()
+
+
+def archive_path(directory: str, exchange_id: str) -> str:
+    return os.path.join(directory, f'{exchange_id}{ARCHIVE_SUFFIX}')
+
+
+def _strip_info(value: Any) -> Any:
+    # Drop ccxt's raw exchange payload (large, unused by the pipeline)
+    if isinstance(value, dict):
+        return {k: v for k, v in value.items() if k != 'info'}
+    if isinstance(value, list):
+        return [_strip_info(v) for v in value]
+    return value
+
+
+def _row_timestamp(row: Any) -> int:
+    return row[0] if isinstance(row, list) else row['timestamp']
+
+
+def _merge_series(existing: Optional[list], rows: list) -> list:
+    """Union of two timestamped series (newer response wins on duplicate timestamps)"""
+    merged = {_row_timestamp(row): row for row in (existing or [])}
+    merged.update((_row_timestamp(row), row) for row in rows)
+    return [merged[ts] for ts in sorted(merged)]
+
+
+def _window(rows: list, since: Optional[int], limit: Optional[int]) -> list:
+    """ccxt semantics: since -> rows from since onwards (first `limit`); no since -> last `limit`"""
+    if since is not None:
+        rows = [row for row in rows if _row_timestamp(row) >= since]
+        return rows[:limit] if limit else rows
+    return rows[-limit:] if limit else rows
+
+
+class ExchangeArchive:
+    """One exchange's recorded responses (thread-safe; buffered in memory until flush)"""
+
+    def __init__(self, path: str, data: Optional[dict] = None):
+        self.path = path
+        self.data = data or {'exchange': None, 'recorded_at': None, 'has': {}, 'markets': [], 'calls': {}}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._dirty = False
+
+    @classmethod
+    def open(cls, directory: str, exchange_id: str) -> 'ExchangeArchive':
+        """Load an exchange's archive (an empty one if nothing was recorded yet)"""
+        path = archive_path(directory, exchange_id)
+        if not os.path.exists(path):
+            return cls(path)
+        with gzip.open(path, 'rt', encoding='utf-8') as fh:
+            return cls(path, json.load(fh))
+
+    def get(self, key: str) -> Any:
+        return self.data['calls'].get(key)
+
+    def record(self, key: Optional[str] = None, value: Any = None, series: bool = False, **fields):
+        """Store a response under key (merging series rows) and/or top-level fields (in memory)"""
+        with self._lock:
+            self.data.update(fields)
+            if key is not None:
+                calls = self.data['calls']
+                calls[key] = _merge_series(calls.get(key), value) if series else value
+            self.data['recorded_at'] = time.time()
+            self._dirty = True
+
+    def flush(self):
+        """Write the archive atomically if anything was recorded since the last flush"""
+        with self._flush_lock:
+            # Snapshot Under The Lock (Recorded Values Are Replaced, Never Mutated), Encode Outside It
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = dict(self.data, calls=dict(self.data['calls']))
+                self._dirty = False
+
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = self.path + '.tmp'
+            with gzip.open(tmp, 'wt', encoding='utf-8') as fh:
+                json.dump(snapshot, fh, separators=(',', ':'))
+            os.replace(tmp, self.path)
+
+
+def flush_recordings():
+    """Write every archive recorded in this process (no-op outside record mode)"""
+    with _RECORDING_LOCK:
+        archives = list(_RECORDING)
+    for archive in archives:
+        archive.flush()
+
+
+atexit.register(flush_recordings)
+
+
+class RecordingExchange:
+    """
+    Wraps a live ccxt client: every call the fetch layer makes goes to the exchange as
+    usual and its response is added to the archive. Anything else is passed through.
+    """
+
+    def __init__(self, exchange: ccxt.Exchange, archive: ExchangeArchive):
+        self._exchange = exchange
+        self._archive = archive
+        with _RECORDING_LOCK:
+            _RECORDING.append(archive)
+        self._archive.record(
+            exchange=exchange.id,
+            has={name: bool(exchange.has.get(name)) for name in RECORDED_CAPABILITIES}
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._exchange, name)
+
+    def load_markets(self, reload: bool = False) -> dict:
+        markets = self._exchange.load_markets(reload=reload)
+        self._archive.record(markets=sorted(markets))
+        return markets
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since: Optional[int] = None, limit: Optional[int] = None) -> list:
+        rows = self._exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=since, limit=limit)
+        self._archive.record(f'fetch_ohlcv|{symbol}|{timeframe}', rows, series=True)
+        return rows
+
+    def fetch_open_interest_history(self, symbol: str, timeframe: str = '1h', since: Optional[int] = None, limit: Optional[int] = None) -> list:
+        rows = self._exchange.fetch_open_interest_history(symbol, timeframe=timeframe, since=since, limit=limit)
+        self._archive.record(f'fetch_open_interest_history|{symbol}|{timeframe}', _strip_info(rows), series=True)
+        return rows
+
+    def fetch_funding_rate(self, symbol: str) -> dict:
+        response = self._exchange.fetch_funding_rate(symbol)
+        self._archive.record(f'fetch_funding_rate|{symbol}', _strip_info(response))
+        return response
+
+    def fetch_open_interest(self, symbol: str) -> dict:
+        response = self._exchange.fetch_open_interest(symbol)
+        self._archive.record(f'fetch_open_interest|{symbol}', _strip_info(response))
+        return response
+
+    def fetch_ticker(self, symbol: str) -> dict:
+        response = self._exchange.fetch_ticker(symbol)
+        self._archive.record(f'fetch_ticker|{symbol}', _strip_info(response))
+        return response
+
+
+class ReplayExchange:
+    """
+    Serves an archive back with the ccxt call signatures the fetch layer uses.
+    Calls that were never recorded raise ccxt.ExchangeError, like a failed request.
+    """
+
+    def __init__(self, exchange_id: str, archive: ExchangeArchive):
+        self.id = exchange_id
+        self._archive = archive
+        self.has = dict(archive.data.get('has') or {})
+        self.markets: Dict[str, dict] = {}
+
+    @classmethod
+    def open(cls, directory: str, exchange_id: str) -> 'ReplayExchange':
+        return cls(exchange_id, ExchangeArchive.open(directory, exchange_id))
+
+    def _recorded(self, key: str) -> Any:
+        value = self._archive.get(key)
+        if value is None:
+            raise ccxt.ExchangeError(f"{self.id}: no recorded response for {key}")
+        return value
+
+    def load_markets(self, reload: bool = False) -> dict:
+        symbols: List[str] = self._archive.data.get('markets') or []
+        if not symbols:
+            raise ccxt.ExchangeError(f"{self.id}: no recorded markets in {self._archive.path}")
+        self.markets = {symbol: {'symbol': symbol} for symbol in symbols}
+        return self.markets
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since: Optional[int] = None, limit: Optional[int] = None) -> list:
+        return _window(self._recorded(f'fetch_ohlcv|{symbol}|{timeframe}'), since, limit)
+
+    def fetch_open_interest_history(self, symbol: str, timeframe: str = '1h', since: Optional[int] = None, limit: Optional[int] = None) -> list:
+        return _window(self._recorded(f'fetch_open_interest_history|{symbol}|{timeframe}'), since, limit)
+
+    def fetch_funding_rate(self, symbol: str) -> dict:
+        return self._recorded(f'fetch_funding_rate|{symbol}')
+
+    def fetch_open_interest(self, symbol: str) -> dict:
+        return self._recorded(f'fetch_open_interest|{symbol}')
+
+    def fetch_ticker(self, symbol: str) -> dict:
+        return self._recorded(f'fetch_ticker|{symbol}')
+
+
+def build_client(exchange_id: str, mode: str, directory: str) -> Any:
+    """
+    Pooled client for an exchange ID under a replay mode.
+
+    Raises:
+        AttributeError: Unknown exchange ID (record / live modes)
+    """
+    if mode == 'replay':
+        return ReplayExchange.open(directory, exchange_id)
+
+    client = getattr(ccxt, exchange_id)()
+    if mode == 'record':
+        return RecordingExchange(client, ExchangeArchive.open(directory, exchange_id))
+    return client
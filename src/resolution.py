@@ -1,8 +1,15 @@
+import math
 import pandas as pd
 import numpy as np
 from .models import Side, Status, Bias, Direction
 from .config import DISTANCE_DECAY_FACTOR
 
+# Magnetism Curve: Blocks At Least FAR_RATIO Half-Widths Away Use A Series Of EXPANSION_TERMS
+# Terms (Truncation Error ~ (k+1) / FAR_RATIO^k, Below 1e-6 Of Their Pull); Nearer Blocks Are Exact
+CURVE_FAR_RATIO = 3.0
+CURVE_EXPANSION_TERMS = 16
+CURVE_NEAR_CHUNK = 1 << 18
+
 def calculate_magnetism(current_price: float, raw_liqs: pd.DataFrame):
     # Clean and Split Liquidations
     short_liqs, long_liqs = clean_liquidations(raw_liqs)
@@ -20,6 +27,14 @@ def calculate_magnetism(current_price: float, raw_liqs: pd.DataFrame):
     if total_mag == 0:
         return Bias.UNBIASED, 0.0, 0.0
 
+    return magnetism_bias(upward_mag, downward_mag), upward_mag, downward_mag
+
+
+def magnetism_bias(upward_mag: float, downward_mag: float) -> Bias:
+    total_mag = upward_mag + downward_mag
+    if total_mag == 0:
+        return Bias.UNBIASED
+
     net_mag = abs(upward_mag - downward_mag)
 
     bias = Bias.UNBIASED
@@ -31,7 +46,7 @@ def calculate_magnetism(current_price: float, raw_liqs: pd.DataFrame):
         else:
             bias = Bias.DOWN
 
-    return bias, upward_mag, downward_mag
+    return bias
 
 
 def calculate_directional_pull(current_price: float, df: pd.DataFrame) -> float:
@@ -62,4 +77,106 @@ def clean_liquidations(binned: pd.DataFrame):
     short_pos_liqs = live[live['side'] == Side.SHORT]
 
     # Return: (Shorts/Upside source, Longs/Downside source)
-    return short_pos_liqs, long_pos_liqs
\ No newline at end of file
+    return short_pos_liqs, long_pos_liqs
+
+
+def magnetism_curve(prices: np.ndarray, usd: np.ndarray, is_short: np.ndarray, grid: np.ndarray) -> dict:
+    """
+    calculate_magnetism at every grid price, in one vectorized pass.
+
+    Points are cut into contiguous blocks of the price-sorted input. Each block's USD moments
+    around its center give its pull on any price far from it as a short series (binomial
+    expansion of the distance kernel), so the cost per grid price scales with the number of
+    blocks, not points; only blocks close to a grid price are summed point by point.
+
+    Args:
+        prices: ACTIVE liquidation prices, ascending
+        usd: USD per point
+        is_short: True for shorts (pull up), False for longs (pull down)
+        grid: Hypothetical prices to evaluate
+
+    Returns:
+        price, upward_mag, downward_mag, bias (Bias per price), plus cumulative USD:
+        long_usd_above (longs priced at or above each price, swept by a fall to it) and
+        short_usd_below (shorts priced at or below it, swept by a rise to it)
+    """
+    grid = np.asarray(grid, dtype=float)
+    prices = np.asarray(prices, dtype=float)
+    is_short = np.asarray(is_short, dtype=bool)
+    weights = np.stack([np.where(is_short, usd, 0.0), np.where(is_short, 0.0, usd)], axis=1)
+
+    pull = _block_pull(prices, weights, grid) if len(prices) else np.zeros((len(grid), 2))
+    upward, downward = pull[:, 0], pull[:, 1]
+
+    # Prefix Sums Over The Sorted Points
+    long_cumulative = np.concatenate([[0.0], np.cumsum(weights[:, 1])])
+    short_cumulative = np.concatenate([[0.0], np.cumsum(weights[:, 0])])
+    long_usd_above = long_cumulative[-1] - long_cumulative[np.searchsorted(prices, grid, side='left')]
+    short_usd_below = short_cumulative[np.searchsorted(prices, grid, side='right')]
+
+    return {
+        'price': grid,
+        'upward_mag': upward,
+        'downward_mag': downward,
+        'bias': [magnetism_bias(up, down) for up, down in zip(upward.tolist(), downward.tolist())],
+        'long_usd_above': long_usd_above,
+        'short_usd_below': short_usd_below,
+    }
+
+
+def _block_pull(prices: np.ndarray, weights: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """Sum of weights / distance^DISTANCE_DECAY_FACTOR per grid price (columns of weights kept apart)"""
+    alpha = DISTANCE_DECAY_FACTOR
+    terms = CURVE_EXPANSION_TERMS
+
+    # Block Size Balancing Series Work (Blocks x Terms) Against Exact Near-Block Work
+    n = len(prices)
+    size = max(8, int(math.sqrt(n * terms / 3)))
+    pad = -n % size
+    block_prices = np.concatenate([prices, np.full(pad, prices[-1])]).reshape(-1, size)
+    block_weights = np.concatenate([weights, np.zeros((pad, 2))]).reshape(-1, size, 2)
+
+    center = (block_prices[:, 0] + block_prices[:, -1]) / 2
+    half = (block_prices[:, -1] - block_prices[:, 0]) / 2
+    scale = np.where(half > 0, half, 1.0)
+
+    # Moments Of Each Block's Offsets (Scaled To [-1, 1]): M_k = sum(w * u^k), Shape (Blocks, Terms, 2)
+    offsets = (block_prices - center[:, None]) / scale[:, None]
+    power = np.ones_like(offsets)
+    moments = np.empty((len(center), terms, 2))
+    for k in range(terms):
+        moments[:, k, :] = np.matmul(power[:, None, :], block_weights)[:, 0, :]
+        power *= offsets
+
+    # (x - p)^-a = |x - c|^-a * sum_k C(a + k - 1, k) (u s / (x - c))^k
+    coefficients = np.ones(terms)
+    for k in range(1, terms):
+        coefficients[k] = coefficients[k - 1] * (alpha + k - 1) / k
+
+    distance = grid[:, None] - center[None, :]
+    far = np.abs(distance) >= CURVE_FAR_RATIO * half[None, :]
+    far &= distance != 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(far, scale[None, :] / distance, 0.0)
+        term = far / np.where(far, np.abs(distance), 1.0) ** alpha
+
+    # Series Term By Term: term_k = falloff * ratio^k, Summed Against Each Block's Moment
+    pull = term @ moments[:, 0, :]
+    for k in range(1, terms):
+        term *= ratio
+        pull += coefficients[k] * (term @ moments[:, k, :])
+
+    # Near Blocks: Exact, Point By Point (Same 0 -> 0.01 Distance Rule As calculate_directional_pull),
+    # A Block's Grid Rows Taken In Slices So No Slice Holds More Than About CURVE_NEAR_CHUNK Distances
+    near = ~far
+    step = max(1, CURVE_NEAR_CHUNK // size)
+    for block in np.flatnonzero(near.any(axis=0)):
+        block_rows = np.flatnonzero(near[:, block])
+        for start in range(0, len(block_rows), step):
+            rows = block_rows[start:start + step]
+            distances = np.abs(grid[rows, None] - block_prices[block][None, :])
+            distances[distances == 0] = 0.01
+            pull[rows] += (1.0 / distances ** alpha) @ block_weights[block]
+
+    return pull
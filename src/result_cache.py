@@ -0,0 +1,108 @@
+"""
+Keyed TTL Cache With Single-Flight
+
+Concurrent misses on the same key share one computation: the first caller computes,
+everyone else waits on its future. Failures are handed to the waiters but never cached.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlightCache:
+    """TTL cache of computed results, with hit/miss statistics"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    def peek(self, key: Hashable) -> Any:
+        """Fresh cached value for key (counted as a hit), or None without computing anything"""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return cached[1]
+            return None
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing it (once, across threads) if missing or expired.
+
+        Raises:
+            Whatever compute raised, for the caller that ran it and every caller waiting on it
+        """
+        with self._lock:
+            now = time.monotonic()
+            cached = self._entries.get(key)
+
+            # Hit: Still Fresh
+            if cached is not None and cached[0] > now:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return cached[1]
+
+            # Same Key Already Being Computed: Wait On It
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                owner = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                self._stats["misses"] += 1
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                self._stats["errors"] += 1
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            del self._inflight[key]
+            self._evict()
+
+        future.set_result(value)
+        return value
+
+    def _evict(self):
+        # Expired First, Then Least Recently Used
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Counters plus current size and hit ratio (coalesced waits count as hits)"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["inflight"] = len(self._inflight)
+
+        lookups = stats["hits"] + stats["coalesced"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["hits"] + stats["coalesced"]) / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,46 @@
+"""
+Shared Fixtures: One Seeded Synthetic Market (benchmarks.fixtures) For Every Module
+
+The combined frame is fetched once per session through the real fetch layer, with the
+client pool, shared market frames and the candle store out of the way, and a MapPipeline
+over it supplies entries, extremes and raw points to the stage tests.
+"""
+
+import pytest
+import pandas as pd
+
+from benchmarks.fixtures import make_exchanges
+from src import exchange_data
+from src.exchange_data import fetch_data, reset_exchange_pool
+from src.pipeline import MapPipeline
+
+EXCHANGES = 4
+CANDLES = 24 * 30
+LOOKBACK = 24 * 14
+
+
+@pytest.fixture(scope="session")
+def market_frame() -> pd.DataFrame:
+    """Combined exchange frame of four synthetic venues over a 14 day lookback"""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(exchange_data, "MARKET_CACHE_ENABLED", False)
+        patch.setattr("src.config.CANDLE_STORE_DIR", "")
+        reset_exchange_pool()
+        try:
+            return fetch_data(exchanges=make_exchanges(EXCHANGES, CANDLES, seed=0), lookback=LOOKBACK)
+        finally:
+            reset_exchange_pool()
+
+
+@pytest.fixture(scope="session")
+def pipeline(market_frame: pd.DataFrame) -> MapPipeline:
+    """Fully computed pipeline over market_frame (treat as read-only)"""
+    pipeline = MapPipeline(market_frame)
+    pipeline.result()
+    return pipeline
+
+
+@pytest.fixture(autouse=True)
+def no_candle_store(monkeypatch):
+    """Keep the on-disk candle store off unless a test points it somewhere"""
+    monkeypatch.setattr("src.config.CANDLE_STORE_DIR", "")
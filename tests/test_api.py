@@ -0,0 +1,322 @@
+"""
+Endpoint Tests Against An In-Memory GCS Bucket
+
+src.api builds its storage client at import, so the module is imported with
+google.cloud.storage.Client swapped for FakeStorageClient; each test then gets a fresh
+bucket and empty in-process caches.
+"""
+
+import copy
+import json
+import time
+import importlib
+import threading
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from google.cloud import storage
+
+from benchmarks.fixtures import SyntheticExchange
+from src import compute, exchange_data
+from src.compute import pending_computations, shutdown_compute_pool
+from src.payloads import build_map_entry, build_map_response
+
+CUSTOM = "/api/liquidation-map/custom"
+
+
+class FakeBlob:
+    def __init__(self, bucket: 'FakeBucket', name: str):
+        self.bucket = bucket
+        self.name = name
+        self.generation = None
+        self.data = None
+
+    def upload_from_string(self, data, content_type=None):
+        self.data = data if isinstance(data, bytes) else data.encode('utf-8')
+        self.generation = self.bucket.next_generation()
+        self.bucket.blobs[self.name] = self
+
+    def download_as_bytes(self, if_generation_match=None):
+        self.bucket.downloads.append(self.name)
+        return self.data
+
+
+class FakeBucket:
+    """Blobs by name; get_blob returns a metadata snapshot and can be held on a gate (threading.Event)"""
+
+    def __init__(self):
+        self.blobs = {}
+        self.gates = {}
+        self.lookups = []
+        self.downloads = []
+        self._generation = 0
+
+    def next_generation(self) -> int:
+        self._generation += 1
+        return self._generation
+
+    def blob(self, name: str) -> FakeBlob:
+        return self.blobs.get(name) or FakeBlob(self, name)
+
+    def get_blob(self, name: str):
+        self.lookups.append(name)
+        blob = copy.copy(self.blobs.get(name))
+        if name in self.gates:
+            self.gates[name].wait(5)
+        return blob
+
+
+class FakeStorageClient:
+    def __init__(self, *args, **kwargs):
+        self._bucket = FakeBucket()
+
+    def bucket(self, name: str) -> FakeBucket:
+        return self._bucket
+
+
+@pytest.fixture(scope="module")
+def api():
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(storage, "Client", FakeStorageClient)
+        return importlib.import_module("src.api")
+
+
+@pytest.fixture
+def bucket(api, monkeypatch) -> FakeBucket:
+    client = FakeStorageClient()
+    monkeypatch.setattr(api, "STORAGE_CLIENT", client)
+    monkeypatch.setattr(api, "MAP_CACHE", {})
+    monkeypatch.setattr(api, "MAP_REVALIDATE_LOCKS", {})
+    api.CUSTOM_MAP_CACHE.clear()
+    return client.bucket(api.BUCKET_NAME)
+
+
+@pytest.fixture
+def client(api, bucket) -> TestClient:
+    return TestClient(api.app)
+
+
+@pytest.fixture(scope="module")
+def make_entry(pipeline):
+    """New map version (fresh timestamp) of the shared market, as the update publishes it"""
+    result = pipeline.result()
+
+    def make() -> dict:
+        return build_map_entry(build_map_response(result), raw_df=result['raw_liqs'], pyramid=result['pyramid'])
+    return make
+
+
+@pytest.fixture(scope="module")
+def entry(make_entry) -> dict:
+    return make_entry()
+
+
+@pytest.fixture
+def venues():
+    """Synthetic clients pooled under real exchange IDs (custom maps fetch through the client pool)"""
+    exchange_data.reset_exchange_pool()
+    venues = {exchange_id: SyntheticExchange(exchange_id, 24 * 40, seed=seed) for seed, exchange_id in enumerate(('binance', 'bybit'))}
+    exchange_data._CLIENT_POOL.update(venues)
+    yield venues
+    exchange_data.reset_exchange_pool()
+
+
+def _upload_elsewhere(bucket: FakeBucket, name: str, entry: dict):
+    # Another instance publishing: only the blob changes, not this process' memory
+    bucket.blob(name).upload_from_string(entry["payload"]["identity"])
+
+
+def test_map_is_503_until_published(api, client):
+    response = client.get("/api/liquidation-map")
+    assert response.status_code == 503
+    assert response.json()["detail"]["error"].startswith("Data is warming up")
+
+
+def test_map_is_served_from_memory_between_revalidations(api, bucket, client, make_entry, monkeypatch):
+    first, second = make_entry(), make_entry()
+    _upload_elsewhere(bucket, api.CACHE_BLOB_NAME, first)
+
+    assert client.get("/api/liquidation-map").json()["timestamp"] == first["response"].timestamp
+    assert client.get("/api/liquidation-map").json()["timestamp"] == first["response"].timestamp
+    assert (bucket.lookups.count(api.CACHE_BLOB_NAME), len(bucket.downloads)) == (1, 1)
+
+    # Due For Revalidation: Same Generation Is Not Downloaded Again, A New One Is
+    monkeypatch.setattr(api, "MAP_REVALIDATE_SECONDS", 0)
+    client.get("/api/liquidation-map")
+    assert (bucket.lookups.count(api.CACHE_BLOB_NAME), len(bucket.downloads)) == (2, 1)
+
+    _upload_elsewhere(bucket, api.CACHE_BLOB_NAME, second)
+    assert client.get("/api/liquidation-map").json()["timestamp"] == second["response"].timestamp
+    assert len(bucket.downloads) == 2
+
+
+def test_own_publish_is_not_downloaded_again(api, bucket, entry, monkeypatch):
+    assert api.save_to_gcs(entry["response"], entry, blob_name="maps/BTC_24h.json")
+
+    monkeypatch.setattr(api, "MAP_REVALIDATE_SECONDS", 0)
+    cached = api.get_cached_entry("maps/BTC_24h.json")
+    assert cached["response"] is entry["response"]
+    assert bucket.downloads == []
+
+
+def test_slow_blob_does_not_block_other_blobs(api, bucket, entry):
+    _upload_elsewhere(bucket, "maps/SLOW_24h.json", entry)
+    bucket.gates["maps/SLOW_24h.json"] = gate = threading.Event()
+    slow = threading.Thread(target=api.get_cached_entry, args=("maps/SLOW_24h.json",))
+    slow.start()
+    while "maps/SLOW_24h.json" not in bucket.lookups:
+        time.sleep(0.001)
+
+    # While One Blob's Revalidation Hangs In GCS, Others Publish And Revalidate Freely
+    done = threading.Event()
+
+    def others():
+        api.set_cached_map(entry, 7, "maps/ETH_24h.json")
+        _upload_elsewhere(bucket, "maps/SOL_24h.json", entry)
+        api.get_cached_entry("maps/SOL_24h.json")
+        done.set()
+
+    threading.Thread(target=others).start()
+    assert done.wait(2)
+    gate.set()
+    slow.join(5)
+
+    assert api.peek_cached_entry("maps/SLOW_24h.json")[1] is not None
+
+
+def test_concurrent_revalidations_of_one_blob_download_once(api, bucket, entry):
+    _upload_elsewhere(bucket, "maps/BTC_24h.json", entry)
+    bucket.gates["maps/BTC_24h.json"] = gate = threading.Event()
+    threads = [threading.Thread(target=api.get_cached_entry, args=("maps/BTC_24h.json",)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert bucket.downloads == ["maps/BTC_24h.json"]
+
+
+def test_publish_during_revalidation_is_kept(api, bucket, make_entry):
+    older, newer = make_entry(), make_entry()
+    _upload_elsewhere(bucket, "maps/BTC_24h.json", older)
+    bucket.gates["maps/BTC_24h.json"] = gate = threading.Event()
+    revalidation = threading.Thread(target=api.get_cached_entry, args=("maps/BTC_24h.json",))
+    revalidation.start()
+    while "maps/BTC_24h.json" not in bucket.lookups:
+        time.sleep(0.001)
+
+    # The Update Publishes A Newer Generation While The Older One Is Being Downloaded
+    api.save_to_gcs(newer["response"], newer, blob_name="maps/BTC_24h.json")
+    gate.set()
+    revalidation.join(5)
+
+    assert api.peek_cached_entry("maps/BTC_24h.json")[1]["response"] is newer["response"]
+
+
+@pytest.mark.parametrize("accept, encoding", [("gzip", "gzip"), ("identity", None)])
+def test_map_body_is_served_pre_encoded(api, bucket, client, entry, accept, encoding):
+    api.set_cached_map(entry, 1)
+
+    response = client.get("/api/liquidation-map", headers={"Accept-Encoding": accept})
+    assert response.status_code == 200
+    assert response.headers.get("content-encoding") == encoding
+    assert response.content == entry["payload"]["identity"]
+
+
+def test_binary_format_serves_the_packed_body(api, bucket, client, entry):
+    api.set_cached_map(entry, 1)
+
+    response = client.get("/api/liquidation-map", params={"format": "binary"}, headers={"Accept-Encoding": "identity"})
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert response.content == entry["binary"]["identity"]
+    assert client.get("/api/liquidation-map", params={"format": "csv"}).status_code == 422
+
+
+def test_filter_params_narrow_raw_liquidations(api, bucket, client, entry):
+    api.set_cached_map(entry, 1)
+    price_min = float(np.median(entry["columns"]["price"]))
+
+    body = client.get("/api/liquidation-map", params={"price_min": price_min, "side": "SHORT", "status": "ACTIVE"}).json()
+    raw = body["raw_liquidations"]
+    prices = [point["price"] for point in raw]
+
+    assert raw and all(point["side"] == "SHORT" and point["status"] == "ACTIVE" for point in raw)
+    assert min(prices) >= price_min and prices == sorted(prices)
+    assert body["bins"] == json.loads(entry["payload"]["identity"])["bins"]
+    assert client.get("/api/liquidation-map", params={"side": "SIDEWAYS"}).status_code == 422
+
+
+def test_custom_map_without_valid_exchanges_is_400(api, bucket, client):
+    response = client.get(CUSTOM, params={"exchanges": "nope,notreal"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "No valid exchanges provided"
+
+
+def test_custom_map_is_429_when_compute_tier_is_full(api, bucket, client, monkeypatch):
+    monkeypatch.setattr(compute, "COMPUTE_MAX_PENDING", 0)
+
+    response = client.get(CUSTOM, params={"ticker": "BTC", "exchanges": "binance"})
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "5"
+
+
+def test_filtered_custom_renders_run_off_the_event_loop(api, bucket, client, entry, monkeypatch):
+    api.set_cached_map(entry, 1, api.map_blob_name("BTC", api.get_lookback_hours(14)))
+    threads = []
+    serve = api.serve_map_entry
+
+    def recording(*args):
+        threads.append(threading.current_thread().name)
+        return serve(*args)
+
+    monkeypatch.setattr(api, "serve_map_entry", recording)
+    assert client.get(CUSTOM, params={"ticker": "BTC", "lookback_days": 14, "min_usd": 1}).status_code == 200
+    assert client.get(CUSTOM, params={"ticker": "BTC", "lookback_days": 14}).status_code == 200
+
+    # Filtered bodies are rendered on the compute waiter threads; the pre-encoded one is returned in place
+    assert threads[0].startswith("compute-wait")
+    assert not threads[1].startswith("compute-wait")
+
+
+def test_custom_map_is_computed_once_then_served_from_cache(api, bucket, client, venues):
+    try:
+        first = client.get(CUSTOM, params={"ticker": "BTC", "lookback_days": 2, "exchanges": "bybit,binance"})
+        calls = {exchange_id: venue.calls for exchange_id, venue in venues.items()}
+        # Same exchange set in another order (same cache key), filtered from the cached entry
+        second = client.get(CUSTOM, params={"ticker": "BTC", "lookback_days": 2, "exchanges": "binance,bybit", "side": "LONG"})
+    finally:
+        shutdown_compute_pool()
+
+    assert first.status_code == 200 and second.status_code == 200
+    assert first.json()["raw_liquidations"]
+    assert {point["side"] for point in second.json()["raw_liquidations"]} == {"LONG"}
+    assert {exchange_id: venue.calls for exchange_id, venue in venues.items()} == calls
+    assert all(calls.values()) and pending_computations() == 0
+
+
+def test_metrics_endpoint_renders_the_registry(api, bucket, client, entry):
+    _upload_elsewhere(bucket, api.CACHE_BLOB_NAME, entry)
+    client.get("/api/liquidation-map")
+
+    response = client.get("/api/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    assert f'liqmap_map_cache_lookups_total{{blob="{api.CACHE_BLOB_NAME}",result="downloaded"}}' in response.text
+    assert "# TYPE liqmap_stage_seconds histogram" in response.text
+
+
+def test_buckets_param_recuts_bins_from_the_pyramid(api, bucket, client, entry):
+    api.set_cached_map(entry, 1)
+    close = entry["response"].summary.close
+    window = {"price_min": close * 0.97, "price_max": close * 1.03}
+
+    body = client.get("/api/liquidation-map", params=dict(window, buckets=50)).json()
+    expected = entry["pyramid"].query(50, window["price_min"], window["price_max"])
+
+    assert len(body["bins"]) == len(expected) >= 50
+    assert [b["usd"] for b in body["bins"]] == pytest.approx(expected["usd"].tolist())
+    assert all(window["price_min"] <= point["price"] <= window["price_max"] for point in body["raw_liquidations"])
+    assert body["summary"] == json.loads(entry["payload"]["identity"])["summary"]
+
+    too_fine = client.get("/api/liquidation-map", params={"buckets": api.PYRAMID_MAX_BUCKETS + 1})
+    assert too_fine.status_code == 422
@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+from src.broadcast import HEARTBEAT, MapBroadcast, map_diff
+
+
+def _meta(timestamp: float, close: float, bins: dict) -> dict:
+    return {
+        "summary": {"total_oi_usd": 1e9, "close": close, "funding_rate": 0.0001, "high": 70000.0, "low": 50000.0},
+        "direction": {"bias": "UP", "upward_mag": 1.0, "downward_mag": 0.5},
+        "bins": [{"bucket": bucket, "usd": usd, "status": "ACTIVE"} for bucket, usd in bins.items()],
+        "timestamp": timestamp,
+    }
+
+
+def test_map_diff_same_buckets_lists_changed_bins_only():
+    previous = _meta(1.0, 60000.0, {"(1, 2]": 10.0, "(2, 3]": 20.0})
+    current = _meta(2.0, 60100.0, {"(1, 2]": 10.0, "(2, 3]": 25.0})
+
+    assert map_diff(previous, current, "1.000000") == {
+        "base": "1.000000",
+        "timestamp": 2.0,
+        "summary": {"close": 60100.0},
+        "bins_changed": [{"bucket": "(2, 3]", "usd": 25.0, "status": "ACTIVE"}],
+    }
+
+
+def test_map_diff_moved_edges_send_every_bin():
+    previous = _meta(1.0, 60000.0, {"(1, 2]": 10.0})
+    current = _meta(2.0, 60000.0, {"(1, 3]": 10.0})
+
+    diff = map_diff(previous, current, "1.000000")
+    assert "summary" not in diff and "direction" not in diff
+    assert diff["bins"] == current["bins"]
+
+
+def test_subscribers_get_snapshot_then_diff():
+    first = _meta(1.0, 60000.0, {"(1, 2]": 10.0})
+    second = _meta(2.0, 60000.0, {"(1, 2]": 12.0})
+
+    async def scenario():
+        broadcast = MapBroadcast()
+        broadcast.bind(asyncio.get_running_loop())
+        broadcast._publish("map", "1.000000", json.dumps(first))
+
+        stream = broadcast.subscribe("map")
+        snapshot = await stream.__anext__()
+
+        # Only Watched Keys Get A Diff
+        broadcast._publish("other", "1.000000", json.dumps(first))
+        broadcast._publish("other", "2.000000", json.dumps(second))
+        broadcast._publish("map", "2.000000", json.dumps(second))
+        diff = await stream.__anext__()
+
+        broadcast.heartbeat()
+        heartbeat = await stream.__anext__()
+
+        # A Subscriber Resuming From An Older Version Gets The Snapshot
+        late = await broadcast.subscribe("map", last_id="0.500000").__anext__()
+        await stream.aclose()
+        return broadcast, snapshot, diff, heartbeat, late
+
+    broadcast, snapshot, diff, heartbeat, late = asyncio.run(scenario())
+
+    assert snapshot.startswith("event: snapshot\nid: 1.000000\n")
+    assert diff.startswith("event: diff\nid: 2.000000\n")
+    assert json.loads(diff.split("data: ", 1)[1])["bins_changed"][0]["usd"] == 12.0
+    assert heartbeat == HEARTBEAT
+    assert late.startswith("event: snapshot\nid: 2.000000\n")
+    assert broadcast._latest["other"]["diff"] is None
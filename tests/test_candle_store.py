@@ -0,0 +1,127 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import HOUR_MS, SyntheticExchange, synthetic_market
+from src import exchange_data
+from src.candle_store import CandleStore, OHLCV_COLUMNS, get_candle_store
+from src.exchange_data import fetch_ohlcv_frame, fetch_oi_history_frame
+
+SERIES = ('synthetic', 'BTC/USDT:USDT', '1h', 'ohlcv')
+SYMBOL = SERIES[1]
+LOOKBACK = 48
+
+
+def _rows(stamps) -> dict:
+    stamps = np.asarray(stamps, dtype=np.int64)
+    values = stamps.astype(float) / HOUR_MS
+    return {'timestamp': stamps, **{c: values + i for i, c in enumerate(OHLCV_COLUMNS[1:])}}
+
+
+@pytest.fixture
+def store(tmp_path) -> CandleStore:
+    return CandleStore(str(tmp_path))
+
+
+def test_append_ignores_older_and_duplicate_rows(store):
+    assert store.append(*SERIES, _rows([3, 1, 2, 2])) == 3
+    assert store.append(*SERIES, _rows([2, 3, 4, 5])) == 2
+    assert store.append(*SERIES, _rows([])) == 0
+
+    data = store.read(*SERIES)
+    assert data['timestamp'].tolist() == [1, 2, 3, 4, 5]
+    assert data['close'].tolist() == (np.arange(1, 6) / HOUR_MS + 3).tolist()
+    assert store.time_range(*SERIES) == (1, 5)
+    assert store.read(*SERIES, since=4)['timestamp'].tolist() == [4, 5]
+
+
+def test_append_trims_partial_tail(store):
+    store.append(*SERIES, _rows([1, 2]))
+
+    # Interrupted Append: One Column Got A Row (Plus A Torn Half Row), The Rest Did Not
+    path = os.path.join(store._series_dir(*SERIES), 'close.bin')
+    with open(path, 'ab') as fh:
+        fh.write(np.float64(99.0).tobytes() + b'\0\0\0')
+    assert len(store.read(*SERIES)['timestamp']) == 2
+
+    store.append(*SERIES, _rows([3]))
+    data = store.read(*SERIES)
+    assert data['timestamp'].tolist() == [1, 2, 3]
+    assert data['close'].tolist() == (np.arange(1, 4) / HOUR_MS + 3).tolist()
+
+
+def test_replace_rewrites_series(store):
+    store.append(*SERIES, _rows([5, 6]))
+    assert store.replace(*SERIES, _rows([2, 1, 3])) == 3
+    assert store.read(*SERIES)['timestamp'].tolist() == [1, 2, 3]
+    assert store.time_range(*SERIES[:3], 'oi') is None
+
+
+def test_store_is_opt_in(tmp_path, monkeypatch):
+    assert get_candle_store() is None
+    monkeypatch.setattr("src.config.CANDLE_STORE_DIR", str(tmp_path))
+    assert get_candle_store().root == str(tmp_path)
+
+
+class Venue:
+    """SyntheticExchange whose visible history (and the candle clock) advance an hour at a time"""
+
+    def __init__(self, monkeypatch, n_candles: int, start: int):
+        self.full = synthetic_market(n_candles, seed=1)
+        self.exchange = SyntheticExchange('synthetic', n_candles, market=self.full)
+        self.monkeypatch = monkeypatch
+        self.at(start)
+
+    def at(self, index: int):
+        # Candle `index` is the still-forming one
+        self.exchange.market = {name: values[:index + 1] for name, values in self.full.items()}
+        current_open = int(self.full['timestamp'][index])
+        self.monkeypatch.setattr(exchange_data, '_candle_clock', lambda: (HOUR_MS, current_open))
+
+
+def _full_fetch(monkeypatch, fetch, exchange) -> pd.DataFrame:
+    with monkeypatch.context() as m:
+        m.setattr("src.config.CANDLE_STORE_DIR", "")
+        return fetch(exchange, SYMBOL, LOOKBACK)
+
+
+@pytest.mark.parametrize("fetch", [fetch_ohlcv_frame, fetch_oi_history_frame], ids=['ohlcv', 'oi'])
+def test_incremental_fetch_matches_full_fetch(tmp_path, monkeypatch, fetch):
+    monkeypatch.setattr("src.config.CANDLE_STORE_DIR", str(tmp_path))
+    venue = Venue(monkeypatch, 200, start=100)
+
+    for index in range(100, 112):
+        venue.at(index)
+        incremental = fetch(venue.exchange, SYMBOL, LOOKBACK)
+        pd.testing.assert_frame_equal(incremental, _full_fetch(monkeypatch, fetch, venue.exchange), check_dtype=False)
+
+    # After The First Fill, Each Hour Asks Only For The Last Closed Candle And The Open One
+    calls = venue.exchange.calls
+    venue.at(112)
+    fetch(venue.exchange, SYMBOL, LOOKBACK)
+    assert venue.exchange.calls == calls + 1
+
+
+def test_hole_triggers_full_fetch_and_replace(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.config.CANDLE_STORE_DIR", str(tmp_path))
+    venue = Venue(monkeypatch, 200, start=100)
+    fetch_ohlcv_frame(venue.exchange, SYMBOL, LOOKBACK)
+
+    # Stored History Ends Before The Window: Rebuilt From One Full Fetch
+    venue.at(180)
+    frame = fetch_ohlcv_frame(venue.exchange, SYMBOL, LOOKBACK)
+    pd.testing.assert_frame_equal(frame, _full_fetch(monkeypatch, fetch_ohlcv_frame, venue.exchange), check_dtype=False)
+
+    store = get_candle_store()
+    stored = store.read(*SERIES)['timestamp']
+    assert np.all(np.diff(stored) == HOUR_MS)
+    assert stored[0] == venue.full['timestamp'][180 - LOOKBACK + 1]
+
+    # Hole Inside A Store That Still Spans The Window: Rebuilt Again
+    kept = {c: np.delete(np.asarray(v), 10) for c, v in store.read(*SERIES).items()}
+    store.replace(*SERIES, kept)
+    venue.at(181)
+    frame = fetch_ohlcv_frame(venue.exchange, SYMBOL, LOOKBACK)
+    pd.testing.assert_frame_equal(frame, _full_fetch(monkeypatch, fetch_ohlcv_frame, venue.exchange), check_dtype=False)
+    assert np.all(np.diff(store.read(*SERIES)['timestamp']) == HOUR_MS)
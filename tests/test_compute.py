@@ -0,0 +1,65 @@
+import pytest
+
+from benchmarks.fixtures import SyntheticExchange
+from src import compute, exchange_data
+from src.compute import (
+    ComputeBusyError,
+    build_published_map,
+    calculate_map_matrix,
+    compute_slot,
+    pending_computations,
+    shutdown_compute_pool
+)
+from src.config import get_lookback_hours
+from src.exchange_data import fetch_data
+
+
+def test_compute_slot_refuses_work_past_max_pending(monkeypatch):
+    monkeypatch.setattr(compute, "COMPUTE_MAX_PENDING", 2)
+
+    with compute_slot(), compute_slot():
+        assert pending_computations() == 2
+        with pytest.raises(ComputeBusyError):
+            with compute_slot():
+                pass
+        assert pending_computations() == 2
+
+    # Slots are given back even when the computation fails
+    with pytest.raises(RuntimeError):
+        with compute_slot():
+            raise RuntimeError("map failed")
+    assert pending_computations() == 0
+
+
+@pytest.fixture
+def venues():
+    """Synthetic clients pooled under real exchange IDs (quoting BTC only)"""
+    exchange_data.reset_exchange_pool()
+    exchange_data._CLIENT_POOL.update({
+        exchange_id: SyntheticExchange(exchange_id, 24 * 40, seed=seed) for seed, exchange_id in enumerate(('binance', 'bybit'))
+    })
+    yield sorted(exchange_data._CLIENT_POOL)
+    exchange_data.reset_exchange_pool()
+
+
+def _without_timestamp(entry: dict) -> dict:
+    return entry['response'].model_dump(exclude={'timestamp'})
+
+
+def test_map_matrix_matches_direct_computation(venues):
+    try:
+        results = calculate_map_matrix(['BTC', 'ETH'], [1, 3], exchanges=venues)
+    finally:
+        shutdown_compute_pool()
+
+    assert set(results) == {('BTC', 1), ('BTC', 3), ('ETH', 1), ('ETH', 3)}
+    assert pending_computations() == 0
+
+    # A ticker no venue lists fails on its own keys only
+    assert isinstance(results[('ETH', 1)], Exception) and isinstance(results[('ETH', 3)], Exception)
+
+    # Every lookback is a slice of one BTC fetch, and matches fetching that lookback directly
+    for days in (1, 3):
+        direct = build_published_map(fetch_data(ticker='BTC', exchanges=venues, lookback=get_lookback_hours(days)))
+        assert _without_timestamp(results[('BTC', days)]['entry']) == _without_timestamp(direct['entry'])
+        assert dict(results[('BTC', days)]['stats'], timings=None) == dict(direct['stats'], timings=None)
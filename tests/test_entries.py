@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.entries import DETECTORS, RunDetector, detect_runs, estimate_entries
+from src.models import Side
+
+
+def _reference_runs(df: pd.DataFrame, detector: RunDetector) -> list:
+    # Consecutive True rows grouped with pandas, one (side, vwap, weight, start, end) per run
+    runs = []
+    for side, mask in detector.masks(df):
+        mask = pd.Series(np.asarray(mask, dtype=bool), index=df.index)
+        for _, run in df[mask].groupby((mask != mask.shift()).cumsum()[mask]):
+            weight = max(run[detector.weight_column].sum(), 0) if detector.weight_column else 1.0
+            price = (run['close'] * run['volume']).sum() / run['volume'].sum()
+            runs.append((side, price, weight, run['timestamp'].min(), run['timestamp'].max()))
+
+    total = sum(r[2] for r in runs)
+    if total > 0:
+        return [(side, price, weight / total, start, end) for side, price, weight, start, end in runs]
+    return [(side, price, 1.0 / len(runs), start, end) for side, price, _, start, end in runs]
+
+
+@pytest.mark.parametrize("detector", DETECTORS, ids=lambda d: d.name)
+def test_detect_runs_matches_groupby(pipeline, detector):
+    detected = detect_runs(pipeline.agg_df, [detector])[detector.name]
+    expected = _reference_runs(pipeline.agg_df, detector)
+
+    assert len(detected) == len(expected) > 0
+    for entry, (side, price, weight, start, end) in zip(detected, expected):
+        assert entry.side == side
+        assert entry.price == pytest.approx(price, rel=1e-9)
+        assert entry.weight == pytest.approx(weight, rel=1e-9, abs=1e-15)
+        assert (entry.start_time, entry.end_time) == (start, end)
+
+
+def test_detect_runs_edges():
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=6, freq='h'),
+        'close': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        'volume': [1.0, 1.0, 2.0, 1.0, 1.0, 1.0],
+        'flow': [5.0, -9.0, 1.0, 2.0, 3.0, 4.0],
+    })
+    # Runs at rows 0-1 (negative sum, clipped to 0) and 4-5 (touching the last row)
+    detector = RunDetector(
+        'test', 1.0, lambda d: [(Side.LONG, np.array([1, 1, 0, 0, 1, 1], dtype=bool))], weight_column='flow'
+    )
+    entries = detect_runs(df, [detector])['test']
+
+    assert [e.price for e in entries] == pytest.approx([1.5, 5.5])
+    assert [e.weight for e in entries] == [0.0, 1.0]
+    assert entries[1].end_time == df['timestamp'].iloc[-1]
+    assert detect_runs(df.iloc[:0], [detector]) == {'test': []}
+
+
+def test_estimate_entries_weights_sum_to_one(pipeline):
+    entries = estimate_entries(pipeline.df, agg_df=pipeline.agg_df)
+    assert sum(e.weight for e in entries) == pytest.approx(1.0)
+    assert {e.side for e in entries} == {Side.LONG, Side.SHORT, Side.NEUTRAL}
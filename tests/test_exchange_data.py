@@ -0,0 +1,221 @@
+import time
+import threading
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import SyntheticExchange, make_exchanges
+from src import exchange_data
+from src.exchange_data import fetch_data, fetch_single_exchange_data, reset_exchange_pool
+
+LOOKBACK = 48
+SYMBOLS = ['BTC/USDT:USDT']
+
+
+class SlowExchange(SyntheticExchange):
+    """SyntheticExchange whose named endpoints take `delay` seconds"""
+
+    def __init__(self, exchange_id: str, delay: float, slow: tuple, **kwargs):
+        super().__init__(exchange_id, 100, seed=9, **kwargs)
+        self.delay = delay
+        self.slow = slow
+
+    def __getattribute__(self, name):
+        attribute = super().__getattribute__(name)
+        if name in super().__getattribute__('slow'):
+            def delayed(*args, **kwargs):
+                time.sleep(self.delay)
+                return attribute(*args, **kwargs)
+            return delayed
+        return attribute
+
+
+@pytest.fixture(autouse=True)
+def cold_fetch_layer(monkeypatch):
+    """Every test starts with no pooled clients and the shared market frames off"""
+    monkeypatch.setattr(exchange_data, "MARKET_CACHE_ENABLED", False)
+    reset_exchange_pool()
+    yield
+    reset_exchange_pool()
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    return fn(*args, **kwargs), time.perf_counter() - start
+
+
+def test_concurrent_fetch_matches_sequential():
+    exchanges = make_exchanges(4, 100, seed=5)
+
+    concurrent = fetch_data(exchanges=exchanges, lookback=LOOKBACK, concurrent=True)
+    sequential = fetch_data(exchanges=exchanges, lookback=LOOKBACK, concurrent=False)
+
+    pd.testing.assert_frame_equal(concurrent, sequential)
+    assert sorted(concurrent['exchange'].unique()) == [ex.id for ex in exchanges]
+    assert len(concurrent) == 4 * LOOKBACK
+
+
+def test_concurrent_fetch_costs_about_the_slowest_exchange():
+    exchanges = make_exchanges(4, 100, seed=5, latency=0.1)
+
+    _, sequential = _timed(fetch_data, exchanges=exchanges, lookback=LOOKBACK, concurrent=False)
+    reset_exchange_pool()
+    _, concurrent = _timed(fetch_data, exchanges=exchanges, lookback=LOOKBACK, concurrent=True)
+
+    assert concurrent < sequential / 2
+
+
+def test_exchanges_without_data_are_dropped():
+    exchanges = make_exchanges(2, 100, seed=5)
+    exchanges[1].markets = {}
+
+    df = fetch_data(exchanges=exchanges, lookback=LOOKBACK)
+    assert df['exchange'].unique().tolist() == [exchanges[0].id]
+
+    with pytest.raises(ValueError):
+        fetch_data(exchanges=exchanges[1:], lookback=LOOKBACK)
+
+
+def test_endpoints_of_one_exchange_overlap():
+    exchange = SyntheticExchange('synthetic', 100, seed=9, latency=0.1)
+
+    df, elapsed = _timed(fetch_single_exchange_data, exchange, symbols=SYMBOLS, lookback=LOOKBACK)
+
+    # load_markets, then five endpoint calls at once: about two round trips, not six
+    assert exchange.calls == 6
+    assert len(df) == LOOKBACK
+    assert elapsed < 0.4
+
+
+def test_core_endpoint_over_budget_drops_the_exchange():
+    exchange = SlowExchange('slow', 1.0, ('fetch_ticker',))
+
+    df, elapsed = _timed(fetch_single_exchange_data, exchange, symbols=SYMBOLS, lookback=LOOKBACK, time_budget=0.2)
+
+    assert df is None
+    assert elapsed < 0.6
+
+
+def test_late_oi_history_is_left_out():
+    exchange = SlowExchange('slow', 1.0, ('fetch_open_interest_history',))
+
+    df, elapsed = _timed(fetch_single_exchange_data, exchange, symbols=SYMBOLS, lookback=LOOKBACK, time_budget=0.2)
+
+    assert len(df) == LOOKBACK
+    assert df['oi_usd_hist'].isna().all()
+    assert elapsed < 0.6
+
+
+def test_waiting_on_a_shared_frame_refill_is_bounded_by_own_budget(monkeypatch):
+    monkeypatch.setattr(exchange_data, "MARKET_CACHE_ENABLED", True)
+    exchange = SlowExchange('slow', 1.0, ('fetch_ohlcv',))
+    filler = threading.Thread(
+        target=fetch_single_exchange_data, args=(exchange,), kwargs={'symbols': SYMBOLS, 'lookback': LOOKBACK}
+    )
+    filler.start()
+    time.sleep(0.1)
+
+    # Second caller of the same (exchange, symbol) while the first still refills the shared frame
+    df, elapsed = _timed(fetch_single_exchange_data, exchange, symbols=SYMBOLS, lookback=LOOKBACK, time_budget=0.2)
+    filler.join(5)
+
+    assert df is None
+    assert elapsed < 0.6
+    assert len(fetch_single_exchange_data(exchange, symbols=SYMBOLS, lookback=LOOKBACK, time_budget=0.2)) == LOOKBACK
+
+
+def test_one_shared_fetch_serves_every_lookback(monkeypatch):
+    monkeypatch.setattr(exchange_data, "MARKET_CACHE_ENABLED", True)
+    exchange = SyntheticExchange('synthetic', 24 * 40, seed=9)
+    direct = SyntheticExchange('synthetic', 24 * 40, seed=9)
+
+    for lookback in (24, LOOKBACK, exchange_data.MARKET_CACHE_LOOKBACK):
+        df = fetch_single_exchange_data(exchange, symbols=SYMBOLS, lookback=lookback)
+        expected = fetch_single_exchange_data(direct, symbols=SYMBOLS, lookback=lookback, use_cache=False)
+        pd.testing.assert_frame_equal(df, expected)
+
+    # load_markets plus one round of endpoint calls, whatever the lookback
+    assert exchange.calls == 1 + 5
+
+
+def test_shared_frame_is_refetched_on_a_new_candle(monkeypatch):
+    monkeypatch.setattr(exchange_data, "MARKET_CACHE_ENABLED", True)
+    clock = {'open': 0}
+    monkeypatch.setattr(exchange_data, "_candle_clock", lambda: (3_600_000, clock['open']))
+    exchange = SyntheticExchange('synthetic', 100, seed=9)
+
+    fetch_single_exchange_data(exchange, symbols=SYMBOLS, lookback=LOOKBACK)
+    fetch_single_exchange_data(exchange, symbols=SYMBOLS, lookback=24)
+    assert exchange.calls == 1 + 5
+
+    clock['open'] += 3_600_000
+    fetch_single_exchange_data(exchange, symbols=SYMBOLS, lookback=LOOKBACK)
+    assert exchange.calls == 1 + 2 * 5
+
+
+def test_hung_exchange_only_ties_up_its_own_endpoint_threads(monkeypatch):
+    monkeypatch.setattr(exchange_data, "ENDPOINT_WORKERS_PER_EXCHANGE", 2)
+    hung = SyntheticExchange('hung', 100, seed=9)
+    exchange_data.resolve_symbol(hung, SYMBOLS)
+    hung.latency = 1.0
+    healthy = SyntheticExchange('healthy', 100, seed=9, latency=0.05)
+
+    stuck = threading.Thread(
+        target=fetch_single_exchange_data, args=(hung,), kwargs={'symbols': SYMBOLS, 'lookback': LOOKBACK, 'time_budget': 0.2}
+    )
+    stuck.start()
+    time.sleep(0.05)
+    df, elapsed = _timed(fetch_single_exchange_data, healthy, symbols=SYMBOLS, lookback=LOOKBACK, time_budget=0.8)
+    stuck.join(5)
+    time.sleep(1.2)
+
+    assert len(df) == LOOKBACK and elapsed < 0.6
+    # Only the two calls already running at the deadline ran; the queued three were cancelled
+    assert hung.calls == 1 + 2
+
+
+class MarketsLog(SyntheticExchange):
+    """SyntheticExchange remembering the reload flag of every load_markets call"""
+
+    def __init__(self):
+        super().__init__('synthetic', 100, seed=9)
+        self.reloads = []
+
+    def load_markets(self, reload: bool = False) -> dict:
+        self.reloads.append(reload)
+        return super().load_markets(reload)
+
+
+def test_clients_are_pooled_per_exchange_id():
+    client = exchange_data.get_client('binance')
+
+    assert exchange_data.get_exchanges(['binance', 'okx'])[0] is client
+    assert exchange_data.get_exchanges(['not-an-exchange']) == []
+
+    reset_exchange_pool()
+    assert exchange_data.get_client('binance') is not client
+
+
+def test_markets_and_symbol_resolution_are_cached_until_ttl(monkeypatch):
+    exchange = MarketsLog()
+    candidates = ['BTC-USD-NOPE', 'BTCUSDT', 'BTC/USDT:USDT']
+
+    assert exchange_data.resolve_symbol(exchange, candidates) == 'BTCUSDT'
+    assert exchange_data.resolve_symbol(exchange, candidates) == 'BTCUSDT'
+    assert exchange_data.resolve_symbol(exchange, ['ETHUSDT']) is None
+    assert exchange.reloads == [False]
+
+    # Expired: ccxt's copy is reloaded and candidate lists are resolved again
+    monkeypatch.setattr(exchange_data, "MARKETS_TTL_SECONDS", 0)
+    exchange.markets = {'BTC/USDT:USDT': {}}
+    assert exchange_data.resolve_symbol(exchange, candidates) == 'BTC/USDT:USDT'
+    assert exchange.reloads == [False, True]
+
+
+def test_repeat_fetches_skip_cold_setup():
+    exchange = MarketsLog()
+
+    for _ in range(3):
+        fetch_single_exchange_data(exchange, symbols=SYMBOLS, lookback=LOOKBACK)
+
+    assert exchange.reloads == [False]
+    assert exchange.calls == 1 + 3 * 5
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from benchmarks.fixtures import (
+    HOUR_MS,
+    SyntheticExchange,
+    make_exchanges,
+    synthetic_entries,
+    synthetic_market
+)
+
+SYMBOL = 'BTC/USDT:USDT'
+
+
+def test_market_is_seeded_hourly_and_ends_at_open_candle():
+    market = synthetic_market(100, seed=7)
+
+    assert all(np.array_equal(values, synthetic_market(100, seed=7)[name]) for name, values in market.items())
+    assert not np.array_equal(market['close'], synthetic_market(100, seed=8)['close'])
+    assert np.all(np.diff(market['timestamp']) == HOUR_MS)
+    assert market['timestamp'][-1] % HOUR_MS == 0
+    assert np.all(market['low'] <= np.minimum(market['open'], market['close']))
+    assert np.all(market['high'] >= np.maximum(market['open'], market['close']))
+
+
+def test_fetch_windows_follow_ccxt():
+    exchange = SyntheticExchange('synthetic', 50, seed=1)
+    stamps = exchange.market['timestamp']
+
+    # Without since: the newest `limit` rows; with since: `limit` rows from the first at or after it
+    assert [row[0] for row in exchange.fetch_ohlcv(SYMBOL, limit=3)] == stamps[-3:].tolist()
+    assert [row[0] for row in exchange.fetch_ohlcv(SYMBOL, since=int(stamps[10]) - 1, limit=2)] == stamps[10:12].tolist()
+    assert len(exchange.fetch_ohlcv(SYMBOL, limit=500)) == 50
+    assert [r['timestamp'] for r in exchange.fetch_open_interest_history(SYMBOL, since=int(stamps[-2]))] == stamps[-2:].tolist()
+    assert exchange.calls == 4
+
+
+def test_venues_share_one_base_market():
+    exchanges = make_exchanges(3, 200, seed=2)
+
+    assert [ex.id for ex in exchanges] == ['synthetic0', 'synthetic1', 'synthetic2']
+    closes = np.array([ex.market['close'] for ex in exchanges])
+    assert np.max(np.abs(closes / closes.mean(axis=0) - 1)) < 0.01
+    assert not np.array_equal(closes[0], closes[1])
+
+
+def test_synthetic_entries_are_normalized(pipeline):
+    entries = synthetic_entries(500, pipeline.agg_df, seed=3)
+
+    assert len(entries) == 500
+    assert sum(e.weight for e in entries) == pytest.approx(1.0)
+    assert set(e.price for e in entries) <= set(pipeline.agg_df['close'])
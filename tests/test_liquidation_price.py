@@ -0,0 +1,192 @@
+import math
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import NUM_BUCKETS, NUM_LEVERAGE_SAMPLES, FUNDING_RATE_QUANTUM, MIN_LEVERAGE, MAX_LEVERAGE
+from src.models import Side, Status
+from src.liquidation_price import (
+    get_liq,
+    sample_leverages,
+    build_liquidation_points,
+    build_extreme_index,
+    raw_point_status,
+    bin_liquidations,
+    bin_liquidation_density,
+    leverage_measure,
+    bucket_edges,
+    density_max_distance,
+    density_bucket_sums,
+    point_bucket_sums,
+    _erfc,
+    _leverage_grid
+)
+
+PROFILE = "dynamic"
+
+
+def _scan_extremes(agg_df: pd.DataFrame, start_time):
+    # Lowest low / highest high of the candles strictly after start_time (NaN if none)
+    after = agg_df[agg_df['timestamp'] > start_time]
+    if after.empty:
+        return math.nan, math.nan
+    return after['low'].min(), after['high'].max()
+
+
+def test_liquidation_points_match_get_liq(pipeline):
+    leverages, weights = sample_leverages(profile=PROFILE, funding_rate=pipeline.summary.funding_rate)
+    points = build_liquidation_points(pipeline.entries, leverages, weights, pipeline.summary.total_oi_usd)
+
+    # Entry-major rows; NEUTRAL entries give a long block then a short block at half weight
+    expected = []
+    for entry in pipeline.entries:
+        legs = [(True, 0.5), (False, 0.5)] if entry.side == Side.NEUTRAL else [(entry.side == Side.LONG, 1.0)]
+        for is_long, share in legs:
+            for leverage, weight in zip(leverages, weights):
+                usd = entry.weight * share * weight * pipeline.summary.total_oi_usd
+                expected.append((get_liq(entry.price, leverage, is_long), usd, Side.LONG if is_long else Side.SHORT))
+
+    assert len(points) == len(expected)
+    np.testing.assert_allclose(points['price'], [e[0] for e in expected], rtol=1e-12)
+    np.testing.assert_allclose(points['usd'], [e[1] for e in expected], rtol=1e-12)
+    assert list(points['side']) == [e[2] for e in expected]
+    assert list(points['entry_start_time']) == [
+        entry.start_time for entry in pipeline.entries
+        for _ in range(len(leverages) * (2 if entry.side == Side.NEUTRAL else 1))
+    ]
+
+
+def test_raw_point_status_matches_candle_scan(pipeline):
+    raw_points, agg_df = pipeline.raw_points, pipeline.agg_df
+    statuses = raw_point_status(raw_points, build_extreme_index(agg_df))
+
+    expected = []
+    for price, side, start_time in zip(raw_points['price'], raw_points['side'], raw_points['entry_start_time']):
+        low_after, high_after = _scan_extremes(agg_df, start_time)
+        cleared = low_after <= price if side == Side.LONG else high_after >= price
+        expected.append(Status.CLEARED if cleared else Status.ACTIVE)
+
+    assert list(statuses) == expected
+    assert Status.CLEARED in expected and Status.ACTIVE in expected
+
+
+def test_raw_point_status_edges():
+    agg_df = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=3, freq='h'),
+        'low': [90.0, 95.0, 80.0],
+        'high': [110.0, 120.0, 105.0],
+    })
+    stamps = agg_df['timestamp']
+    points = pd.DataFrame({
+        'price': [80.0, 79.0, 106.0, 100.0, 1.0],
+        'side': pd.Categorical(
+            [Side.LONG, Side.LONG, Side.SHORT, Side.SHORT, Side.LONG], categories=[Side.LONG, Side.SHORT]
+        ),
+        'entry_start_time': [stamps[0] - pd.Timedelta('1h'), stamps[0], stamps[1], stamps[2], stamps[2]],
+    })
+
+    # Touching the level clears it; only candles strictly after entry count; none after the last candle
+    assert list(raw_point_status(points, build_extreme_index(agg_df))) == [
+        Status.CLEARED, Status.ACTIVE, Status.ACTIVE, Status.ACTIVE, Status.ACTIVE
+    ]
+
+
+def test_bin_status_matches_per_point_loop(pipeline):
+    raw_points, agg_df, close = pipeline.raw_points, pipeline.agg_df, pipeline.summary.close
+    binned = bin_liquidations(raw_points, close, agg_df, NUM_BUCKETS, extremes=pipeline.extremes)
+
+    points = raw_points.copy()
+    points['bucket'] = pd.cut(points['price'], bins=binned['bucket'].cat.categories, include_lowest=True)
+
+    # Reference: every point checked against its bin's edges with a fresh candle scan
+    expected = {}
+    for bucket, group in points.groupby('bucket', observed=False):
+        bin_usd = group['usd'].sum()
+        cleared_usd = partial_usd = 0.0
+        for usd, side, start_time in zip(group['usd'], group['side'], group['entry_start_time']):
+            low_after, high_after = _scan_extremes(agg_df, start_time)
+            if side == Side.LONG:
+                fully, partially = low_after <= bucket.left, low_after < bucket.right
+            else:
+                fully, partially = high_after >= bucket.right, high_after > bucket.left
+            if fully:
+                cleared_usd += usd
+            elif partially:
+                partial_usd += usd
+
+        cleared_pct = cleared_usd / bin_usd if bin_usd > 0 else 0
+        partial_pct = partial_usd / bin_usd if bin_usd > 0 else 0
+        if cleared_pct > 0.8:
+            expected[bucket] = Status.CLEARED
+        elif partial_pct > 0.2 or cleared_pct > 0.2:
+            expected[bucket] = Status.PARTIAL
+        else:
+            expected[bucket] = Status.ACTIVE
+
+    assert {row.bucket: row.status for row in binned.itertuples()} == expected
+    assert set(expected.values()) == {Status.ACTIVE, Status.CLEARED, Status.PARTIAL}
+    assert binned['usd'].sum() == pytest.approx(raw_points['usd'].sum(), rel=1e-9)
+
+
+def test_leverage_grid_is_deterministic_and_read_only():
+    leverages, weights = sample_leverages(PROFILE, funding_rate=1e-4)
+
+    assert len(leverages) == len(weights) == NUM_LEVERAGE_SAMPLES
+    assert np.all(np.diff(leverages) >= 0)
+    assert leverages.min() >= MIN_LEVERAGE and leverages.max() <= MAX_LEVERAGE
+    assert weights.sum() == pytest.approx(1.0)
+    with pytest.raises(ValueError):
+        weights[0] = 1.0
+
+    # A fresh computation of the grid gives the same points, not a redraw
+    _leverage_grid.cache_clear()
+    again, again_weights = sample_leverages(PROFILE, funding_rate=1e-4)
+    np.testing.assert_array_equal(again, leverages)
+    np.testing.assert_array_equal(again_weights, weights)
+
+
+def test_leverage_grid_is_cached_per_quantized_funding_rate():
+    grid = sample_leverages(PROFILE, funding_rate=1e-4)
+
+    assert sample_leverages(PROFILE, funding_rate=1e-4 + FUNDING_RATE_QUANTUM / 4)[0] is grid[0]
+    assert sample_leverages(PROFILE, funding_rate=2e-4)[0] is not grid[0]
+    # Only the dynamic profile reads funding; NaN funding falls back to the zero-rate grid
+    assert sample_leverages("neutral", funding_rate=1e-4)[0] is sample_leverages("neutral")[0]
+    assert sample_leverages(PROFILE, funding_rate=float("nan"))[0] is sample_leverages(PROFILE)[0]
+
+
+def test_analytic_bins_share_sampled_edges(pipeline):
+    summary = pipeline.summary
+    sampled = bin_liquidations(pipeline.raw_points, summary.close, pipeline.agg_df, NUM_BUCKETS, extremes=pipeline.extremes)
+    analytic = bin_liquidation_density(
+        pipeline.entries, PROFILE, summary.funding_rate, summary.total_oi_usd,
+        summary.close, pipeline.agg_df, NUM_BUCKETS, extremes=pipeline.extremes
+    )
+
+    assert list(analytic['bucket'].cat.categories) == list(sampled['bucket'].cat.categories)
+    assert analytic['usd'].sum() == pytest.approx(summary.total_oi_usd, rel=1e-6)
+
+
+@pytest.mark.parametrize("funding_rate", [0.0, 0.00005, 0.0002])
+def test_analytic_bins_match_dense_grid_over_same_range(pipeline, funding_rate):
+    summary, entries = pipeline.summary, pipeline.entries
+    measure = leverage_measure(PROFILE, funding_rate)
+    edges = bucket_edges(summary.close, density_max_distance(entries, PROFILE, funding_rate, summary.close), NUM_BUCKETS)
+    analytic = density_bucket_sums(entries, PROFILE, funding_rate, summary.total_oi_usd, edges, pipeline.extremes)
+
+    # Dense grid restricted to the default grid's leverage range (the measure's support)
+    leverages, weights = sample_leverages(PROFILE, funding_rate, num_samples=200_000)
+    inside = (leverages >= measure.low - 1e-12) & (leverages <= measure.high + 1e-12)
+    dense_points = build_liquidation_points(
+        entries, leverages[inside], weights[inside] / weights[inside].sum(), summary.total_oi_usd
+    )
+    dense = point_bucket_sums(dense_points, edges, pipeline.extremes)
+
+    for analytic_sums, dense_sums in zip(analytic, dense):
+        assert np.abs(analytic_sums - dense_sums).sum() / dense[0].sum() < 5e-5
+
+
+def test_erfc_matches_math():
+    x = np.linspace(-8.0, 8.0, 4001)
+    expected = np.array([math.erfc(v) for v in x])
+    np.testing.assert_allclose(_erfc(x), expected, rtol=2e-7, atol=0)
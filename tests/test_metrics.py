@@ -0,0 +1,73 @@
+import pytest
+
+from src.metrics import Registry, record_map_stats, stage_timer, REGISTRY
+
+
+@pytest.fixture
+def registry() -> Registry:
+    return Registry()
+
+
+def test_counter_renders_per_label_set(registry):
+    lookups = registry.counter("lookups_total", "Lookups", ("blob", "result"))
+    lookups.inc(blob="a.json", result="memory")
+    lookups.inc(2, blob="a.json", result="memory")
+    lookups.inc(blob='we"ird\\name\n', result="error")
+
+    assert registry.render().splitlines() == [
+        "# HELP lookups_total Lookups",
+        "# TYPE lookups_total counter",
+        'lookups_total{blob="a.json",result="memory"} 3',
+        'lookups_total{blob="we\\"ird\\\\name\\n",result="error"} 1',
+    ]
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    seconds = registry.histogram("stage_seconds", "Stage time", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 7.0):
+        seconds.observe(value, stage="fetch")
+
+    assert registry.render().splitlines()[2:] == [
+        'stage_seconds_bucket{stage="fetch",le="0.1"} 2',
+        'stage_seconds_bucket{stage="fetch",le="1.0"} 3',
+        'stage_seconds_bucket{stage="fetch",le="+Inf"} 4',
+        'stage_seconds_sum{stage="fetch"} 7.65',
+        'stage_seconds_count{stage="fetch"} 4',
+    ]
+
+
+def test_histogram_time_observes_failing_blocks(registry):
+    seconds = registry.histogram("block_seconds", "Block time", buckets=(60.0,))
+    with pytest.raises(RuntimeError):
+        with seconds.time():
+            raise RuntimeError("stage failed")
+
+    assert 'block_seconds_count 1' in registry.render().splitlines()
+
+
+def test_callbacks_are_read_at_scrape_time(registry):
+    state = {"pending": 1}
+    registry.callback("pending", "Pending maps", "gauge", lambda: {(): state["pending"]})
+    registry.callback("broken", "Raises", "gauge", lambda: 1 / 0)
+
+    state["pending"] = 4
+    assert registry.render().splitlines() == ["# HELP pending Pending maps", "# TYPE pending gauge", "pending 4"]
+
+
+def test_reregistering_a_name_keeps_the_first_metric(registry):
+    first = registry.counter("runs_total", "Runs")
+    assert registry.counter("runs_total", "Runs") is first
+
+
+def test_worker_stage_timings_are_recorded_in_process():
+    timings = {}
+    with stage_timer(timings, "serialize"):
+        pass
+    with stage_timer(timings, "serialize"):
+        pass
+
+    record_map_stats({"timings": timings, "bin_count": 80, "raw_count": None, "entry_count": 12})
+    rendered = REGISTRY.render()
+    assert list(timings) == ["serialize"]
+    assert 'liqmap_stage_seconds_count{stage="serialize"}' in rendered
+    assert 'liqmap_points_count{kind="bins"}' in rendered
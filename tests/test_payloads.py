@@ -0,0 +1,120 @@
+import gzip
+import json
+import numpy as np
+import pytest
+
+from src.models import Side, Status
+from src.payloads import (
+    BINARY_HEADER,
+    BINARY_MAGIC,
+    BINARY_VERSION,
+    SIDE_CODES,
+    STATUS_CODES,
+    brotli,
+    build_map_entry,
+    build_map_response,
+    choose_encoding,
+    encode_payload,
+    filter_raw_columns,
+    render_filtered
+)
+
+
+@pytest.fixture(scope="module")
+def entry(pipeline) -> dict:
+    result = pipeline.result()
+    return build_map_entry(build_map_response(result), raw_df=result['raw_liqs'])
+
+
+def _unpack(blob: bytes):
+    magic, version, reserved, n, meta_len = BINARY_HEADER.unpack_from(blob)
+    offset = BINARY_HEADER.size
+    meta = json.loads(blob[offset:offset + meta_len].rstrip(b'\0'))
+    offset += meta_len
+
+    columns = {}
+    for name, dtype in (('price', '<f8'), ('usd', '<f8'), ('entry_time', '<f8'), ('side', 'u1'), ('status', 'u1')):
+        columns[name] = np.frombuffer(blob, dtype=dtype, count=n, offset=offset)
+        offset += n * np.dtype(dtype).itemsize
+    return (magic, version, reserved, meta_len), meta, columns, offset
+
+
+def test_binary_header_and_columns(entry):
+    blob = entry['binary']['identity']
+    (magic, version, reserved, meta_len), meta, columns, end = _unpack(blob)
+
+    assert (magic, version, reserved) == (BINARY_MAGIC, BINARY_VERSION, 0)
+    assert meta_len % 8 == 0 and end == len(blob)
+    assert meta == json.loads(entry['meta_json'])
+    for name, values in entry['columns'].items():
+        np.testing.assert_array_equal(columns[name], values)
+
+
+def test_unfiltered_render_parses_like_full_payload(entry):
+    full = json.loads(entry['payload']['identity'])
+    rendered = json.loads(render_filtered(entry, entry['columns'], 'json'))
+    assert rendered == full
+
+
+def test_render_filtered_writes_non_finite_as_null(entry):
+    columns = {name: values[:3].copy() for name, values in entry['columns'].items()}
+    columns['usd'][0] = np.nan
+    columns['price'][1] = np.inf
+    columns['entry_time'][2] = np.nan
+
+    raw = json.loads(render_filtered(entry, columns, 'json'))['raw_liquidations']
+    assert (raw[0]['usd'], raw[1]['price'], raw[2]['entry_time']) == (None, None, None)
+    assert raw[0]['side'] in {s.value for s in SIDE_CODES} and raw[0]['status'] in {s.value for s in Status}
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {'price_min': 55000.0},
+    {'price_min': 50000.0, 'price_max': 70000.0, 'min_usd': 1e5},
+    {'side': Side.SHORT, 'status': Status.ACTIVE},
+    {'price_min': 1e9},
+], ids=['none', 'floor', 'window-usd', 'side-status', 'empty'])
+def test_filter_raw_columns_matches_mask(entry, filters):
+    columns, index = entry['columns'], entry['index']
+    mask = np.ones(len(columns['price']), dtype=bool)
+    if 'price_min' in filters:
+        mask &= columns['price'] >= filters['price_min']
+    if 'price_max' in filters:
+        mask &= columns['price'] <= filters['price_max']
+    if 'min_usd' in filters:
+        mask &= columns['usd'] >= filters['min_usd']
+    if 'side' in filters:
+        mask &= columns['side'] == SIDE_CODES.index(filters['side'])
+    if 'status' in filters:
+        mask &= columns['status'] == STATUS_CODES.index(filters['status'])
+
+    filtered = filter_raw_columns(index, **filters)
+    order = np.lexsort((columns['usd'][mask], columns['price'][mask]))
+    filtered_order = np.lexsort((filtered['usd'], filtered['price']))
+    for name, values in columns.items():
+        np.testing.assert_array_equal(filtered[name][filtered_order], values[mask][order])
+    assert np.all(np.diff(filtered['price']) >= 0)
+
+
+def test_encode_payload_round_trips():
+    body = b'{"bins": [' + b', '.join(b'{"usd": %d}' % i for i in range(2000)) + b']}'
+    payload = encode_payload(body)
+
+    assert payload['identity'] is body
+    assert gzip.decompress(payload['gzip']) == body
+    assert len(payload['gzip']) < len(body)
+    # Deterministic (mtime=0), so identical maps give identical bytes / ETags
+    assert encode_payload(body)['gzip'] == payload['gzip']
+    if brotli is None:
+        assert 'br' not in payload
+    else:
+        assert brotli.decompress(payload['br']) == body
+
+
+def test_choose_encoding():
+    payload = {'identity': b'plain', 'gzip': b'gz'}
+    assert choose_encoding('gzip, deflate', payload) == (b'gz', 'gzip')
+    assert choose_encoding('br;q=1, gzip;q=0', payload) == (b'plain', None)
+    assert choose_encoding('*', payload) == (b'gz', 'gzip')
+    assert choose_encoding(None, payload) == (b'plain', None)
+    assert choose_encoding('br, gzip', dict(payload, br=b'br')) == (b'br', 'br')
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import PYRAMID_LEVELS
+from src.payloads import raw_columns
+from src.pyramid import BinPyramid
+
+LABEL_TOLERANCE = 1e-2  # Bucket labels are rounded like pd.cut's
+
+
+@pytest.fixture(scope="module")
+def pyramid(pipeline) -> BinPyramid:
+    return pipeline.pyramid
+
+
+def _span(pyramid: BinPyramid) -> tuple:
+    # (low, high) of the full span, and the grids covering all of it
+    low = min(grid['edges'][0] for grid in pyramid.grids)
+    high = max(grid['edges'][-1] for grid in pyramid.grids)
+    covering = [g for g in pyramid.grids if np.isclose(g['edges'][0], low) and np.isclose(g['edges'][-1], high)]
+    return low, high, covering
+
+
+def _edges(bins: pd.DataFrame) -> np.ndarray:
+    buckets = bins['bucket'].cat.categories
+    return np.append(buckets.left, buckets.right[-1])
+
+
+def test_bytes_round_trip(pyramid):
+    restored, tag = BinPyramid.from_bytes(pyramid.to_bytes(1234.5))
+
+    assert tag == 1234.5
+    assert restored.current_price == pyramid.current_price
+    assert len(restored.grids) == len(pyramid.grids)
+    for grid, original in zip(restored.grids, pyramid.grids):
+        for name in ('edges', 'usd', 'cleared', 'partial'):
+            np.testing.assert_array_equal(grid[name], original[name])
+
+
+@pytest.mark.parametrize("buckets", [7, 20, 33, 100])
+def test_full_span_groups_conserve_usd(pyramid, buckets):
+    low, high, covering = _span(pyramid)
+    bins = pyramid.query(buckets)
+
+    assert buckets <= len(bins) < 2 * buckets
+    assert bins['usd'].sum() == pytest.approx(covering[0]['usd'].sum(), rel=1e-9)
+    np.testing.assert_allclose(_edges(bins)[[0, -1]], [low, high], rtol=0, atol=LABEL_TOLERANCE)
+
+
+def test_window_is_clamped_and_grouped(pyramid):
+    low, high, _ = _span(pyramid)
+    price = pyramid.current_price
+
+    # Window Reaching Past The Span Is Cut At It
+    bins = pyramid.query(20, price_min=low - 1e6, price_max=price)
+    edges = _edges(bins)
+    assert 20 <= len(bins) < 40
+    assert edges[0] == pytest.approx(low, abs=LABEL_TOLERANCE)
+    assert edges[-1] >= price - LABEL_TOLERANCE
+
+    # Narrow Window Near Price Comes From A Fine Grid, Still Covering The Window
+    bins = pyramid.query(50, price_min=price * 0.99, price_max=price * 1.01)
+    edges = _edges(bins)
+    assert 50 <= len(bins) < 100
+    assert edges[0] <= price * 0.99 + LABEL_TOLERANCE and edges[-1] >= price * 1.01 - LABEL_TOLERANCE
+
+    assert pyramid.query(20, price_min=price, price_max=price).empty
+    assert pyramid.query(20, price_min=high + 1).empty
+
+
+def test_too_many_buckets_returns_finest_grid_unmerged(pyramid):
+    _, _, covering = _span(pyramid)
+    bins = pyramid.query(10 * max(PYRAMID_LEVELS))
+    assert len(bins) == max(len(grid['usd']) for grid in covering)
+    assert bins['usd'].sum() == pytest.approx(covering[0]['usd'].sum(), rel=1e-9)
+
+
+def test_from_raw_columns_sums_every_point(pipeline):
+    columns = raw_columns(pipeline.raw_liqs)
+    pyramid = BinPyramid.from_raw_columns(columns, pipeline.summary.close)
+
+    for grid in pyramid.grids[:len(PYRAMID_LEVELS)]:
+        assert grid['usd'].sum() == pytest.approx(columns['usd'].sum(), rel=1e-9)
+        assert np.all(grid['cleared'] + grid['partial'] <= grid['usd'] * (1 + 1e-12))
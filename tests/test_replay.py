@@ -0,0 +1,43 @@
+import os
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import make_exchanges
+from src import exchange_data
+from src.exchange_data import fetch_exchanges_data, reset_exchange_pool
+from src.replay import ExchangeArchive, RecordingExchange, ReplayExchange, archive_path
+
+LOOKBACK = 48
+
+
+@pytest.fixture(autouse=True)
+def cold_fetch_layer(monkeypatch):
+    monkeypatch.setattr(exchange_data, "MARKET_CACHE_ENABLED", False)
+    reset_exchange_pool()
+    yield
+    reset_exchange_pool()
+
+
+def test_recorded_run_replays_identically(tmp_path):
+    exchanges = make_exchanges(2, 100, seed=3)
+    recording = [RecordingExchange(ex, ExchangeArchive.open(str(tmp_path), ex.id)) for ex in exchanges]
+
+    recorded = fetch_exchanges_data(recording, lookback=LOOKBACK)
+    assert len(recorded) == 2
+    for ex in exchanges:
+        assert os.path.exists(archive_path(str(tmp_path), ex.id))
+
+    replayed = fetch_exchanges_data([ReplayExchange.open(str(tmp_path), ex.id) for ex in exchanges], lookback=LOOKBACK)
+    for frame, replay in zip(recorded, replayed):
+        pd.testing.assert_frame_equal(frame, replay)
+
+
+def test_record_writes_only_on_flush(tmp_path):
+    archive = ExchangeArchive.open(str(tmp_path), "synthetic")
+    path = archive_path(str(tmp_path), "synthetic")
+
+    archive.record("fetch_ticker|BTC/USDT:USDT", {"last": 1.0})
+    assert not os.path.exists(path)
+
+    archive.flush()
+    assert ExchangeArchive.open(str(tmp_path), "synthetic").get("fetch_ticker|BTC/USDT:USDT") == {"last": 1.0}
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from src.config import DISTANCE_DECAY_FACTOR
+from src.models import Bias
+from src.resolution import magnetism_bias, magnetism_curve
+
+
+def _brute_force(prices, usd, grid) -> np.ndarray:
+    distances = np.abs(grid[:, None] - prices[None, :])
+    distances[distances == 0] = 0.01
+    return (usd[None, :] / distances ** DISTANCE_DECAY_FACTOR).sum(axis=1)
+
+
+@pytest.mark.parametrize("n", [1, 50, 5000])
+def test_curve_matches_brute_force(n):
+    rng = np.random.default_rng(n)
+    prices = np.sort(np.concatenate([rng.normal(60000, 3000, n - n // 10), rng.uniform(30000, 90000, n // 10)]))
+    usd = rng.lognormal(10, 1, n)
+    is_short = prices > 60000
+    grid = np.concatenate([np.linspace(40000, 80000, 301), prices[:5]])
+
+    curve = magnetism_curve(prices, usd, is_short, grid)
+
+    np.testing.assert_allclose(curve['upward_mag'], _brute_force(prices[is_short], usd[is_short], grid), rtol=1e-6)
+    np.testing.assert_allclose(curve['downward_mag'], _brute_force(prices[~is_short], usd[~is_short], grid), rtol=1e-6)
+    np.testing.assert_allclose(curve['long_usd_above'], [usd[~is_short & (prices >= g)].sum() for g in grid])
+    np.testing.assert_allclose(curve['short_usd_below'], [usd[is_short & (prices <= g)].sum() for g in grid])
+    assert curve['bias'] == [magnetism_bias(u, d) for u, d in zip(curve['upward_mag'], curve['downward_mag'])]
+
+
+def test_empty_curve_is_unbiased():
+    curve = magnetism_curve(np.empty(0), np.empty(0), np.empty(0, dtype=bool), np.array([1.0, 2.0]))
+    assert curve['bias'] == [Bias.UNBIASED, Bias.UNBIASED]
+    assert curve['upward_mag'].tolist() == [0.0, 0.0]
@@ -0,0 +1,95 @@
+import time
+import threading
+import pytest
+
+from src import result_cache
+from src.result_cache import SingleFlightCache
+
+
+class Clock:
+    """Stand-in for time.monotonic that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(result_cache.time, "monotonic", clock)
+    return clock
+
+
+def test_concurrent_misses_compute_once():
+    cache = SingleFlightCache(ttl_seconds=60)
+    callers = 8
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    def worker():
+        results.append(cache.get_or_compute("key", compute))
+
+    threads = [threading.Thread(target=worker) for _ in range(callers)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+
+    # Everyone Else Is Waiting On The Owner's Future Before It Finishes
+    while cache.stats()["coalesced"] < callers - 1:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == ["value"] * callers
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["inflight"]) == (1, callers - 1, 0)
+
+
+def test_ttl_expiry(clock):
+    cache = SingleFlightCache(ttl_seconds=10)
+    values = iter(["first", "second"])
+
+    assert cache.get_or_compute("key", lambda: next(values)) == "first"
+    clock.now += 9.9
+    assert cache.peek("key") == "first"
+    assert cache.get_or_compute("key", lambda: next(values)) == "first"
+
+    clock.now += 0.1
+    assert cache.peek("key") is None
+    assert cache.get_or_compute("key", lambda: next(values)) == "second"
+    assert cache.stats()["misses"] == 2
+
+
+def test_errors_reach_waiters_and_are_not_cached():
+    cache = SingleFlightCache(ttl_seconds=60)
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        cache.get_or_compute("key", fail)
+    assert cache.get_or_compute("key", lambda: "ok") == "ok"
+    assert cache.stats()["errors"] == 1
+
+
+def test_evicts_least_recently_used(clock):
+    cache = SingleFlightCache(ttl_seconds=60, max_entries=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.peek("a")
+    cache.get_or_compute("c", lambda: 3)
+
+    assert cache.peek("b") is None
+    assert (cache.peek("a"), cache.peek("c")) == (1, 3)